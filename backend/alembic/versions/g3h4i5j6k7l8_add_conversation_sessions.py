@@ -0,0 +1,42 @@
+"""add conversation sessions
+
+Revision ID: g3h4i5j6k7l8
+Revises: f2g3h4i5j6k7
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'g3h4i5j6k7l8'
+down_revision: Union[str, Sequence[str], None] = 'f2g3h4i5j6k7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create conversation_sessions table (chatbot history per user and session)."""
+    op.create_table(
+        'conversation_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_uid', sa.String(length=128), nullable=False),
+        sa.Column('session_id', sa.String(length=64), nullable=False),
+        sa.Column('history', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_uid', 'session_id', name='uix_conversation_user_session'),
+    )
+    op.create_index(op.f('ix_conversation_sessions_user_uid'), 'conversation_sessions', ['user_uid'], unique=False)
+    op.create_index(op.f('ix_conversation_sessions_updated_at'), 'conversation_sessions', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop conversation_sessions table."""
+    op.drop_index(op.f('ix_conversation_sessions_updated_at'), table_name='conversation_sessions')
+    op.drop_index(op.f('ix_conversation_sessions_user_uid'), table_name='conversation_sessions')
+    op.drop_table('conversation_sessions')
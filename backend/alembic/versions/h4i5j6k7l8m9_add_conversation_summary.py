@@ -0,0 +1,32 @@
+"""add conversation summary
+
+Revision ID: h4i5j6k7l8m9
+Revises: g3h4i5j6k7l8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h4i5j6k7l8m9'
+down_revision: Union[str, Sequence[str], None] = 'g3h4i5j6k7l8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add rolling summary columns to conversation_sessions."""
+    op.add_column('conversation_sessions', sa.Column('summary', sa.Text(), nullable=False, server_default=''))
+    op.add_column('conversation_sessions', sa.Column('summarized_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('conversation_sessions', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Remove rolling summary columns from conversation_sessions."""
+    op.drop_column('conversation_sessions', 'message_count')
+    op.drop_column('conversation_sessions', 'summarized_count')
+    op.drop_column('conversation_sessions', 'summary')
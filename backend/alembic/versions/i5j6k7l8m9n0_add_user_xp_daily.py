@@ -0,0 +1,52 @@
+"""add user_xp_daily
+
+Revision ID: i5j6k7l8m9n0
+Revises: h4i5j6k7l8m9
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i5j6k7l8m9n0'
+down_revision: Union[str, Sequence[str], None] = 'h4i5j6k7l8m9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create user_xp_daily (XP per user per UTC day) and backfill it from user_xp_log."""
+    op.create_table(
+        'user_xp_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('xp', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', name='uix_user_xp_daily_user_day'),
+    )
+    op.create_index(op.f('ix_user_xp_daily_user_id'), 'user_xp_daily', ['user_id'], unique=False)
+    op.create_index(op.f('ix_user_xp_daily_day'), 'user_xp_daily', ['day'], unique=False)
+
+    # Enough history for the current week and month boards
+    op.execute(
+        """
+        INSERT INTO user_xp_daily (user_id, day, xp)
+        SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, SUM(xp_amount)
+        FROM user_xp_log
+        WHERE created_at >= date_trunc('month', now() AT TIME ZONE 'UTC') - interval '31 days'
+        GROUP BY user_id, (created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop user_xp_daily table."""
+    op.drop_index(op.f('ix_user_xp_daily_day'), table_name='user_xp_daily')
+    op.drop_index(op.f('ix_user_xp_daily_user_id'), table_name='user_xp_daily')
+    op.drop_table('user_xp_daily')
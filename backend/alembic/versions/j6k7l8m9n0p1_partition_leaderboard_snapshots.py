@@ -0,0 +1,106 @@
+"""partition leaderboard_snapshots by snapshot_date
+
+Revision ID: j6k7l8m9n0p1
+Revises: i5j6k7l8m9n0
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j6k7l8m9n0p1'
+down_revision: Union[str, Sequence[str], None] = 'i5j6k7l8m9n0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+leaderboard_type_enum = postgresql.ENUM('xp', 'streak', name='leaderboard_type_enum', create_type=False)
+
+_OLD_INDEXES = (
+    'ix_leaderboard_snapshots_user_type_date',
+    'ix_leaderboard_snapshots_user_id',
+    'ix_leaderboard_snapshots_type',
+    'ix_leaderboard_snapshots_snapshot_date',
+)
+
+
+def upgrade() -> None:
+    """Recreate leaderboard_snapshots as a table range-partitioned by day (one partition per snapshot_date)."""
+    bind = op.get_bind()
+    leaderboard_type_enum.create(bind, checkfirst=True)
+    # The table was created by create_all before it had a migration
+    existing = sa.inspect(bind).has_table('leaderboard_snapshots')
+    if existing:
+        op.rename_table('leaderboard_snapshots', 'leaderboard_snapshots_old')
+        for index in _OLD_INDEXES:
+            op.execute(f'DROP INDEX IF EXISTS {index}')
+        op.execute('ALTER INDEX IF EXISTS leaderboard_snapshots_pkey RENAME TO leaderboard_snapshots_old_pkey')
+
+    op.execute(
+        """
+        CREATE TABLE leaderboard_snapshots (
+            snapshot_date DATE NOT NULL,
+            type leaderboard_type_enum NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL,
+            CONSTRAINT leaderboard_snapshots_pkey PRIMARY KEY (snapshot_date, type, user_id)
+        ) PARTITION BY RANGE (snapshot_date)
+        """
+    )
+
+    if existing:
+        op.execute(
+            """
+            DO $$
+            DECLARE d date;
+            BEGIN
+                FOR d IN SELECT DISTINCT snapshot_date FROM leaderboard_snapshots_old LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF leaderboard_snapshots FOR VALUES FROM (%L) TO (%L)',
+                        'leaderboard_snapshots_' || to_char(d, 'YYYYMMDD'), d, d + 1
+                    );
+                END LOOP;
+            END $$
+            """
+        )
+        op.execute(
+            """
+            INSERT INTO leaderboard_snapshots (snapshot_date, type, user_id, rank)
+            SELECT snapshot_date, type, user_id, rank FROM leaderboard_snapshots_old
+            ON CONFLICT DO NOTHING
+            """
+        )
+        op.drop_table('leaderboard_snapshots_old')
+
+
+def downgrade() -> None:
+    """Go back to a single unpartitioned leaderboard_snapshots table."""
+    op.rename_table('leaderboard_snapshots', 'leaderboard_snapshots_part')
+    op.execute('ALTER INDEX leaderboard_snapshots_pkey RENAME TO leaderboard_snapshots_part_pkey')
+    op.create_table(
+        'leaderboard_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', leaderboard_type_enum, nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_leaderboard_snapshots_user_type_date', 'leaderboard_snapshots', ['user_id', 'type', 'snapshot_date'], unique=False)
+    op.create_index(op.f('ix_leaderboard_snapshots_user_id'), 'leaderboard_snapshots', ['user_id'], unique=False)
+    op.create_index(op.f('ix_leaderboard_snapshots_type'), 'leaderboard_snapshots', ['type'], unique=False)
+    op.create_index(op.f('ix_leaderboard_snapshots_snapshot_date'), 'leaderboard_snapshots', ['snapshot_date'], unique=False)
+    op.execute(
+        """
+        INSERT INTO leaderboard_snapshots (user_id, type, rank, snapshot_date)
+        SELECT user_id, type, rank, snapshot_date FROM leaderboard_snapshots_part
+        """
+    )
+    # Drops the partitions with it
+    op.drop_table('leaderboard_snapshots_part')
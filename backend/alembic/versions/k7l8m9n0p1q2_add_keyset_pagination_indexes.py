@@ -0,0 +1,30 @@
+"""add keyset pagination indexes
+
+Revision ID: k7l8m9n0p1q2
+Revises: j6k7l8m9n0p1
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k7l8m9n0p1q2'
+down_revision: Union[str, Sequence[str], None] = 'j6k7l8m9n0p1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the (created_at, id) sort keys used by cursor pagination of posts and comments."""
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_post_comments_post_created_at_id', 'post_comments', ['post_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the cursor pagination indexes."""
+    op.drop_index('ix_post_comments_post_created_at_id', table_name='post_comments')
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from core.pagination import decode_cursor, encode_cursor, set_next_cursor
 from core.security import get_current_user
 from database.session import get_session
 from models.user import User
@@ -19,17 +23,28 @@ router = APIRouter(tags=["Posts"])
 
 @router.get("/posts/feed")
 async def get_feed(
+	response: Response,
 	limit: int = 20,
 	offset: int = 0,
+	cursor: Optional[str] = None,
 	session: AsyncSession = Depends(get_session),
 	current_user: User = Depends(get_current_user),
 ):
+	"""
+	Accepted posts, newest first. Pass the X-Next-Cursor response header as
+	`cursor` to get the next page (constant cost at any depth); `offset` is
+	ignored when `cursor` is given.
+	"""
 	repo = PostRepository(session)
-	return await repo.list_feed(
+	items = await repo.list_feed(
 		current_user_id=current_user.id,
 		limit=limit,
 		offset=offset,
+		after=decode_cursor(cursor, (datetime, int)) if cursor else None,
 	)
+	if items and len(items) == limit:
+		set_next_cursor(response, encode_cursor(items[-1]["created_at"], items[-1]["post_id"]))
+	return items
 
 
 @router.get("/users/me/posts")
@@ -51,8 +66,10 @@ async def get_my_posts(
 @router.get("/posts/{post_id}/comments", response_model=list[PostCommentResponse])
 async def get_post_comments(
     post_id: int,
+    response: Response,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -62,6 +79,7 @@ async def get_post_comments(
         post_id: ID of the post to get comments for
         limit: Maximum number of comments to return (default: 20)
         offset: Number of comments to skip (default: 0)
+        cursor: X-Next-Cursor header of the previous page (replaces offset)
     
     Returns:
         List of comments with author information
@@ -77,7 +95,10 @@ async def get_post_comments(
         post_id=post_id,
         limit=limit,
         offset=offset,
+        after=decode_cursor(cursor, (datetime, int)) if cursor else None,
     )
+    if comments and len(comments) == limit:
+        set_next_cursor(response, encode_cursor(comments[-1]["created_at"], comments[-1]["comment_id"]))
     
     return comments
 
@@ -18,7 +18,7 @@ async def login(
     print("LOGIN CALLED")
 
     try:
-        decoded = decode_id_token(token)
+        decoded = await decode_id_token(token)
         print("DECODED:", decoded)
 
         email = decoded.get("email")
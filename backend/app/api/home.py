@@ -5,7 +5,13 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.security import get_current_user
 from database.session import get_session
+from models.leaderboard_snapshot import LeaderboardType
+from repositories.leaderboardRepository import LeaderboardPeriod, LeaderboardRepository
+from repositories.topicRepository import TopicRepository
 from repositories.userRepository import UserRepository
+from schemas.daily_mission import DailyMissionsResponse
+from schemas.topic import TopicProgressOut
+from services.mission_service import MissionService
 
 
 router = APIRouter(prefix="/home", tags=["Home"])
@@ -20,7 +26,6 @@ async def get_summary(
     
     effective_streak, is_active_today = await user_repo.reconcile_streak_on_read(
         user_id=current_user.id,
-        last_active_date=current_user.last_active_date,
     )
 
     user_point = await user_repo.regen_energy_if_needed(current_user.id)
@@ -31,4 +36,89 @@ async def get_summary(
         "xp": int(getattr(user_point, "xp", 0) or 0),
         "energy": int(getattr(user_point, "energy", 0) or 0),
         "max_energy": user_repo.MAX_ENERGY,
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    """Everything the home screen shows, in one request.
+
+    Same values as /home/summary, /daily-missions, /leaderboard/me (all-time)
+    and the current topic of /topics, but the user_points row is read once,
+    the streak reset, energy regen and mission assignment are only flushed
+    and committed together, and the ranks come from the in-memory boards.
+    """
+    user_repo = UserRepository(session)
+    mission_service = MissionService(session)
+    topic_repo = TopicRepository(session)
+    date_value = mission_service.today_local()
+
+    try:
+        user_point = await user_repo.get_user_point(current_user.id)
+        effective_streak, is_active_today = await user_repo.reconcile_streak_on_read(
+            user_id=current_user.id,
+            commit=False,
+            user_point=user_point,
+        )
+        user_point = await user_repo.regen_energy_if_needed(
+            current_user.id,
+            commit=False,
+            user_point=user_point,
+        )
+        missions = await mission_service.get_daily_missions(user_id=current_user.id, date_value=date_value)
+
+        # Only the current topic is shown: skip the per-topic lesson counts
+        topics_raw = await topic_repo.get_topics_progress(
+            user_id=current_user.id,
+            include_deleted=False,
+            published_only=True,
+            count_completed_lessons=False,
+        )
+        current_topic = None
+        current_index = topic_repo.current_topic_index(topics_raw)
+        if current_index is not None:
+            t = topics_raw[current_index]
+            completed_lessons = 0
+            if t["total_lessons"] > 0:
+                completed_lessons = await topic_repo.count_completed_lessons(
+                    user_id=current_user.id, topic_id=t["id"]
+                )
+            current_topic = TopicProgressOut(
+                id=t["id"],
+                name=t["name"],
+                description=t["description"],
+                status="current",
+                progress=t["progress"],
+                total_lessons=t["total_lessons"],
+                completed_lessons=completed_lessons,
+            )
+
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+    # After the commit, so a streak reset above is already on the boards
+    leaderboard_repo = LeaderboardRepository(session)
+    ranks = {}
+    for lb_type in (LeaderboardType.xp, LeaderboardType.streak):
+        row = await leaderboard_repo.get_user_rank(
+            user_id=current_user.id,
+            lb_type=lb_type,
+            period=LeaderboardPeriod.all,
+        )
+        ranks[lb_type.value] = row["rank"] if row else None
+
+    return {
+        "streak": effective_streak,
+        "is_streak_active_today": is_active_today,
+        "xp": int(getattr(user_point, "xp", 0) or 0),
+        "energy": int(getattr(user_point, "energy", 0) or 0),
+        "max_energy": user_repo.MAX_ENERGY,
+        "daily_missions": DailyMissionsResponse(date=date_value, missions=missions),
+        "rank": ranks,
+        "current_topic": current_topic,
+    }
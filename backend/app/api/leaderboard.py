@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from core.pagination import decode_cursor, encode_cursor, set_next_cursor
 from core.security import get_current_user
 from database.session import get_session
 from models.leaderboard_snapshot import LeaderboardType
@@ -14,10 +17,12 @@ router = APIRouter(tags=["Leaderboard"])
 
 @router.get("/leaderboard")
 async def get_leaderboard(
+	response: Response,
 	lb_type: LeaderboardType = Query(..., alias="type"),
 	period: LeaderboardPeriod = Query(LeaderboardPeriod.all),
 	limit: int = Query(50, ge=1),
 	offset: int = Query(0, ge=0),
+	cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page (replaces offset)"),
 	session: AsyncSession = Depends(get_session),
 	current_user=Depends(get_current_user),
 ):
@@ -27,10 +32,15 @@ async def get_leaderboard(
 		period=period,
 		limit=limit,
 		offset=offset,
+		after=decode_cursor(cursor, (int, int)) if cursor else None,
 	)
 	my_user_id = int(getattr(current_user, "id"))
 	for item in items:
 		item["is_me"] = int(item.get("user_id")) == my_user_id
+	if items and len(items) == limit:
+		# Keyed by score, not rank: ranks shift as other users earn XP
+		last = items[-1]
+		set_next_cursor(response, encode_cursor(last[lb_type.value], last["user_id"]))
 	return items
 
 
@@ -1,36 +1,110 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import Response
+import asyncio
+import json
+from typing import Dict
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Header, UploadFile, File, Form, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from schemas.conversation import (
     ConversationRequest,
     ConversationResponse,
     VoiceChatResponse,
 )
+from core.security import decode_id_token, verify_firebase_token
 from services.chat_service import ConversationChatService
-from services.gemini_client import GeminiClient
+from services.conversation_sessions import DEFAULT_SESSION_ID, MAX_SESSION_ID_LENGTH, ConversationSession, get_session_store
+from services.gemini_client import get_gemini_client
+from core.config import settings
+from services.tts_cache import TTSCache
 from services.tts_service import TTSService
-from services.stt_service import get_stt_service
+from services.stt_service import StreamingTranscriber, get_stt_service
 from services.audio_utils import load_audio_from_bytes
+from services.sse import sse_event, sse_response
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["Conversation"])
 
-llm = GeminiClient()
+llm = get_gemini_client()
 chat_service = ConversationChatService(llm)
-tts_service = TTSService()
+session_store = get_session_store()
+tts_service = TTSService(
+    cache=TTSCache(
+        directory=settings.tts_cache_dir,
+        memory_max_bytes=settings.tts_cache_memory_mb * 1024 * 1024,
+        disk_max_bytes=settings.tts_cache_disk_mb * 1024 * 1024,
+    )
+)
+
+NOT_HEARD_EN = "Sorry, I couldn't hear you clearly. Could you please try again?"
+NOT_HEARD_VI = "Xin lỗi, mình không nghe rõ. Bạn có thể nói lại không?"
+
+# Fixed replies synthesized into the TTS cache at startup
+CANNED_REPLIES = [(NOT_HEARD_EN, "en"), (NOT_HEARD_VI, "vi")]
+
+# Audio for a given (text, lang) never changes, so browsers may keep it for good
+_TTS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Summary refreshes run after the reply is sent; keep references to the tasks
+_summary_tasks: Dict[tuple, asyncio.Task] = {}
+
+
+async def _save_turn(session: ConversationSession) -> None:
+    await session_store.save(session)
+    if session.key not in _summary_tasks and chat_service.needs_summary(session):
+        task = asyncio.create_task(_refresh_summary(session))
+        _summary_tasks[session.key] = task
+        task.add_done_callback(lambda _: _summary_tasks.pop(session.key, None))
+
+
+async def _refresh_summary(session: ConversationSession) -> None:
+    try:
+        if await chat_service.refresh_summary(session):
+            await session_store.save_summary(session)
+    except Exception as e:
+        logger.error(f"Conversation summary failed for {session.key}: {e}")
 
 
 @router.post("/message", response_model=ConversationResponse)
-def chat(req: ConversationRequest):
-    reply = chat_service.chat(req.message)
+async def chat(req: ConversationRequest, token: Dict = Depends(verify_firebase_token)):
+    session = await session_store.load(token["uid"], req.session_id)
+    reply = await chat_service.chat(session, req.message)
+    await _save_turn(session)
     return {"response": reply}
 
 
+@router.post("/message/stream")
+async def chat_stream(req: ConversationRequest, token: Dict = Depends(verify_firebase_token)):
+    """
+    Same as /message, as server-sent events:
+    `token` ({"text": chunk}) for each chunk, then `done` ({"response": full reply})
+    """
+    session = await session_store.load(token["uid"], req.session_id)
+
+    async def events():
+        parts = []
+        try:
+            async for chunk in chat_service.chat_stream(session, req.message):
+                parts.append(chunk)
+                yield sse_event("token", {"text": chunk})
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield sse_event("error", {"detail": str(e)})
+            return
+        finally:
+            await _save_turn(session)
+        yield sse_event("done", {"response": "".join(parts)})
+
+    return sse_response(events())
+
+
 @router.post("/voice", response_model=VoiceChatResponse)
 async def voice_chat(
     audio: UploadFile = File(...),
-    force_english: bool = Form(default=False)
+    force_english: bool = Form(default=False),
+    session_id: str = Form(default=DEFAULT_SESSION_ID, max_length=MAX_SESSION_ID_LENGTH),
+    token: Dict = Depends(verify_firebase_token),
 ):
     """
     Voice chat endpoint:
@@ -49,16 +123,16 @@ async def voice_chat(
         audio_bytes = await audio.read()
         logger.info(f"Received voice message: {len(audio_bytes)} bytes, force_english={force_english}")
 
-        # Convert to numpy array
-        audio_array = load_audio_from_bytes(audio_bytes)
+        # Convert to numpy array (decode and CTC pass run off the event loop)
+        audio_array = await asyncio.to_thread(load_audio_from_bytes, audio_bytes)
 
         # Transcribe audio to text
         stt_service = get_stt_service()
-        user_text = stt_service.transcribe(audio_array)
+        user_text = await asyncio.to_thread(stt_service.transcribe, audio_array)
         logger.info(f"Transcribed user message: '{user_text}'")
 
         if not user_text.strip():
-            error_msg = "Sorry, I couldn't hear you clearly. Could you please try again?" if force_english else "Xin lỗi, mình không nghe rõ. Bạn có thể nói lại không?"
+            error_msg = NOT_HEARD_EN if force_english else NOT_HEARD_VI
             return {
                 "user_text": "",
                 "response_text": error_msg,
@@ -66,10 +140,12 @@ async def voice_chat(
             }
 
         # Generate chat response (with English requirement if force_english)
+        session = await session_store.load(token["uid"], session_id)
         if force_english:
-            response_text = chat_service.chat_english(user_text)
+            response_text = await chat_service.chat_english(session, user_text)
         else:
-            response_text = chat_service.chat(user_text)
+            response_text = await chat_service.chat(session, user_text)
+        await _save_turn(session)
         logger.info(f"Chat response: '{response_text[:100]}...'")
 
         # Detect language and generate TTS
@@ -91,30 +167,197 @@ async def voice_chat(
         }
 
 
+_PCM_ENCODINGS = {"pcm_s16le": np.dtype("<i2"), "f32le": np.dtype("<f4")}
+
+
+def _decode_pcm(payload: bytes, encoding: str) -> np.ndarray:
+    dtype = _PCM_ENCODINGS[encoding]
+    samples = np.frombuffer(payload, dtype=dtype, count=len(payload) // dtype.itemsize)
+    if dtype.kind == "i":
+        return samples.astype(np.float32) * (1.0 / 32768.0)
+    return samples
+
+
+@router.websocket("/voice/stream")
+async def voice_chat_stream(
+    websocket: WebSocket,
+    token: str,
+    force_english: bool = False,
+    session_id: str = Query(DEFAULT_SESSION_ID, max_length=MAX_SESSION_ID_LENGTH),
+):
+    """
+    Streaming voice chat over WebSocket.
+    Browsers can't set headers on a WebSocket, so the Firebase ID token is
+    passed as the `token` query parameter.
+
+    Client -> server:
+        binary frames: 16 kHz mono PCM (pcm_s16le by default)
+        {"type": "config", "encoding": "pcm_s16le" | "f32le"}
+        {"type": "end"}     force end of utterance
+        {"type": "reset"}   drop the current utterance
+    Server -> client:
+        {"type": "partial", "text": ...}   after each transcribed chunk
+        {"type": "final", "text": ...}     on end of speech
+        {"type": "response", ...}          same fields as POST /chat/voice
+
+    Chunks are transcribed while the user is still speaking, so at end of
+    speech only the last chunk is left before the chat call starts.
+    """
+    try:
+        user_uid = (await decode_id_token(token))["uid"]
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    stream = StreamingTranscriber(get_stt_service())
+    encoding = "pcm_s16le"
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                stream.feed(_decode_pcm(message["bytes"], encoding))
+                partial = await asyncio.to_thread(stream.process_ready)
+                if partial is not None:
+                    await websocket.send_json({"type": "partial", "text": partial})
+                if not (stream.end_of_speech() or stream.is_full()):
+                    continue
+            else:
+                try:
+                    control = json.loads(message.get("text") or "{}")
+                except ValueError:
+                    await websocket.send_json({"type": "error", "detail": "Invalid control message"})
+                    continue
+
+                kind = control.get("type")
+                if kind == "config":
+                    if control.get("encoding") not in _PCM_ENCODINGS:
+                        await websocket.send_json({"type": "error", "detail": "Unsupported encoding"})
+                    else:
+                        encoding = control["encoding"]
+                    continue
+                if kind == "reset":
+                    stream.reset()
+                    continue
+                if kind != "end":
+                    continue
+
+            user_text = await asyncio.to_thread(stream.finish)
+            stream.reset()
+            await websocket.send_json({"type": "final", "text": user_text})
+            await websocket.send_json(
+                {"type": "response", **await _voice_reply(user_uid, session_id, user_text, force_english)}
+            )
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Voice stream error: {e}")
+        await websocket.close(code=1011)
+
+
+async def _voice_reply(user_uid: str, session_id: str, user_text: str, force_english: bool) -> dict:
+    if not user_text.strip():
+        error_msg = NOT_HEARD_EN if force_english else NOT_HEARD_VI
+        return {"user_text": "", "response_text": error_msg, "has_audio": False}
+
+    session = await session_store.load(user_uid, session_id)
+    if force_english:
+        response_text = await chat_service.chat_english(session, user_text)
+    else:
+        response_text = await chat_service.chat(session, user_text)
+    await _save_turn(session)
+
+    return {
+        "user_text": user_text,
+        "response_text": response_text,
+        "has_audio": True,
+        "audio_lang": tts_service.detect_language(response_text),
+    }
+
+
 @router.post("/voice/tts")
-async def text_to_speech(text: str = Form(...), lang: str = Form(default="en")):
+async def text_to_speech(
+    text: str = Form(...),
+    lang: str = Form(default="en"),
+    if_none_match: str | None = Header(default=None),
+):
     """
     Convert text to speech audio
     Returns MP3 audio bytes
     """
-    try:
-        audio_bytes = tts_service.synthesize(text, lang)
+    return await _tts_response(text, lang, if_none_match)
+
+
+@router.get("/voice/tts")
+async def text_to_speech_get(
+    text: str,
+    lang: str = "en",
+    if_none_match: str | None = Header(default=None),
+):
+    """Cacheable variant of POST /voice/tts (browsers and proxies only cache GET)"""
+    return await _tts_response(text, lang, if_none_match)
+
+
+async def _tts_response(text: str, lang: str, if_none_match: str | None) -> Response:
+    etag = f'"{tts_service.cache_key(text, lang)}"'
+    cache_headers = {"ETag": etag, "Cache-Control": _TTS_CACHE_CONTROL}
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=cache_headers)
+
+    # Fully cached: the body is known to be complete, so it may be cached too
+    audio = await asyncio.to_thread(tts_service.cached, text, lang)
+    if audio is not None:
         return Response(
-            content=audio_bytes,
+            content=audio,
             media_type="audio/mpeg",
-            headers={"Content-Disposition": "inline; filename=response.mp3"},
+            headers={"Content-Disposition": "inline; filename=response.mp3", **cache_headers},
         )
+
+    # Audio is streamed sentence by sentence; wait for the first one so a
+    # failure can still be reported with a proper status code
+    chunks = tts_service.stream(text, lang, max_concurrency=settings.tts_stream_concurrency)
+    try:
+        first = await chunks.__anext__()
     except Exception as e:
+        await chunks.aclose()
         logger.error(f"TTS error: {e}")
         return Response(status_code=500, content=str(e))
 
+    async def audio_stream():
+        yield first
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Headers are already sent: end the stream early
+            logger.error(f"TTS stream error: {e}")
+
+    # A later segment may still fail and truncate the body: never let a
+    # streamed response be cached or revalidated (no ETag)
+    return StreamingResponse(
+        audio_stream(),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": "inline; filename=response.mp3", "Cache-Control": "no-store"},
+    )
+
 
 @router.post("/reset")
-def reset():
-    chat_service.reset()
+async def reset(
+    session_id: str = Query(DEFAULT_SESSION_ID, max_length=MAX_SESSION_ID_LENGTH),
+    token: Dict = Depends(verify_firebase_token),
+):
+    await session_store.reset(token["uid"], session_id)
     return {"message": "Conversation reset"}
 
 
 @router.get("/history")
-def history():
-    return {"history": chat_service.get_history()}
+async def history(
+    session_id: str = Query(DEFAULT_SESSION_ID, max_length=MAX_SESSION_ID_LENGTH),
+    token: Dict = Depends(verify_firebase_token),
+):
+    session = await session_store.load(token["uid"], session_id)
+    return {"history": session.messages()}
@@ -55,13 +55,7 @@ async def get_topics(
 	# Determine the single "current" topic:
 	# - first topic that isn't fully completed
 	# - if all are completed, make the last topic "current" (progress=100)
-	current_index = None
-	for idx, t in enumerate(topics_raw):
-		if t["total_sections"] > 0 and t["completed_sections"] < t["total_sections"]:
-			current_index = idx
-			break
-	if current_index is None:
-		current_index = len(topics_raw) - 1
+	current_index = topic_repo.current_topic_index(topics_raw)
 
 	topics_out: List[TopicProgressOut] = []
 	for idx, t in enumerate(topics_raw):
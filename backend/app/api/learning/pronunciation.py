@@ -1,37 +1,54 @@
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from core.config import settings
 from services.pronunciation_service import PracticeService
 from services.evaluation_service import PronunciationEvaluationService
 from services.feedback_service import FeedbackService
-from services.gemini_client import GeminiClient
+from services.feedback_jobs import FeedbackJobStore
+from services.material_cache import MaterialCache
+from services.gemini_client import get_gemini_client
+from services.sse import sse_event, sse_response
 from ml_models.wav2vec_scorer import Wav2VecScorer
+from ml_models.inference_engine import InferenceEngine
 from schemas.pronunciation import AssessPronunciationResponse, GenerateMaterialRequest, GenerateMaterialResponse
 
 router = APIRouter(prefix="/pronunciation")
 
-llm = GeminiClient()
+llm = get_gemini_client()
 
 practice = PracticeService(llm)
-evaluator = PronunciationEvaluationService(Wav2VecScorer())
-feedback = FeedbackService(llm)
+material_cache = MaterialCache(
+    practice,
+    pool_size=settings.material_pool_size,
+    low_watermark=settings.material_pool_low_watermark,
+    max_serves=settings.material_max_serves,
+    ttl_seconds=settings.material_ttl_seconds,
+    max_keys=settings.material_cache_max_keys,
+)
+scorer = Wav2VecScorer(
+    backend=settings.pronunciation_backend,
+    onnx_dir=settings.onnx_model_dir,
+)
+engine = InferenceEngine(
+    scorer,
+    max_batch_size=settings.pronunciation_max_batch_size,
+    max_wait_ms=settings.pronunciation_max_batch_wait_ms,
+    num_workers=settings.pronunciation_inference_workers,
+)
+evaluator = PronunciationEvaluationService(scorer, engine=engine)
+feedback = FeedbackService(llm, template_min_score=settings.feedback_template_min_score)
+feedback_jobs = FeedbackJobStore(ttl_seconds=settings.feedback_job_ttl_seconds)
 
+NO_SPEECH_FEEDBACK = (
+    "Nhận xét: Mình chưa nghe thấy giọng nói trong bản ghi âm.\n"
+    "Mẹo 1: Kiểm tra micro đã được bật và cho phép truy cập.\n"
+    "Mẹo 2: Nói to, rõ ràng và đặt micro gần miệng hơn."
+)
 
-@router.post("/material", response_model=GenerateMaterialResponse)
-def generate_material(req: GenerateMaterialRequest):
-    if req.mode == "word":
-        items = [
-            {"type": "word", "text": w["word"]}
-            for w in practice.generate_words(
-                req.count, req.level, req.topic
-            )
-        ]
-    else:
-        items = [
-            {"type": "sentence", "text": s["sentence"]}
-            for s in practice.generate_sentences(
-                req.count, req.level, req.topic
-            )
-        ]
 
+@router.post("/material", response_model=GenerateMaterialResponse)
+async def generate_material(req: GenerateMaterialRequest):
+    # Served from the pre-generated pool; only a cold key waits for the LLM
+    items = await material_cache.get(req.mode, req.count, req.level, req.topic)
     return {"items": items}
 
 
@@ -41,10 +58,105 @@ async def assess(
     audio: UploadFile = File(...)
 ):
     audio_bytes = await audio.read()
-    score = evaluator.evaluate(audio_bytes, reference)
-    tips = feedback.generate(score)
+    score = await evaluator.evaluate_async(audio_bytes, reference)
+    if score["no_speech"]:
+        # Nothing to coach on: don't spend an LLM call
+        tips = NO_SPEECH_FEEDBACK
+    else:
+        tips = await feedback.generate(score)
 
     return {
         "assessment": score,
         "feedback": tips
     }
+
+
+@router.post("/assess/stream")
+async def assess_stream(
+    reference: str = Form(...),
+    audio: UploadFile = File(...)
+):
+    """
+    Same as /assess, as server-sent events:
+    `assessment` (score payload) -> `feedback` (text chunks) -> `done` (full feedback)
+    """
+    audio_bytes = await audio.read()
+    score = await evaluator.evaluate_async(audio_bytes, reference)
+
+    async def events():
+        yield sse_event("assessment", score)
+
+        if score["no_speech"]:
+            yield sse_event("feedback", {"text": NO_SPEECH_FEEDBACK})
+            yield sse_event("done", {"feedback": NO_SPEECH_FEEDBACK})
+            return
+
+        parts = []
+        try:
+            async for chunk in feedback.stream(score):
+                parts.append(chunk)
+                yield sse_event("feedback", {"text": chunk})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+        yield sse_event("done", {"feedback": "".join(parts)})
+
+    return sse_response(events())
+
+
+@router.post("/assess/async")
+async def assess_async(
+    reference: str = Form(...),
+    audio: UploadFile = File(...)
+):
+    """
+    Two-phase assess: the score is returned as soon as it is ready, feedback
+    is delivered later via GET /feedback/{job_id} or /feedback/{job_id}/stream.
+    `feedback` is already filled in when no LLM call is needed.
+    """
+    audio_bytes = await audio.read()
+    score = await evaluator.evaluate_async(audio_bytes, reference)
+
+    if score["no_speech"]:
+        job = feedback_jobs.completed(NO_SPEECH_FEEDBACK)
+    else:
+        cached = feedback.template_feedback(score)
+        if cached is not None:
+            job = feedback_jobs.completed(cached)
+        else:
+            job = feedback_jobs.submit(feedback.stream(score))
+
+    return {
+        "assessment": score,
+        "feedback_job_id": job.id,
+        "feedback": job.feedback,
+    }
+
+
+@router.get("/feedback/{job_id}")
+async def get_feedback(job_id: str):
+    job = feedback_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Feedback job not found")
+    return job.to_dict()
+
+
+@router.get("/feedback/{job_id}/stream")
+async def stream_feedback(job_id: str):
+    """
+    Feedback of a job as server-sent events: `feedback` (text chunks) -> `done`,
+    or `error` if generation failed. Chunks produced before subscribing are replayed.
+    """
+    job = feedback_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Feedback job not found")
+
+    async def events():
+        async for chunk in job.chunks():
+            yield sse_event("feedback", {"text": chunk})
+        if job.error:
+            yield sse_event("error", {"detail": job.error})
+        else:
+            yield sse_event("done", {"feedback": job.feedback})
+
+    return sse_response(events())
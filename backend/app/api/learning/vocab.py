@@ -11,7 +11,7 @@ from services.mission_service import MissionService
 from services.dictionary_service import (
     DictionaryUpstreamError,
     DictionaryWordNotFoundError,
-    lookup_word,
+    get_dictionary_cache,
 )
 
 
@@ -19,11 +19,11 @@ router = APIRouter()
 
 
 @router.get("/vocabs/search", response_model=VocabSearchResponse, tags=["Vocabs"])
-async def search_vocab(word: str):
-    """Search a vocab via dictionaryapi.dev."""
+async def search_vocab(word: str, session: AsyncSession = Depends(get_session)):
+    """Search a vocab: memory cache, then the vocabs table, then dictionaryapi.dev."""
 
     try:
-        payload = await lookup_word(word)
+        payload = await get_dictionary_cache().lookup(word, session)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except DictionaryWordNotFoundError:
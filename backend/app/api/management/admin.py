@@ -1,10 +1,17 @@
+import asyncio
+import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import tuple_
 from sqlmodel import select, func, col
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.session import get_session
+from database.session import get_session, async_session_maker, pool_stats
+from core.config import settings
+from core.pagination import decode_cursor, encode_cursor, set_next_cursor
 from core.security import required_roles, get_current_user
+from core.auth_cache import invalidate_user
 
 from repositories.userRepository import UserRepository
 
@@ -26,8 +33,21 @@ from schemas.post import (
 from models.lesson import Lesson, LessonStatus, Topic, LessonSection, Question
 from models.user import RoleType, User, UserInfo
 from models.post import Post, PostComment, PostStatus
+from ml_models.model_registry import get_model_registry
+from ml_models.backends import evict_backends
+from api.learning import conversation, pronunciation
+from services.audio_utils import vad_stats
+from services.http_client import get_http_client
+from services.conversation_sessions import get_session_store
+from services.leaderboard_engine import queue_leaderboard_update
+from services.xp_rollup_job import XPRollupCompactionJob
+from services.leaderboard_snapshot_job import LeaderboardSnapshotJob
+from services.dictionary_prefetch_job import DictionaryPrefetchJob
+from services.dictionary_service import get_dictionary_cache
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
 	prefix="/admin", 
 	tags=["Admin"],
@@ -38,19 +58,26 @@ router = APIRouter(
 
 @router.get("/users", response_model=list[User])
 async def list_users(
+	response: Response,
 	skip: int = 0,
 	limit: int = 50,
+	cursor: Optional[str] = None,
 	session: AsyncSession = Depends(get_session),
 ):
 	repo = UserRepository(session)
-	users = await repo.get_all_users(skip=skip, limit=limit)
+	after_id = decode_cursor(cursor, (int,))[0] if cursor else None
+	users = await repo.get_all_users(skip=skip, limit=limit, after_id=after_id)
+	if users and len(users) == limit:
+		set_next_cursor(response, encode_cursor(users[-1].id))
 	return users
 
 
 @router.get("/users/enriched", response_model=list[AdminUserEnrichedResponse])
 async def list_users_enriched(
+	response: Response,
 	skip: int = 0,
 	limit: int = 50,
+	cursor: Optional[str] = None,
 	session: AsyncSession = Depends(get_session),
 ):
 	"""
@@ -69,13 +96,17 @@ async def list_users_enriched(
 	Args:
 		skip: Number of users to skip (pagination)
 		limit: Maximum number of users to return (default: 50)
+		cursor: X-Next-Cursor header of the previous page (replaces skip)
 		session: Database session
 		
 	Returns:
 		List of AdminUserEnrichedResponse with user data, profile, and roles
 	"""
 	repo = UserRepository(session)
-	enriched_users = await repo.get_all_users_enriched(skip=skip, limit=limit)
+	after_id = decode_cursor(cursor, (int,))[0] if cursor else None
+	enriched_users = await repo.get_all_users_enriched(skip=skip, limit=limit, after_id=after_id)
+	if enriched_users and len(enriched_users) == limit:
+		set_next_cursor(response, encode_cursor(enriched_users[-1]["id"]))
 	return enriched_users
 
 
@@ -123,6 +154,9 @@ async def admin_update_user(
 		for field, value in update_fields.items():
 			setattr(user, field, value)
 		session.add(user)
+		# e.g. is_banned: board membership may change
+		queue_leaderboard_update(session, "invalidate", user_id)
+		invalidate_user(session, user_id=user_id)
 		await session.commit()
 		await session.refresh(user)
 	return user
@@ -357,6 +391,8 @@ async def list_all_posts(
 	limit: int = Query(50, ge=1, le=100),
 	status: Optional[PostStatus] = None,
 	user_id: Optional[int] = None,
+	cursor: Optional[str] = None,
+	include_total: bool = True,
 	session: AsyncSession = Depends(get_session),
 ):
 	"""
@@ -369,9 +405,11 @@ async def list_all_posts(
 		limit: Maximum number of records to return
 		status: Filter by post status (PENDING, ACCEPTED, DECLINED, FLAGGED, ARCHIVED)
 		user_id: Filter by user ID
+		cursor: next_cursor of the previous page (keyset pagination, replaces skip)
+		include_total: Run the COUNT(*) for `total` (null when false)
 		
 	Returns:
-		List of posts with user information and total count
+		List of posts with user information, total count and next_cursor
 	"""
 	stmt = (
 		select(
@@ -399,17 +437,24 @@ async def list_all_posts(
 		stmt = stmt.where(Post.user_id == user_id)
 	
 	# Get total count
-	count_stmt = select(func.count()).select_from(Post).where(Post.is_deleted == False)
-	if status:
-		count_stmt = count_stmt.where(Post.status == status)
-	if user_id:
-		count_stmt = count_stmt.where(Post.user_id == user_id)
-	
-	total_result = await session.exec(count_stmt)
-	total = total_result.one()
+	total = None
+	if include_total:
+		count_stmt = select(func.count()).select_from(Post).where(Post.is_deleted == False)
+		if status:
+			count_stmt = count_stmt.where(Post.status == status)
+		if user_id:
+			count_stmt = count_stmt.where(Post.user_id == user_id)
+		
+		total_result = await session.exec(count_stmt)
+		total = total_result.one()
 	
 	# Get paginated results
-	stmt = stmt.order_by(Post.created_at.desc()).offset(skip).limit(limit)
+	stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+	if cursor:
+		created_at, post_id = decode_cursor(cursor, (datetime, int))
+		stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id))
+	else:
+		stmt = stmt.offset(skip)
 	result = await session.exec(stmt)
 	posts = result.all()
 	
@@ -417,6 +462,9 @@ async def list_all_posts(
 		total=total,
 		skip=skip,
 		limit=limit,
+		next_cursor=(
+			encode_cursor(posts[-1].created_at, posts[-1].id) if len(posts) == limit else None
+		),
 		posts=[
 			AdminPostListItem(
 				id=p.id,
@@ -803,3 +851,191 @@ async def delete_comment(
 	return None
 
 
+# ============ ML Models ============
+
+@router.get("/models")
+async def list_loaded_models():
+	"""
+	Report memory per model loaded in this worker's model registry.
+
+	**Role:** ADMIN only
+	"""
+	return get_model_registry().memory_report()
+
+
+@router.post("/models/preload")
+async def preload_model(model_id: str = Query(..., min_length=1)):
+	"""
+	Load a checkpoint into the model registry (no-op if already loaded).
+
+	**Role:** ADMIN only
+	"""
+	registry = get_model_registry()
+	try:
+		await asyncio.to_thread(registry.preload, [model_id])
+	except Exception as exc:
+		raise HTTPException(status_code=400, detail=f"Failed to load model: {exc}")
+	return registry.memory_report()
+
+
+@router.delete("/models", status_code=status.HTTP_204_NO_CONTENT)
+async def evict_model(model_id: str = Query(..., min_length=1)):
+	"""
+	Evict a checkpoint from the model registry. It is reloaded on next use.
+
+	**Role:** ADMIN only
+	"""
+	if not get_model_registry().evict(model_id):
+		raise HTTPException(status_code=404, detail="Model not loaded")
+	# Backends hold their own reference to the weights
+	evict_backends(model_id)
+	return None
+
+
+# ============ Pronunciation ============
+
+@router.get("/pronunciation/engine")
+async def pronunciation_engine_stats():
+	"""
+	Throughput, batch-size and queue-wait metrics of the scoring engine,
+	silence trimming and feedback jobs (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return {
+		**pronunciation.engine.stats(),
+		"vad": vad_stats.snapshot(),
+		"feedback_jobs": pronunciation.feedback_jobs.stats(),
+	}
+
+
+@router.get("/pronunciation/material-cache")
+async def pronunciation_material_cache_stats():
+	"""
+	Pooled practice material per key: pool sizes, hits and refills (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return pronunciation.material_cache.stats()
+
+
+# ============ Conversation ============
+
+@router.get("/conversation/sessions")
+async def conversation_session_stats():
+	"""
+	Session store backend, held sessions and evictions (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return get_session_store().stats()
+
+
+@router.get("/conversation/tts-cache")
+async def tts_cache_stats():
+	"""
+	Memory and disk usage and hit rates of the speech cache (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return conversation.tts_service.cache.stats()
+
+
+# ============ Outbound HTTP ============
+
+@router.get("/http")
+async def outbound_http_stats():
+	"""
+	Circuit breaker state and latency histogram per upstream host (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return get_http_client().stats()
+
+
+# ============ Database ============
+
+@router.get("/db/pool")
+async def database_pool_stats():
+	"""
+	Connection pool usage and checkout-wait histogram (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return pool_stats()
+
+
+# ============ Dictionary ============
+
+@router.get("/dictionary/cache")
+async def dictionary_cache_stats():
+	"""
+	Entries and hit rates of the in-memory dictionary cache (this worker).
+
+	**Role:** ADMIN only
+	"""
+	return get_dictionary_cache().stats()
+
+
+# Manual prefetch run, if any: the crawl is rate limited and can take minutes
+_prefetch_task: Optional[asyncio.Task] = None
+
+
+@router.post("/dictionary/prefetch", status_code=status.HTTP_202_ACCEPTED)
+async def prefetch_dictionary():
+	"""
+	Start resolving vocabulary of all published lessons, sections and
+	questions into the vocabs table in the background (also runs nightly).
+	Returns right away; the counts of the run are logged when it finishes.
+
+	**Role:** ADMIN only
+	"""
+	global _prefetch_task
+	if _prefetch_task is not None and not _prefetch_task.done():
+		return {"status": "running"}
+
+	job = DictionaryPrefetchJob(
+		session_factory=async_session_maker,
+		concurrency=settings.dictionary_prefetch_concurrency,
+		batch_size=settings.dictionary_prefetch_batch_size,
+	)
+	_prefetch_task = asyncio.create_task(job.run())
+	_prefetch_task.add_done_callback(_log_prefetch_failure)
+	return {"status": "started"}
+
+
+def _log_prefetch_failure(task: asyncio.Task) -> None:
+	if not task.cancelled() and task.exception() is not None:
+		logger.error("Dictionary prefetch failed", exc_info=task.exception())
+
+
+# ============ Leaderboard ============
+
+@router.post("/leaderboard/xp-rollup")
+async def run_xp_rollup():
+	"""
+	Reconcile the daily XP buckets behind the week/month leaderboards with
+	the XP log and drop expired buckets now (also runs nightly).
+
+	**Role:** ADMIN only
+	"""
+	job = XPRollupCompactionJob(
+		session_factory=async_session_maker,
+		retention_days=settings.leaderboard_xp_bucket_retention_days,
+	)
+	return await job.run()
+
+
+@router.post("/leaderboard/snapshot")
+async def run_leaderboard_snapshot():
+	"""
+	Store today's ranks now (also runs nightly) and drop expired snapshot
+	partitions. Re-running replaces today's snapshot.
+
+	**Role:** ADMIN only
+	"""
+	job = LeaderboardSnapshotJob(
+		session_factory=async_session_maker,
+		retention_days=settings.leaderboard_snapshot_retention_days,
+	)
+	return await job.run()
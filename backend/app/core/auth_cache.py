@@ -0,0 +1,245 @@
+"""
+Process-local caches for request authentication.
+
+- TokenCache: sha256(token) -> verified Firebase claims, kept until the
+  token's own `exp` (never longer than `max_ttl`), so a token's signature is
+  checked once instead of on every request
+- UserCache: firebase uid -> User column values for `ttl` seconds; writes
+  that change a user (ban, unban, delete, profile/streak updates) call
+  `invalidate_user` so they are visible immediately in this worker
+- RoleCache: role type -> role id for the process lifetime (the roles table
+  is static), and user id -> role types for `ttl` seconds; role assignment
+  and removal call `invalidate_roles`
+
+Invalidations are queued on the writing session and applied after it
+commits: dropping the entry before the commit would let a concurrent
+request cache the old row again. Entries loaded before an invalidation are
+not cached (see `generation`). Other workers still serve their copy for up
+to `ttl`, so cached users are for authentication and display only; write
+decisions must read the row from the database.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from models.user import RoleType, User
+
+_PENDING_KEY = "auth_cache_invalidations"
+
+
+class TokenCache:
+    def __init__(self, max_entries: int = 10000, max_ttl: float = 3600):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        # Never keep raw bearer tokens in memory longer than the request
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        expires_at = time.time() + self.max_ttl
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class UserCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._uid_by_id: Dict[int, str] = {}
+        # Bumped by every invalidation; see `put`
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, firebase_uid: str, session: AsyncSession) -> Optional[User]:
+        """Cached user attached to `session` (no query), or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is not None and time.monotonic() >= entry[0]:
+                self._drop(firebase_uid)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(firebase_uid)
+            self.hits += 1
+            values = entry[1]
+
+        # A fresh instance per request: merge(load=False) attaches it to this
+        # session as if it had been loaded, without a SELECT
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    def put(self, user: User, generation: Optional[int] = None) -> None:
+        """Cache `user`; skipped if an invalidation happened since `generation`
+        (read before loading it), as the loaded row may predate that write
+        """
+        if user.firebase_uid is None or user.id is None:
+            return
+        values = {column: getattr(user, column) for column in User.__table__.columns.keys()}
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[user.firebase_uid] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.firebase_uid)
+            self._uid_by_id[user.id] = user.firebase_uid
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._uid_by_id.pop(evicted["id"], None)
+
+    def invalidate_user(self, user_id: Optional[int] = None, firebase_uid: Optional[str] = None) -> None:
+        with self._lock:
+            self.generation += 1
+            if firebase_uid is None and user_id is not None:
+                firebase_uid = self._uid_by_id.get(user_id)
+            if firebase_uid is not None:
+                self._drop(firebase_uid)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _drop(self, firebase_uid: str) -> None:
+        entry = self._entries.pop(firebase_uid, None)
+        if entry is not None:
+            self._uid_by_id.pop(entry[1]["id"], None)
+
+
+class RoleCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._role_ids: Dict[RoleType, int] = {}
+        self._memberships: "OrderedDict[int, tuple[float, FrozenSet[RoleType]]]" = OrderedDict()
+        # Bumped by every invalidation; see `UserCache.put`
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def role_id(self, role_type: RoleType) -> Optional[int]:
+        return self._role_ids.get(role_type)
+
+    def put_role_id(self, role_type: RoleType, role_id: int) -> None:
+        self._role_ids[role_type] = role_id
+
+    def get_roles(self, user_id: int) -> Optional[FrozenSet[RoleType]]:
+        with self._lock:
+            entry = self._memberships.get(user_id)
+            if entry is None or time.monotonic() >= entry[0]:
+                self._memberships.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._memberships.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put_roles(
+        self, user_id: int, roles: Iterable[RoleType], generation: Optional[int] = None
+    ) -> FrozenSet[RoleType]:
+        roles = frozenset(roles)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return roles
+            self._memberships[user_id] = (time.monotonic() + self.ttl, roles)
+            self._memberships.move_to_end(user_id)
+            while len(self._memberships) > self.max_entries:
+                self._memberships.popitem(last=False)
+        return roles
+
+    def invalidate_roles(self, user_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self._memberships.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "role_ids": len(self._role_ids),
+            "entries": len(self._memberships),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = TokenCache(
+    max_entries=settings.auth_token_cache_max_entries,
+    max_ttl=settings.auth_token_cache_max_ttl_seconds,
+)
+user_cache = UserCache(
+    max_entries=settings.auth_user_cache_max_entries,
+    ttl=settings.auth_user_cache_ttl_seconds,
+)
+role_cache = RoleCache(
+    max_entries=settings.auth_user_cache_max_entries,
+    ttl=settings.auth_user_cache_ttl_seconds,
+)
+
+
+def invalidate_user(
+    session, user_id: Optional[int] = None, firebase_uid: Optional[str] = None
+) -> None:
+    """Drop the cached user once `session` commits"""
+    session.info.setdefault(_PENDING_KEY, []).append(
+        lambda: user_cache.invalidate_user(user_id=user_id, firebase_uid=firebase_uid)
+    )
+
+
+def invalidate_roles(session, user_id: int) -> None:
+    """Drop the cached role memberships of `user_id` once `session` commits"""
+    session.info.setdefault(_PENDING_KEY, []).append(lambda: role_cache.invalidate_roles(user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    for invalidate in session.info.pop(_PENDING_KEY, None) or ():
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -26,6 +26,78 @@ class Settings(BaseSettings):
     smtp_from_email: str = Field("", env="SMTP_FROM_EMAIL")
     smtp_use_tls: bool = Field(True, env="SMTP_USE_TLS")
 
+    gemini_api_key: str | None = Field(None, env="GEMINI_API_KEY")
+    gemini_model: str = Field("models/gemini-2.5-flash-lite", env="GEMINI_MODEL")
+    # gemini | fake (offline canned replies, for local runs and tests)
+    llm_backend: str = Field("gemini", env="LLM_BACKEND")
+    llm_timeout_seconds: float = Field(30.0, env="LLM_TIMEOUT_SECONDS")
+    llm_max_concurrency: int = Field(8, env="LLM_MAX_CONCURRENCY")
+    llm_max_retries: int = Field(3, env="LLM_MAX_RETRIES")
+
+    # Comma-separated checkpoints loaded into the model registry at startup
+    preload_models: str = Field("facebook/wav2vec2-base-960h", env="PRELOAD_MODELS")
+    # torch | torch_int8 | onnx (onnx needs onnxruntime; graph is exported on first use)
+    pronunciation_backend: str = Field("torch", env="PRONUNCIATION_BACKEND")
+    onnx_model_dir: str | None = Field(None, env="ONNX_MODEL_DIR")
+    pronunciation_max_batch_size: int = Field(8, env="PRONUNCIATION_MAX_BATCH_SIZE")
+    pronunciation_max_batch_wait_ms: float = Field(5.0, env="PRONUNCIATION_MAX_BATCH_WAIT_MS")
+    pronunciation_inference_workers: int = Field(1, env="PRONUNCIATION_INFERENCE_WORKERS")
+    # Attempts scoring at least this much get canned feedback instead of an LLM call
+    feedback_template_min_score: float = Field(8.0, env="FEEDBACK_TEMPLATE_MIN_SCORE")
+    feedback_job_ttl_seconds: int = Field(600, env="FEEDBACK_JOB_TTL_SECONDS")
+    # Practice material pools, one per (mode, level, topic)
+    material_pool_size: int = Field(30, env="MATERIAL_POOL_SIZE")
+    material_pool_low_watermark: int = Field(10, env="MATERIAL_POOL_LOW_WATERMARK")
+    material_max_serves: int = Field(5, env="MATERIAL_MAX_SERVES")
+    material_ttl_seconds: int = Field(3600, env="MATERIAL_TTL_SECONDS")
+    material_cache_max_keys: int = Field(256, env="MATERIAL_CACHE_MAX_KEYS")
+    # memory (per process, LRU) | database (conversation_sessions table, shared by workers)
+    conversation_store: str = Field("memory", env="CONVERSATION_STORE")
+    conversation_max_sessions: int = Field(1000, env="CONVERSATION_MAX_SESSIONS")
+    conversation_max_messages: int = Field(20, env="CONVERSATION_MAX_MESSAGES")
+    # Chat prompt size: estimated tokens for instructions + summary + history + message
+    chat_prompt_token_budget: int = Field(1500, env="CHAT_PROMPT_TOKEN_BUDGET")
+    chat_recent_turns: int = Field(4, env="CHAT_RECENT_TURNS")
+    chat_summary_every_turns: int = Field(6, env="CHAT_SUMMARY_EVERY_TURNS")
+    # Synthesized speech cache (default app/tts_cache)
+    tts_cache_dir: str | None = Field(None, env="TTS_CACHE_DIR")
+    tts_cache_memory_mb: int = Field(32, env="TTS_CACHE_MEMORY_MB")
+    tts_cache_disk_mb: int = Field(256, env="TTS_CACHE_DISK_MB")
+    # Sentences of one reply synthesized in parallel
+    tts_stream_concurrency: int = Field(3, env="TTS_STREAM_CONCURRENCY")
+    # Dictionary lookups: in-process LRU in front of the vocabs table and dictionaryapi.dev
+    dictionary_cache_max_entries: int = Field(5000, env="DICTIONARY_CACHE_MAX_ENTRIES")
+    dictionary_negative_ttl_seconds: int = Field(86400, env="DICTIONARY_NEGATIVE_TTL_SECONDS")
+    # Nightly job resolving vocabulary of published lessons into the vocabs table
+    dictionary_prefetch_concurrency: int = Field(4, env="DICTIONARY_PREFETCH_CONCURRENCY")
+    dictionary_prefetch_batch_size: int = Field(100, env="DICTIONARY_PREFETCH_BATCH_SIZE")
+    # Shared outbound HTTP client
+    http_timeout_seconds: float = Field(10.0, env="HTTP_TIMEOUT_SECONDS")
+    http_max_connections: int = Field(100, env="HTTP_MAX_CONNECTIONS")
+    http_per_host_concurrency: int = Field(16, env="HTTP_PER_HOST_CONCURRENCY")
+    http_breaker_failure_threshold: int = Field(5, env="HTTP_BREAKER_FAILURE_THRESHOLD")
+    http_breaker_reset_seconds: float = Field(30.0, env="HTTP_BREAKER_RESET_SECONDS")
+    # Request auth: verified Firebase tokens (until their exp) and current-user rows
+    auth_token_cache_max_entries: int = Field(10000, env="AUTH_TOKEN_CACHE_MAX_ENTRIES")
+    auth_token_cache_max_ttl_seconds: int = Field(3600, env="AUTH_TOKEN_CACHE_MAX_TTL_SECONDS")
+    auth_user_cache_max_entries: int = Field(10000, env="AUTH_USER_CACHE_MAX_ENTRIES")
+    auth_user_cache_ttl_seconds: int = Field(30, env="AUTH_USER_CACHE_TTL_SECONDS")
+    # Database connection pool (per worker)
+    db_pool_size: int = Field(10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, env="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(30.0, env="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(1800, env="DB_POOL_RECYCLE_SECONDS")
+    db_pool_pre_ping: bool = Field(False, env="DB_POOL_PRE_PING")
+    # asyncpg prepared statement cache; only honoured on direct Postgres connections
+    db_prepared_statements: bool = Field(False, env="DB_PREPARED_STATEMENTS")
+    db_statement_cache_size: int = Field(100, env="DB_STATEMENT_CACHE_SIZE")
+    # In-memory leaderboards: full reload interval (picks up other workers' writes)
+    leaderboard_resync_seconds: int = Field(300, env="LEADERBOARD_RESYNC_SECONDS")
+    # Daily XP buckets behind the week/month boards; older ones are compacted away
+    leaderboard_xp_bucket_retention_days: int = Field(62, env="LEADERBOARD_XP_BUCKET_RETENTION_DAYS")
+    # Daily rank snapshots (one partition per day) kept for rank_change
+    leaderboard_snapshot_retention_days: int = Field(30, env="LEADERBOARD_SNAPSHOT_RETENTION_DAYS")
+
     class Config:
         env_file = "../.env"
 
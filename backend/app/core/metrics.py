@@ -0,0 +1,53 @@
+"""
+Small in-process metrics shared by the outbound HTTP client and the
+database pool.
+
+LatencyHistogram counts samples into fixed millisecond buckets, so
+percentiles are approximate (the upper bound of the bucket) but recording
+is O(log buckets) with constant memory. A percentile in the overflow bucket
+is reported as the largest sample seen, so every value stays JSON-safe.
+"""
+
+import bisect
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_ms = 0.0
+        self.max_ms: Optional[float] = None
+        self.samples = 0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.total_ms += ms
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+        self.samples += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile
+        (largest sample seen when that is the overflow bucket)
+        """
+        if not self.samples:
+            return None
+        target = q * self.samples
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        labels = [f"le_{b}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.samples,
+            "avg_ms": self.total_ms / self.samples if self.samples else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
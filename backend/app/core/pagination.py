@@ -0,0 +1,53 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row of a page, e.g. (created_at, id)
+for posts, as url-safe base64 JSON. The next page is then a range condition
+on an index (`WHERE (created_at, id) < (:created_at, :id)`) instead of an
+OFFSET that reads and discards every earlier row, so page N costs the same
+as page 1.
+
+List endpoints return the next page's cursor in the `X-Next-Cursor` header
+(absent on the last page) and keep their body unchanged.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Every integer sort key (ids, xp, streak) is an INTEGER column
+_INT_MIN, _INT_MAX = -(2 ** 31), 2 ** 31 - 1
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """Sort key encoded in `cursor`, converted to `types`; 400 if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong arity")
+        values = tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+        if any(isinstance(v, int) and not _INT_MIN <= v <= _INT_MAX for v in values):
+            raise ValueError("integer out of range")
+        return values
+    except (ValueError, TypeError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
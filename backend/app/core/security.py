@@ -1,4 +1,5 @@
-from typing import Annotated, Dict
+from typing import Annotated, Dict, FrozenSet, Tuple
+import asyncio
 import logging
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -7,6 +8,7 @@ from sqlalchemy import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from models.user import Role, RoleType, User, UserRole
 from database.session import get_session
+from core.auth_cache import role_cache, token_cache, user_cache
 
 
 
@@ -15,22 +17,34 @@ from models.user import User
 logger = logging.getLogger(__name__)
 security = HTTPBearer(auto_error=True)
 
-def verify_id_token(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]):
+async def _verify_token(token: str) -> Dict:
+    """Verified claims of a Firebase ID token, checked once per token.
+
+    Signature verification (and the occasional public-key fetch) is blocking,
+    so it runs in a worker thread; the result is reused until the token expires.
+    """
+    decoded = token_cache.get(token)
+    if decoded is None:
+        decoded = await asyncio.to_thread(auth.verify_id_token, token)
+        token_cache.put(token, decoded)
+    return decoded
+
+async def verify_id_token(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]):
     token = credentials.credentials
     try:
-        decoded = auth.verify_id_token(token)
+        decoded = await _verify_token(token)
         return decoded
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-def decode_id_token(token: str):
+async def decode_id_token(token: str):
     try:
-        decoded = auth.verify_id_token(token)
+        decoded = await _verify_token(token)
         return decoded
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid Firebase token")
 
-def verify_firebase_token(
+async def verify_firebase_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict:
     if credentials is None:
@@ -46,7 +60,7 @@ def verify_firebase_token(
         )
     
     try:
-        decoded_token = auth.verify_id_token(credentials.credentials)
+        decoded_token = await _verify_token(credentials.credentials)
     except auth.ExpiredIdTokenError:
         raise HTTPException(status_code=401, detail="Token expired")
     except auth.InvalidIdTokenError:
@@ -60,35 +74,56 @@ def verify_firebase_token(
 
     return decoded_token
 
-async def get_current_user(
-    decoded_token: Dict = Depends(verify_firebase_token),
-    session: AsyncSession = Depends(get_session)
-):
+async def _load_user_and_roles(
+    firebase_uid: str, session: AsyncSession
+) -> Tuple[User | None, FrozenSet[RoleType]]:
+    """User row and its role types in one round-trip"""
     result = await session.exec(
-        select(User).where(User.firebase_uid == decoded_token["uid"])
+        select(User, Role.type)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .outerjoin(Role, Role.id == UserRole.role_id)
+        .where(User.firebase_uid == firebase_uid)
+        .execution_options(populate_existing=True)
     )
-    user = result.scalars().first()
+    rows = result.all()
+    if not rows:
+        return None, frozenset()
+    return rows[0][0], frozenset(role for _, role in rows if role is not None)
+
+async def get_current_user_and_roles(
+    decoded_token: Dict = Depends(verify_firebase_token),
+    session: AsyncSession = Depends(get_session)
+) -> Tuple[User, FrozenSet[RoleType]]:
+    user = await user_cache.get(decoded_token["uid"], session)
+    if user is not None:
+        roles = role_cache.get_roles(user.id)
+        if roles is not None:
+            return user, roles
+
+    user_generation, role_generation = user_cache.generation, role_cache.generation
+    user, roles = await _load_user_and_roles(decoded_token["uid"], session)
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="User not found"
         )
-    
-    return user
+
+    user_cache.put(user, generation=user_generation)
+    role_cache.put_roles(user.id, roles, generation=role_generation)
+    return user, roles
+
+async def get_current_user(
+    current: Tuple[User, FrozenSet[RoleType]] = Depends(get_current_user_and_roles)
+):
+    return current[0]
 
 def required_roles(*roles: RoleType):
     async def role_checker(
-        user: User = Depends(get_current_user),
-        session: AsyncSession = Depends(get_session)
+        current: Tuple[User, FrozenSet[RoleType]] = Depends(get_current_user_and_roles)
     ):
-        result = await session.exec(
-            select(Role).
-            join(UserRole, Role.id == UserRole.role_id).
-            where(UserRole.user_id == user.id)
-        )
-        user_roles = result.scalars().all()
-        if not any(r.type in roles for r in user_roles):
+        user, user_roles = current
+        if not any(r in roles for r in user_roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not allowed"
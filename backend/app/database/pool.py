@@ -0,0 +1,67 @@
+"""
+Connection pool instrumentation.
+
+InstrumentedPool times every checkout (including the wait for a free
+connection when the pool and its overflow are exhausted) so the pool can be
+sized from data: a growing checkout-wait p95 or any timeouts mean the pool is
+too small for the load, a peak in-use well below pool_size means it is too big.
+"""
+
+import time
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.metrics import LatencyHistogram
+
+# Up to past pool_timeout (DB_POOL_TIMEOUT_SECONDS, 30s by default): a
+# saturated pool is exactly when the wait distribution matters
+WAIT_BUCKETS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000, 30000, 60000]
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_wait = LatencyHistogram(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_in_use = 0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe((time.perf_counter() - started) * 1000)
+        self.metrics.checkouts += 1
+        self.metrics.peak_in_use = max(self.metrics.peak_in_use, self.checkedout())
+        return conn
+
+    def recreate(self):
+        # Keep the metrics across a pool reset (e.g. after a disconnect)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            # Connections open beyond pool_size (negative while the pool is filling up)
+            "overflow": self.overflow(),
+            "peak_in_use": self.metrics.peak_in_use,
+            "checkouts": self.metrics.checkouts,
+            "timeouts": self.metrics.timeouts,
+            "checkout_wait": self.metrics.checkout_wait.snapshot(),
+        }
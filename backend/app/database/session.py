@@ -1,13 +1,35 @@
 # app/db/session.py
 
-# from sqlmodel import SQLModel, Session, create_engine
-# from pydantic import BaseSettings
-from sqlmodel import SQLModel
+# from sqlmodel import SQLModel
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing import AsyncGenerator
+import logging
 from core.config import settings
+from database.pool import InstrumentedPool
+
+logger = logging.getLogger(__name__)
+
+
+def _behind_pgbouncer(url: str) -> bool:
+    """Supabase pooler / pgbouncer in transaction mode: prepared statements break there"""
+    parsed = make_url(url)
+    return parsed.port == 6543 or "pooler." in (parsed.host or "")
+
+
+def _connect_args() -> dict:
+    if settings.db_prepared_statements:
+        if not _behind_pgbouncer(settings.DATABASE_URL):
+            # asyncpg caches prepared statements per connection (its default)
+            return {"statement_cache_size": settings.db_statement_cache_size}
+        logger.warning("DB_PREPARED_STATEMENTS ignored: DATABASE_URL points at a transaction pooler")
+    # A prepared statement may land on another backend connection behind the pooler
+    return {"statement_cache_size": 0}
+
+
+_CONNECT_ARGS = _connect_args()
 
 # -----------------------------
 # Create Engine
@@ -15,12 +37,24 @@ from core.config import settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,            
-    pool_pre_ping=True,
-    connect_args={
-        "statement_cache_size": 0
-    }
+    poolclass=InstrumentedPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    # Off by default: recycling replaces old connections without a ping per checkout
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args=_CONNECT_ARGS,
 )
 
+
+def pool_stats() -> dict:
+    """Pool usage and checkout-wait histogram of this worker"""
+    return {
+        "prepared_statements": _CONNECT_ARGS["statement_cache_size"] > 0,
+        **engine.pool.stats(),
+    }
+
 # -----------------------------
 # Session Dependency for FastAPI
 # -----------------------------
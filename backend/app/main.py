@@ -2,6 +2,7 @@ import asyncio
 import uvicorn
 import logging
 from contextlib import asynccontextmanager
+from datetime import timezone
 from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -10,6 +11,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.firebase import init_firebase
 from core.config import settings
+from core.pagination import NEXT_CURSOR_HEADER
 from database.session import create_db_and_tables
 from database.session import async_session_maker
 
@@ -21,6 +23,11 @@ from api.learning import learning, vocab, flashcard, pronunciation, conversation
 
 from services.email_service import SMTPEmailConfig, SMTPEmailService
 from services.daily_study_reminder_job import DailyStudyReminderJob
+from services.dictionary_prefetch_job import DictionaryPrefetchJob
+from services.xp_rollup_job import XPRollupCompactionJob
+from services.leaderboard_snapshot_job import LeaderboardSnapshotJob
+from services.http_client import close_http_client, get_http_client
+from ml_models.model_registry import get_model_registry
 
 
 # from app.database import engine
@@ -35,46 +42,99 @@ def _maybe_start_scheduler() -> AsyncIOScheduler | None:
         return None
 
     tz = ZoneInfo(settings.app_timezone)
+    scheduler = AsyncIOScheduler(timezone=tz)
+
     if not settings.smtp_host or not settings.smtp_from_email:
         logger.warning(
             "SMTP not configured (SMTP_HOST/SMTP_FROM_EMAIL missing). Daily reminder job will not start."
         )
-        return None
-
-    email_service = SMTPEmailService(
-        SMTPEmailConfig(
-            host=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            from_email=settings.smtp_from_email,
-            use_tls=settings.smtp_use_tls,
+    else:
+        email_service = SMTPEmailService(
+            SMTPEmailConfig(
+                host=settings.smtp_host,
+                port=settings.smtp_port,
+                username=settings.smtp_username,
+                password=settings.smtp_password,
+                from_email=settings.smtp_from_email,
+                use_tls=settings.smtp_use_tls,
+            )
+        )
+        reminder_job = DailyStudyReminderJob(
+            session_factory=async_session_maker,
+            email_service=email_service,
+            app_timezone=tz,
+        )
+        scheduler.add_job(
+            reminder_job.enqueue,
+            CronTrigger(hour=20, minute=0, timezone=tz),
+            id="daily_study_reminder",
+            replace_existing=True,
         )
+        logger.info("Daily reminder scheduled at 20:00")
+
+    prefetch_job = DictionaryPrefetchJob(
+        session_factory=async_session_maker,
+        concurrency=settings.dictionary_prefetch_concurrency,
+        batch_size=settings.dictionary_prefetch_batch_size,
+    )
+    scheduler.add_job(
+        prefetch_job.run,
+        CronTrigger(hour=3, minute=0, timezone=tz),
+        id="dictionary_prefetch",
+        replace_existing=True,
     )
-    reminder_job = DailyStudyReminderJob(
+
+    xp_rollup_job = XPRollupCompactionJob(
         session_factory=async_session_maker,
-        email_service=email_service,
-        app_timezone=tz,
+        retention_days=settings.leaderboard_xp_bucket_retention_days,
+    )
+    # XP buckets are UTC days: run shortly after the UTC day closes
+    scheduler.add_job(
+        xp_rollup_job.run,
+        CronTrigger(hour=0, minute=30, timezone=timezone.utc),
+        id="xp_rollup_compaction",
+        replace_existing=True,
     )
 
-    scheduler = AsyncIOScheduler(timezone=tz)
+    snapshot_job = LeaderboardSnapshotJob(
+        session_factory=async_session_maker,
+        retention_days=settings.leaderboard_snapshot_retention_days,
+    )
+    # End-of-day ranks of the UTC day; tomorrow's rank_change compares against them
     scheduler.add_job(
-        reminder_job.enqueue,
-        CronTrigger(hour=20, minute=0, timezone=tz),
-        id="daily_study_reminder",
+        snapshot_job.run,
+        CronTrigger(hour=23, minute=55, timezone=timezone.utc),
+        id="leaderboard_snapshot",
         replace_existing=True,
     )
+
     scheduler.start()
-    logger.info("APScheduler started (timezone=%s), daily reminder at 20:00", settings.app_timezone)
+    logger.info(
+        "APScheduler started (timezone=%s), dictionary prefetch at 03:00, XP rollup at 00:30 UTC, "
+        "leaderboard snapshot at 23:55 UTC",
+        settings.app_timezone,
+    )
     return scheduler
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     scheduler = _maybe_start_scheduler()
+    # Shared outbound HTTP client (connection pool, circuit breakers)
+    get_http_client()
+    # Warm up shared models off the event loop so the first request doesn't pay for loading
+    await asyncio.to_thread(get_model_registry().preload, settings.preload_models.split(","))
+    pronunciation.engine.start()
+    # Network-bound, so it runs in the background instead of delaying startup
+    tts_warmup = asyncio.create_task(
+        asyncio.to_thread(conversation.tts_service.warm, conversation.CANNED_REPLIES)
+    )
     try:
         yield
     finally:
+        tts_warmup.cancel()
+        pronunciation.engine.shutdown()
+        await close_http_client()
         if scheduler is not None:
             scheduler.shutdown(wait=False)
 
@@ -93,6 +153,7 @@ app.add_middleware(
     allow_credentials=True,      # Allow cookies to be sent with requests
     allow_methods=["*"],         # Allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],         # Allow all headers (e.g., Content-Type, Authorization)
+    expose_headers=[NEXT_CURSOR_HEADER],  # Keyset pagination cursor of list endpoints
 )
 
 #---------------------------------- Routers -------------------------------------------------------
@@ -0,0 +1,184 @@
+"""
+Pluggable CPU inference backends for the Wav2Vec2 CTC forward pass.
+
+- torch:       fp32 PyTorch model from the registry (reference path)
+- torch_int8:  dynamic int8 quantization of the Linear layers
+- onnx:        exported graph executed by ONNX Runtime (optional dependency)
+
+All backends take the processor's `input_values` (and optional attention
+mask) and return CTC logits as a torch tensor, so decoding stays identical.
+"""
+
+import copy
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import torch
+
+from ml_models.model_registry import DEFAULT_MODEL_ID, get_model_registry
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TORCH = "torch"
+BACKEND_TORCH_INT8 = "torch_int8"
+BACKEND_ONNX = "onnx"
+SUPPORTED_BACKENDS = (BACKEND_TORCH, BACKEND_TORCH_INT8, BACKEND_ONNX)
+
+_DEFAULT_ONNX_DIR = Path(__file__).parent / "onnx"
+
+
+class InferenceBackend(ABC):
+    name: str = ""
+
+    @abstractmethod
+    def logits(
+        self, input_values: torch.Tensor, attention_mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        ...
+
+
+class TorchBackend(InferenceBackend):
+    name = BACKEND_TORCH
+
+    def __init__(self, model):
+        self.model = model
+
+    def logits(self, input_values, attention_mask=None):
+        with torch.no_grad():
+            if attention_mask is not None:
+                return self.model(input_values, attention_mask=attention_mask).logits
+            return self.model(input_values).logits
+
+
+class TorchInt8Backend(TorchBackend):
+    name = BACKEND_TORCH_INT8
+
+    def __init__(self, model):
+        # Quantize a copy: the fp32 model in the registry is shared with STT
+        quantized = torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        quantized.eval()
+        super().__init__(quantized)
+
+
+class OnnxBackend(InferenceBackend):
+    name = BACKEND_ONNX
+
+    def __init__(self, model, onnx_path: Path, use_attention_mask: bool):
+        try:
+            import onnxruntime as ort
+        except ImportError as exc:
+            raise RuntimeError(
+                "PRONUNCIATION_BACKEND=onnx requires the 'onnxruntime' package"
+            ) from exc
+
+        self.use_attention_mask = use_attention_mask
+        if not onnx_path.exists():
+            self._export(model, onnx_path, use_attention_mask)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    @staticmethod
+    def _export(model, onnx_path: Path, use_attention_mask: bool) -> None:
+        logger.info(f"🔄 Exporting ONNX graph: {onnx_path}")
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+
+        dummy = torch.zeros(1, 16000, dtype=torch.float32)
+        args: Tuple = (dummy,)
+        input_names = ["input_values"]
+        dynamic_axes = {
+            "input_values": {0: "batch", 1: "samples"},
+            "logits": {0: "batch", 1: "frames"},
+        }
+        if use_attention_mask:
+            args = (dummy, torch.ones(1, 16000, dtype=torch.long))
+            input_names.append("attention_mask")
+            dynamic_axes["attention_mask"] = {0: "batch", 1: "samples"}
+
+        # Export next to the target and rename, so a crash never leaves a
+        # half-written graph that later loads fail on.
+        tmp_path = onnx_path.with_suffix(".onnx.tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                args,
+                str(tmp_path),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+            )
+        os.replace(tmp_path, onnx_path)
+        logger.info(f"✅ ONNX graph exported: {onnx_path}")
+
+    def logits(self, input_values, attention_mask=None):
+        feeds = {"input_values": input_values.numpy().astype("float32", copy=False)}
+        if self.use_attention_mask:
+            if attention_mask is None:
+                attention_mask = torch.ones_like(input_values, dtype=torch.long)
+            feeds["attention_mask"] = attention_mask.numpy().astype("int64", copy=False)
+
+        (logits,) = self.session.run(["logits"], feeds)
+        return torch.from_numpy(logits)
+
+
+_backends: Dict[Tuple[str, str, Optional[str]], InferenceBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(
+    name: str = BACKEND_TORCH,
+    model_id: str = DEFAULT_MODEL_ID,
+    onnx_dir: Optional[str] = None,
+) -> InferenceBackend:
+    """Build (once per process) the requested backend for a checkpoint"""
+    if name not in SUPPORTED_BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend '{name}', expected one of {SUPPORTED_BACKENDS}"
+        )
+
+    # The exported graph lives in onnx_dir; the torch backends don't use it
+    key = (name, model_id, onnx_dir if name == BACKEND_ONNX else None)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is not None:
+            return backend
+
+        loaded = get_model_registry().get(model_id)
+        if name == BACKEND_TORCH:
+            backend = TorchBackend(loaded.model)
+        elif name == BACKEND_TORCH_INT8:
+            backend = TorchInt8Backend(loaded.model)
+        else:
+            directory = Path(onnx_dir) if onnx_dir else _DEFAULT_ONNX_DIR
+            use_mask = bool(
+                getattr(loaded.processor.feature_extractor, "return_attention_mask", False)
+            )
+            backend = OnnxBackend(
+                loaded.model,
+                directory / f"{model_id.replace('/', '__')}.onnx",
+                use_attention_mask=use_mask,
+            )
+
+        _backends[key] = backend
+        logger.info(f"✅ Inference backend ready: {name} ({model_id})")
+        return backend
+
+
+def evict_backends(model_id: str) -> int:
+    """Drop cached backends built from a checkpoint (rebuilt on next use)"""
+    with _backends_lock:
+        # key: (backend name, model_id, onnx_dir)
+        keys = [key for key in _backends if key[1] == model_id]
+        for key in keys:
+            del _backends[key]
+    return len(keys)
@@ -0,0 +1,251 @@
+"""
+Micro-batching inference engine for Wav2VecScorer.
+
+Requests are queued from the API event loop, grouped into small batches by
+dedicated worker threads and resolved back on the caller's loop, so a long
+CTC forward pass never blocks other requests.
+
+A queue batch is not always one model batch: checkpoints without an
+attention mask (the default wav2vec2-base) only share a forward pass
+between clips of the same length, so there real recordings mostly run one
+pass each. The metrics count both (`avg_batch_size` per queue batch,
+`avg_clips_per_forward_pass` per model call).
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _ScoreRequest:
+    audio: np.ndarray
+    reference_text: str
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EngineMetrics:
+    """Thread-safe counters for throughput, batch size and queue wait"""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._queue_waits: Deque[float] = deque(maxlen=window)
+        self._batch_sizes: Deque[int] = deque(maxlen=window)
+        self._completed_at: Deque[float] = deque(maxlen=window)
+        self.requests_total = 0
+        self.batches_total = 0
+        self.forward_passes_total = 0
+        self.errors_total = 0
+        self.inference_seconds_total = 0.0
+
+    def record_batch(
+        self,
+        size: int,
+        queue_waits: List[float],
+        inference_seconds: float,
+        failed: bool,
+        forward_passes: int = 1,
+    ) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.requests_total += size
+            self.batches_total += 1
+            self.forward_passes_total += forward_passes
+            self.inference_seconds_total += inference_seconds
+            if failed:
+                self.errors_total += size
+            self._batch_sizes.append(size)
+            self._queue_waits.extend(queue_waits)
+            self._completed_at.extend([now] * size)
+
+    def snapshot(self, queue_depth: int) -> Dict:
+        now = time.perf_counter()
+        with self._lock:
+            waits_ms = sorted(w * 1000 for w in self._queue_waits)
+            batch_sizes = list(self._batch_sizes)
+            recent = [t for t in self._completed_at if now - t <= 60.0]
+            uptime = max(now - self._started_at, 1e-9)
+
+            return {
+                "requests_total": self.requests_total,
+                "batches_total": self.batches_total,
+                "errors_total": self.errors_total,
+                "queue_depth": queue_depth,
+                "throughput_rps": self.requests_total / uptime,
+                "throughput_rps_1m": len(recent) / min(uptime, 60.0),
+                "avg_batch_size": float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+                "max_batch_size": max(batch_sizes) if batch_sizes else 0,
+                "forward_passes_total": self.forward_passes_total,
+                "avg_clips_per_forward_pass": (
+                    self.requests_total / self.forward_passes_total
+                    if self.forward_passes_total
+                    else 0.0
+                ),
+                "queue_wait_ms": {
+                    "avg": float(np.mean(waits_ms)) if waits_ms else 0.0,
+                    "p50": _percentile(waits_ms, 0.50),
+                    "p95": _percentile(waits_ms, 0.95),
+                    "max": waits_ms[-1] if waits_ms else 0.0,
+                },
+                "avg_inference_ms_per_batch": (
+                    self.inference_seconds_total * 1000 / self.batches_total
+                    if self.batches_total
+                    else 0.0
+                ),
+            }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return float(sorted_values[idx])
+
+
+class InferenceEngine:
+    """
+    Queue + dynamic micro-batching around a scorer exposing
+    `score_pronunciation_batch(audios, reference_texts)`.
+
+    Each worker thread blocks for the first request, then keeps collecting
+    until the batch is full or `max_wait_ms` has elapsed, and hands the whole
+    batch to the scorer, which decides which clips can share a forward pass.
+    """
+
+    def __init__(
+        self,
+        scorer,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        num_workers: int = 1,
+    ):
+        self.scorer = scorer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.num_workers = max(1, num_workers)
+        self.metrics = EngineMetrics()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"wav2vec-inference-{i}",
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+            logger.info(
+                "Inference engine started (workers=%s, max_batch=%s, max_wait=%.1fms)",
+                self.num_workers,
+                self.max_batch_size,
+                self.max_wait * 1000,
+            )
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(_STOP)
+        for worker in workers:
+            worker.join(timeout=timeout)
+
+    # --- Submit ---
+    def submit(self, audio: np.ndarray, reference_text: str) -> Future:
+        self.start()
+        future: Future = Future()
+        self._queue.put(_ScoreRequest(audio=audio, reference_text=reference_text, future=future))
+        return future
+
+    async def score(self, audio: np.ndarray, reference_text: str) -> Dict:
+        """Await a score without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(audio, reference_text))
+
+    def stats(self) -> Dict:
+        data = self.metrics.snapshot(queue_depth=self._queue.qsize())
+        data.update(
+            {
+                "workers": len(self._workers),
+                "config_max_batch_size": self.max_batch_size,
+                "config_max_wait_ms": self.max_wait * 1000,
+            }
+        )
+        return data
+
+    # --- Worker ---
+    def _worker_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch, stop_after = self._collect_batch(first)
+            self._run_batch(batch)
+            if stop_after:
+                return
+
+    def _collect_batch(self, first: _ScoreRequest):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_batch(self, batch: List[_ScoreRequest]) -> None:
+        started = time.perf_counter()
+        # Requests cancelled while waiting (client went away) are skipped
+        live = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        queue_waits = [started - r.enqueued_at for r in live]
+        audios = [r.audio for r in live]
+        forward_pass_groups = getattr(self.scorer, "forward_pass_groups", None)
+        forward_passes = len(forward_pass_groups(audios)) if forward_pass_groups else 1
+        failed = False
+        try:
+            results = self.scorer.score_pronunciation_batch(
+                audios, [r.reference_text for r in live]
+            )
+        except Exception as exc:
+            failed = True
+            logger.exception("Batched inference failed (batch_size=%s)", len(live))
+            for r in live:
+                r.future.set_exception(exc)
+        else:
+            for r, result in zip(live, results):
+                r.future.set_result(result)
+        finally:
+            self.metrics.record_batch(
+                len(live), queue_waits, time.perf_counter() - started, failed, forward_passes
+            )
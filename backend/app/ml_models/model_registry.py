@@ -0,0 +1,141 @@
+"""
+Process-wide registry of Wav2Vec2 checkpoints.
+
+Every service that needs a processor/model pair asks the registry instead of
+calling `from_pretrained` itself, so each checkpoint is loaded once per
+process and shared (e.g. by Wav2VecScorer and STTService).
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = "facebook/wav2vec2-base-960h"
+
+
+@dataclass
+class LoadedModel:
+    model_id: str
+    processor: object
+    model: object
+    loaded_at: float = field(default_factory=time.time)
+    load_seconds: float = 0.0
+    last_used_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+def _module_nbytes(model) -> int:
+    """Bytes held by parameters and buffers of a torch module"""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """Thread-safe, load-once cache of (processor, model) pairs"""
+
+    def __init__(self):
+        self._models: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, model_id: str = DEFAULT_MODEL_ID) -> LoadedModel:
+        entry = self._models.get(model_id)
+        if entry is None:
+            entry = self._load(model_id)
+        entry.hits += 1
+        entry.last_used_at = time.time()
+        return entry
+
+    def preload(self, model_ids: Iterable[str]) -> List[str]:
+        loaded = []
+        for model_id in model_ids:
+            model_id = model_id.strip()
+            if not model_id:
+                continue
+            self._load(model_id)
+            loaded.append(model_id)
+        return loaded
+
+    def evict(self, model_id: str) -> bool:
+        """Drop the registry's reference; memory is freed once no caller holds it"""
+        with self._lock:
+            entry = self._models.pop(model_id, None)
+        if entry is None:
+            return False
+
+        logger.info(f"🗑️ Evicted model: {model_id}")
+        return True
+
+    def is_loaded(self, model_id: str) -> bool:
+        return model_id in self._models
+
+    def memory_report(self) -> List[Dict]:
+        with self._lock:
+            entries = list(self._models.values())
+
+        report = []
+        for e in entries:
+            nbytes = _module_nbytes(e.model)
+            report.append(
+                {
+                    "model_id": e.model_id,
+                    "bytes": nbytes,
+                    "mb": round(nbytes / (1024 * 1024), 1),
+                    "loaded_at": e.loaded_at,
+                    "load_seconds": round(e.load_seconds, 2),
+                    "last_used_at": e.last_used_at,
+                    "hits": e.hits,
+                }
+            )
+        return report
+
+    def _load(self, model_id: str) -> LoadedModel:
+        with self._lock:
+            entry = self._models.get(model_id)
+            if entry is not None:
+                return entry
+            load_lock = self._load_locks.setdefault(model_id, threading.Lock())
+
+        # Per-model lock: concurrent callers wait for one load instead of
+        # each pulling the checkpoint.
+        with load_lock:
+            entry = self._models.get(model_id)
+            if entry is not None:
+                return entry
+
+            from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
+
+            logger.info(f"🔄 Loading Wav2Vec2: {model_id}")
+            started = time.perf_counter()
+            processor = Wav2Vec2Processor.from_pretrained(model_id)
+            model = Wav2Vec2ForCTC.from_pretrained(model_id)
+            model.eval()
+
+            entry = LoadedModel(
+                model_id=model_id,
+                processor=processor,
+                model=model,
+                load_seconds=time.perf_counter() - started,
+            )
+            with self._lock:
+                self._models[model_id] = entry
+
+            logger.info(f"✅ Wav2Vec2 loaded: {model_id} ({entry.load_seconds:.1f}s)")
+            return entry
+
+
+# Singleton instance
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
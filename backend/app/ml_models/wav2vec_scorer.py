@@ -1,4 +1,3 @@
-from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
 import torch
 import numpy as np
 from scipy.special import log_softmax
@@ -7,6 +6,9 @@ import logging
 import re
 from difflib import SequenceMatcher
 
+from ml_models.backends import BACKEND_TORCH, get_backend
+from ml_models.model_registry import DEFAULT_MODEL_ID, get_model_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,27 +162,52 @@ def calculate_text_match_score(predicted: str, reference: str) -> Dict:
 
 
 class Wav2VecScorer:
-    """Singleton - Load model một lần"""
-
-    _instance: Optional["Wav2VecScorer"] = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self, model_id: str = "facebook/wav2vec2-base-960h"):
+    """One instance per (model_id, backend, onnx_dir) - Load model một lần"""
+
+    _instances: Dict[tuple, "Wav2VecScorer"] = {}
+
+    def __new__(
+        cls,
+        model_id: str = DEFAULT_MODEL_ID,
+        backend: str = BACKEND_TORCH,
+        onnx_dir: Optional[str] = None,
+    ):
+        key = (model_id, backend, onnx_dir)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls._instances[key] = super().__new__(cls)
+        return instance
+
+    def __init__(
+        self,
+        model_id: str = DEFAULT_MODEL_ID,
+        backend: str = BACKEND_TORCH,
+        onnx_dir: Optional[str] = None,
+    ):
         if hasattr(self, "initialized"):
             return
 
-        logger.info(f"🔄 Loading Wav2Vec2: {model_id}")
-
-        self.processor = Wav2Vec2Processor.from_pretrained(model_id)
-        self.model = Wav2Vec2ForCTC.from_pretrained(model_id)
-        self.model.eval()
+        # Weights live in the shared registry (also used by STTService)
+        self.model_id = model_id
+        self.backend_name = backend
+        self.onnx_dir = onnx_dir
+        self._registry = get_model_registry()
+        self._registry.get(model_id)
+        get_backend(backend, model_id, onnx_dir)
 
         self.initialized = True
-        logger.info("✅ Wav2Vec2 loaded")
+
+    @property
+    def processor(self):
+        return self._registry.get(self.model_id).processor
+
+    @property
+    def model(self):
+        return self._registry.get(self.model_id).model
+
+    @property
+    def backend(self):
+        return get_backend(self.backend_name, self.model_id, self.onnx_dir)
 
     def score_pronunciation(
         self, audio: np.ndarray, reference_text: str, sample_rate: int = 16000
@@ -205,18 +232,92 @@ class Wav2VecScorer:
             }
         """
 
-        # Preprocess audio
-        inputs = self.processor(
-            audio, sampling_rate=sample_rate, return_tensors="pt", padding=True
+        predicted_text = self.transcribe_batch([audio], sample_rate)[0]
+        return self.score_transcript(predicted_text, reference_text)
+
+    def score_pronunciation_batch(
+        self,
+        audios: List[np.ndarray],
+        reference_texts: List[str],
+        sample_rate: int = 16000,
+    ) -> List[Dict]:
+        """Score several recordings, batching forward passes where safe (see `transcribe_batch`)."""
+        predicted_texts = self.transcribe_batch(audios, sample_rate)
+        return [
+            self.score_transcript(predicted_text, reference_text)
+            for predicted_text, reference_text in zip(predicted_texts, reference_texts)
+        ]
+
+    def transcribe_batch(
+        self, audios: List[np.ndarray], sample_rate: int = 16000
+    ) -> List[str]:
+        """
+        Greedy CTC transcription for a batch of clips.
+
+        A clip's transcript must not depend on the other clips of its batch.
+        With an attention mask, clips are zero-padded to the longest one and
+        logits past each clip's own length are dropped before decoding.
+        Checkpoints without one (wav2vec2-base: group norm, no mask) would
+        see the padding in their normalization and self-attention, so there
+        only clips of the same length share a forward pass.
+        """
+        groups = self.forward_pass_groups(audios)
+        use_attention_mask = self._uses_attention_mask()
+
+        texts: List[str] = [""] * len(audios)
+        for indices in groups:
+            group = self._transcribe_padded(
+                [audios[i] for i in indices], sample_rate, use_attention_mask=use_attention_mask
+            )
+            for i, text in zip(indices, group):
+                texts[i] = text
+        return texts
+
+    def forward_pass_groups(self, audios: List[np.ndarray]) -> List[List[int]]:
+        """Indices of the clips that share each forward pass of `transcribe_batch`"""
+        if self._uses_attention_mask():
+            return [list(range(len(audios)))] if audios else []
+
+        by_length: Dict[int, List[int]] = {}
+        for i, audio in enumerate(audios):
+            by_length.setdefault(len(audio), []).append(i)
+        return list(by_length.values())
+
+    def _uses_attention_mask(self) -> bool:
+        processor = self._registry.get(self.model_id).processor
+        return bool(getattr(processor.feature_extractor, "return_attention_mask", False))
+
+    def _transcribe_padded(
+        self, audios: List[np.ndarray], sample_rate: int, use_attention_mask: bool
+    ) -> List[str]:
+        loaded = self._registry.get(self.model_id)
+        processor, model = loaded.processor, loaded.model
+
+        inputs = processor(
+            audios,
+            sampling_rate=sample_rate,
+            return_tensors="pt",
+            padding=True,
+            return_attention_mask=use_attention_mask,
         )
 
-        # Get predictions
-        with torch.no_grad():
-            logits = self.model(inputs.input_values).logits
+        logits = self.backend.logits(
+            inputs.input_values,
+            inputs.attention_mask if use_attention_mask else None,
+        )
 
+        frame_lengths = model._get_feat_extract_output_lengths(
+            torch.tensor([len(a) for a in audios])
+        ).tolist()
         predicted_ids = torch.argmax(logits, dim=-1)
-        predicted_text = self.processor.batch_decode(predicted_ids)[0]
 
+        return [
+            processor.decode(ids[: int(n_frames)])
+            for ids, n_frames in zip(predicted_ids, frame_lengths)
+        ]
+
+    def score_transcript(self, predicted_text: str, reference_text: str) -> Dict:
+        """Turn a transcript into the score payload returned to callers"""
         logger.info(f"Predicted text: '{predicted_text}'")
         logger.info(f"Reference text: '{reference_text}'")
 
@@ -1 +1 @@
-from . import user, lesson, vocab, friend, post, progress, report, daily_mission, leaderboard_snapshot
+from . import user, lesson, vocab, friend, post, progress, report, daily_mission, leaderboard_snapshot, conversation
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+def utc_now() -> datetime:
+    """Return current UTC time as timezone-aware datetime."""
+    return datetime.now(timezone.utc)
+
+
+class ConversationSession(SQLModel, table=True):
+    """Chatbot history of one conversation, persisted when CONVERSATION_STORE=database"""
+
+    __tablename__ = "conversation_sessions"
+    __table_args__ = (
+        UniqueConstraint("user_uid", "session_id", name="uix_conversation_user_session"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Firebase uid: the chat routes authenticate by token only, without a users lookup
+    user_uid: str = Field(max_length=128, index=True)
+    session_id: str = Field(max_length=64)
+    history: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")),
+    )
+    # Rolling summary of turns that left the recent window (see services/prompt_builder.py)
+    summary: str = Field(default="", sa_column=Column(Text, nullable=False, server_default=""))
+    summarized_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    message_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    updated_at: datetime = Field(
+        default_factory=utc_now,
+        sa_column=Column(DateTime(timezone=True), server_default=text("now()"), index=True),
+    )
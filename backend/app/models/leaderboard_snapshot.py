@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from datetime import date
 from enum import Enum
-from typing import Optional
 
-from sqlalchemy import Column, Date, Enum as SAEnum, Index
+from sqlalchemy import Column, Date, Enum as SAEnum
 from sqlmodel import Field, SQLModel
 
 
@@ -14,30 +13,28 @@ class LeaderboardType(str, Enum):
 
 
 class LeaderboardSnapshot(SQLModel, table=True):
+    """Daily rank per user and board.
+
+    Range-partitioned by snapshot_date, one partition per day
+    (leaderboard_snapshots_YYYYMMDD), so a day is rewritten with TRUNCATE and
+    expired days are dropped whole; see LeaderboardRepository.
+    """
     __tablename__ = "leaderboard_snapshots"
-    __table_args__ = (
-        Index(
-            "ix_leaderboard_snapshots_user_type_date",
-            "user_id",
-            "type",
-            "snapshot_date",
-        ),
-    )
+    __table_args__ = {"postgresql_partition_by": "RANGE (snapshot_date)"}
 
-    id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
-    type: LeaderboardType = Field(
+    snapshot_date: date = Field(
         sa_column=Column(
-            SAEnum(LeaderboardType, name="leaderboard_type_enum"),
+            Date, 
+            primary_key=True,
             nullable=False,
-            index=True,
         ),
     )
-    rank: int = Field(nullable=False)
-    snapshot_date: date = Field(
+    type: LeaderboardType = Field(
         sa_column=Column(
-            Date, 
+            SAEnum(LeaderboardType, name="leaderboard_type_enum"),
+            primary_key=True,
             nullable=False,
-            index=True,
         ),
     )
+    user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", primary_key=True)
+    rank: int = Field(nullable=False)
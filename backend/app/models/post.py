@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field
-from sqlalchemy import UniqueConstraint, Column, Enum as SAEnum, DateTime, text
+from sqlalchemy import Index, UniqueConstraint, Column, Enum as SAEnum, DateTime, text
 from sqlalchemy.dialects.postgresql import JSONB
 from enum import Enum
 
@@ -22,6 +22,10 @@ class PostStatus(str, Enum):
 
 class Post(SQLModel, table=True):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Keyset pagination of the feed / admin list: ORDER BY created_at DESC, id DESC
+        Index("ix_posts_created_at_id", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
@@ -44,6 +48,10 @@ class Post(SQLModel, table=True):
 
 class PostComment(SQLModel, table=True):
     __tablename__ = "post_comments"
+    __table_args__ = (
+        # Keyset pagination of a post's comments: ORDER BY created_at, id
+        Index("ix_post_comments_post_created_at_id", "post_id", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     post_id: int = Field(foreign_key="posts.id", ondelete="CASCADE", index=True)
@@ -94,6 +94,17 @@ class UserXPLog(SQLModel, table=True):
     )
 
 
+class UserXPDaily(SQLModel, table=True):
+    """XP earned per user per UTC day, rolled up from user_xp_log (period leaderboards)"""
+    __tablename__ = "user_xp_daily"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uix_user_xp_daily_user_day"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
+    day: date = Field(sa_column=Column(Date, nullable=False, index=True))
+    xp: int = Field(default=0)
+
+
 class Sex(str, Enum):
     MALE = "MALE"
     FEMALE = "FEMALE"
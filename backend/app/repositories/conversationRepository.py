@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.conversation import ConversationSession, utc_now
+
+
+class ConversationRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, user_uid: str, session_id: str) -> Optional[ConversationSession]:
+        result = await self.session.exec(
+            select(ConversationSession)
+            .where(ConversationSession.user_uid == user_uid)
+            .where(ConversationSession.session_id == session_id)
+        )
+        return result.first()
+
+    async def save_history(
+        self, user_uid: str, session_id: str, history: List[Dict[str, Any]], message_count: int
+    ) -> None:
+        # Single round trip upsert; the row is overwritten with the bounded history
+        stmt = insert(ConversationSession).values(
+            user_uid=user_uid,
+            session_id=session_id,
+            history=history,
+            message_count=message_count,
+            updated_at=utc_now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uix_conversation_user_session",
+            set_={
+                "history": stmt.excluded.history,
+                "message_count": stmt.excluded.message_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.exec(stmt)
+        await self.session.commit()
+
+    async def save_summary(self, user_uid: str, session_id: str, summary: str, summarized_count: int) -> None:
+        await self.session.exec(
+            update(ConversationSession)
+            .where(ConversationSession.user_uid == user_uid)
+            .where(ConversationSession.session_id == session_id)
+            # A slower, older refresh must not replace a newer summary
+            .where(ConversationSession.summarized_count < summarized_count)
+            .values(summary=summary, summarized_count=summarized_count)
+        )
+        await self.session.commit()
+
+    async def delete(self, user_uid: str, session_id: str) -> None:
+        await self.session.exec(
+            delete(ConversationSession)
+            .where(ConversationSession.user_uid == user_uid)
+            .where(ConversationSession.session_id == session_id)
+        )
+        await self.session.commit()
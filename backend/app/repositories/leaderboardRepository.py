@@ -3,14 +3,21 @@ from __future__ import annotations
 from datetime import date, datetime, timedelta, timezone
 from enum import Enum
 
-from sqlalchemy import and_, exists, func
-from sqlalchemy.orm import aliased
-from sqlalchemy.sql import Select
+from sqlalchemy import Date, and_, cast, delete, exists, func, insert, literal, or_, text
+from sqlalchemy.sql import Select, Subquery
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from models.leaderboard_snapshot import LeaderboardSnapshot, LeaderboardType
-from models.user import Role, RoleType, User, UserInfo, UserPoints, UserRole
+from models.user import Role, RoleType, User, UserInfo, UserPoints, UserRole, UserXPDaily, UserXPLog
+from services.leaderboard_engine import BoardEntry, get_leaderboard_engine
+
+
+SNAPSHOT_PARTITION_PREFIX = "leaderboard_snapshots_"
+
+
+def snapshot_partition_name(snapshot_date: date) -> str:
+    return f"{SNAPSHOT_PARTITION_PREFIX}{snapshot_date:%Y%m%d}"
 
 
 class LeaderboardPeriod(str, Enum):
@@ -19,38 +26,67 @@ class LeaderboardPeriod(str, Enum):
     month = "month"
 
 
+def period_start(period: LeaderboardPeriod, today: date | None = None) -> date | None:
+    """First UTC day of the current week (Monday) or month; None for all-time"""
+    today = today or datetime.now(timezone.utc).date()
+    if period == LeaderboardPeriod.week:
+        return today - timedelta(days=today.weekday())
+    if period == LeaderboardPeriod.month:
+        return today.replace(day=1)
+    return None
+
+
 class LeaderboardRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def _is_period_board(lb_type: LeaderboardType, period: LeaderboardPeriod) -> bool:
+        # Streaks are not per period: week/month streak boards are the all-time one
+        return lb_type == LeaderboardType.xp and period != LeaderboardPeriod.all
+
+    def _period_xp(self, period: LeaderboardPeriod) -> Subquery:
+        """XP per user since the period start, summed from the daily buckets"""
+        return (
+            select(UserXPDaily.user_id, func.sum(UserXPDaily.xp).label("xp"))
+            .where(UserXPDaily.day >= period_start(period))
+            .group_by(UserXPDaily.user_id)
+            .subquery("period_xp")
+        )
+
     def _apply_period_filter(
         self,
         stmt: Select,
-        period: LeaderboardPeriod,
-        lb_type: LeaderboardType,
+        period_xp: Subquery,
     ) -> Select:
-        if period == LeaderboardPeriod.all:
-            return stmt
-        return stmt
-
-    def _ranked_subquery(self, lb_type: LeaderboardType, period: LeaderboardPeriod):
-        if lb_type == LeaderboardType.xp:
-            sort_value = func.coalesce(UserPoints.xp, 0)
-        else:
-            sort_value = func.coalesce(UserPoints.streak, 0)
+        # Only learners who earned XP in the period are on its board
+        return stmt.join(period_xp, period_xp.c.user_id == User.id)
 
-        has_learner_role = exists(
+    @staticmethod
+    def _has_learner_role():
+        return exists(
             select(UserRole.user_id)
             .select_from(UserRole)
             .join(Role, Role.id == UserRole.role_id)
             .where(and_(UserRole.user_id == User.id, Role.type == RoleType.LEARNER))
         )
 
+    def _ranked_subquery(self, lb_type: LeaderboardType, period: LeaderboardPeriod):
+        period_xp = self._period_xp(period) if self._is_period_board(lb_type, period) else None
+        xp_value = period_xp.c.xp if period_xp is not None else func.coalesce(UserPoints.xp, 0)
+
+        if lb_type == LeaderboardType.xp:
+            sort_value = xp_value
+        else:
+            sort_value = func.coalesce(UserPoints.streak, 0)
+
+        has_learner_role = self._has_learner_role()
+
         base_stmt = (
             select(
                 User.id.label("user_id"),
                 UserInfo.username.label("username"),
-                func.coalesce(UserPoints.xp, 0).label("xp"),
+                xp_value.label("xp"),
                 func.coalesce(UserPoints.streak, 0).label("streak"),
                 func.rank().over(order_by=(sort_value.desc(), User.id.asc())).label("rank"),
             )
@@ -61,7 +97,8 @@ class LeaderboardRepository:
             .where(has_learner_role)
         )
 
-        base_stmt = self._apply_period_filter(base_stmt, period, lb_type)
+        if period_xp is not None:
+            base_stmt = self._apply_period_filter(base_stmt, period_xp)
         return base_stmt.subquery("current_lb")
 
     async def get_leaderboard(
@@ -72,14 +109,41 @@ class LeaderboardRepository:
         limit: int = 50,
         offset: int = 0,
         snapshot_date: date | None = None,
+        after: tuple[int, int] | None = None,
     ) -> list[dict]:
-        current_lb = self._ranked_subquery(lb_type, period)
+        """One page of a board.
 
+        `after` is the (score, user_id) of the last entry of the previous page
+        (keyset pagination); when given, `offset` is ignored.
+        """
         snap_date = snapshot_date
         if snap_date is None:
             snap_date = datetime.now(timezone.utc).date() - timedelta(days=1)
 
-        snap = aliased(LeaderboardSnapshot)
+        if not self._is_period_board(lb_type, period):
+            engine = await self._board_engine()
+            if after is not None:
+                page = engine.page_after(lb_type, after[0], after[1], limit)
+            else:
+                page = engine.page(lb_type, offset, limit)
+            previous = await self._snapshot_ranks(lb_type, snap_date, [e.user_id for _, e in page])
+            return [
+                {
+                    "rank": rank,
+                    "user_id": entry.user_id,
+                    "username": entry.username,
+                    "xp": entry.xp,
+                    "streak": entry.streak,
+                    "rank_change": (
+                        previous[entry.user_id] - rank if entry.user_id in previous else None
+                    ),
+                }
+                for rank, entry in page
+            ]
+
+        # Week / month: ranked from the daily XP buckets. Snapshots hold
+        # all-time ranks, so there is no rank_change to report here.
+        current_lb = self._ranked_subquery(lb_type, period)
         stmt = (
             select(
                 current_lb.c.rank,
@@ -87,21 +151,21 @@ class LeaderboardRepository:
                 current_lb.c.username,
                 current_lb.c.xp,
                 current_lb.c.streak,
-                (snap.rank - current_lb.c.rank).label("rank_change"),
             )
             .select_from(current_lb)
-            .outerjoin(
-                snap,
-                and_(
-                    snap.user_id == current_lb.c.user_id,
-                    snap.type == lb_type,
-                    snap.snapshot_date == snap_date,
-                ),
-            )
             .order_by(current_lb.c.rank.asc(), current_lb.c.user_id.asc())
-            .offset(offset)
             .limit(limit)
         )
+        if after is not None:
+            score, user_id = after
+            stmt = stmt.where(
+                or_(
+                    current_lb.c.xp < score,
+                    and_(current_lb.c.xp == score, current_lb.c.user_id > user_id),
+                )
+            )
+        else:
+            stmt = stmt.offset(offset)
 
         result = await self.session.exec(stmt)
         rows = result.all()
@@ -115,22 +179,11 @@ class LeaderboardRepository:
                     "username": row.username,
                     "xp": int(row.xp or 0),
                     "streak": int(row.streak or 0),
-                    "rank_change": (int(row.rank_change) if row.rank_change is not None else None),
+                    "rank_change": None,
                 }
             )
         return items
 
-    async def compute_full_rankings(
-        self,
-        *,
-        lb_type: LeaderboardType,
-        period: LeaderboardPeriod = LeaderboardPeriod.all,
-    ) -> list[tuple[int, int]]:
-        current_lb = self._ranked_subquery(lb_type, period)
-        stmt = select(current_lb.c.user_id, current_lb.c.rank).select_from(current_lb)
-        result = await self.session.exec(stmt)
-        return [(int(r.user_id), int(r.rank)) for r in result.all()]
-
     async def get_user_rank(
         self,
         *,
@@ -138,6 +191,13 @@ class LeaderboardRepository:
         lb_type: LeaderboardType,
         period: LeaderboardPeriod,
     ) -> dict | None:
+        if not self._is_period_board(lb_type, period):
+            found = (await self._board_engine()).rank_of(user_id, lb_type)
+            if found is None:
+                return None
+            rank, entry = found
+            return {"user_id": entry.user_id, "rank": rank, "xp": entry.xp, "streak": entry.streak}
+
         current_lb = self._ranked_subquery(lb_type, period)
         stmt = (
             select(
@@ -161,3 +221,116 @@ class LeaderboardRepository:
             "xp": int(row.xp or 0),
             "streak": int(row.streak or 0),
         }
+
+    async def load_board_entries(self) -> list[BoardEntry]:
+        """Every non-banned learner with xp, streak and username (unranked)"""
+        stmt = (
+            select(
+                User.id,
+                UserInfo.username,
+                func.coalesce(UserPoints.xp, 0),
+                func.coalesce(UserPoints.streak, 0),
+            )
+            .select_from(User)
+            .outerjoin(UserPoints, UserPoints.user_id == User.id)
+            .outerjoin(UserInfo, UserInfo.user_id == User.id)
+            .where(User.is_banned == False)
+            .where(self._has_learner_role())
+        )
+        result = await self.session.exec(stmt)
+        return [
+            BoardEntry(user_id=int(user_id), username=username, xp=int(xp), streak=int(streak))
+            for user_id, username, xp, streak in result.all()
+        ]
+
+    async def _board_engine(self):
+        engine = get_leaderboard_engine()
+        await engine.ensure_loaded(self.load_board_entries)
+        return engine
+
+    async def _snapshot_ranks(
+        self,
+        lb_type: LeaderboardType,
+        snapshot_date: date,
+        user_ids: list[int],
+    ) -> dict[int, int]:
+        if not user_ids:
+            return {}
+        stmt = select(LeaderboardSnapshot.user_id, LeaderboardSnapshot.rank).where(
+            (LeaderboardSnapshot.type == lb_type)
+            & (LeaderboardSnapshot.snapshot_date == snapshot_date)
+            & (LeaderboardSnapshot.user_id.in_(user_ids))
+        )
+        result = await self.session.exec(stmt)
+        return {int(user_id): int(rank) for user_id, rank in result.all()}
+
+    async def rebuild_xp_buckets(self, since: date, until: date) -> None:
+        """Recompute daily XP buckets for [since, until) from user_xp_log.
+
+        Only for closed days: today's bucket is still being incremented.
+        """
+        await self.session.exec(
+            delete(UserXPDaily).where((UserXPDaily.day >= since) & (UserXPDaily.day < until))
+        )
+        day = cast(func.timezone("UTC", UserXPLog.created_at), Date)
+        per_day = (
+            select(UserXPLog.user_id, day, func.sum(UserXPLog.xp_amount))
+            .where(UserXPLog.created_at >= datetime.combine(since, datetime.min.time(), timezone.utc))
+            .where(UserXPLog.created_at < datetime.combine(until, datetime.min.time(), timezone.utc))
+            .group_by(UserXPLog.user_id, day)
+        )
+        await self.session.exec(insert(UserXPDaily).from_select(["user_id", "day", "xp"], per_day))
+
+    async def prune_xp_buckets(self, before: date) -> int:
+        result = await self.session.exec(delete(UserXPDaily).where(UserXPDaily.day < before))
+        return result.rowcount or 0
+
+    async def prepare_snapshot_partition(self, snapshot_date: date) -> None:
+        """Create the day's snapshot partition, or empty it when re-running a day"""
+        name = snapshot_partition_name(snapshot_date)
+        await self.session.exec(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF leaderboard_snapshots "
+                f"FOR VALUES FROM ('{snapshot_date.isoformat()}') "
+                f"TO ('{(snapshot_date + timedelta(days=1)).isoformat()}')"
+            )
+        )
+        await self.session.exec(text(f"TRUNCATE {name}"))
+
+    async def store_snapshot(self, lb_type: LeaderboardType, snapshot_date: date) -> int:
+        """Write the current all-time ranks of a board with one INSERT ... SELECT.
+
+        Ranks are computed and copied by the database; no row leaves the server.
+        """
+        current_lb = self._ranked_subquery(lb_type, LeaderboardPeriod.all)
+        ranks = select(
+            literal(snapshot_date, Date),
+            literal(lb_type, LeaderboardSnapshot.__table__.c.type.type),
+            current_lb.c.user_id,
+            current_lb.c.rank,
+        ).select_from(current_lb)
+        result = await self.session.exec(
+            insert(LeaderboardSnapshot).from_select(["snapshot_date", "type", "user_id", "rank"], ranks)
+        )
+        return result.rowcount or 0
+
+    async def drop_snapshot_partitions_before(self, cutoff: date) -> list[str]:
+        """Drop whole daily partitions older than `cutoff` (retention)"""
+        result = await self.session.exec(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'leaderboard_snapshots'"
+            )
+        )
+        dropped: list[str] = []
+        for (name,) in result.all():
+            try:
+                day = datetime.strptime(name[len(SNAPSHOT_PARTITION_PREFIX):], "%Y%m%d").date()
+            except ValueError:
+                continue
+            if day < cutoff:
+                await self.session.exec(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        return dropped
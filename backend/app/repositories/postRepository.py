@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import exists
+from sqlalchemy import exists, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -36,7 +37,13 @@ class PostRepository:
         current_user_id: int,
         limit: int | None = 20,
         offset: int | None = 0,
+        after: tuple[datetime, int] | None = None,
     ) -> list[dict]:
+        """Accepted posts, newest first.
+
+        `after` is the (created_at, post_id) of the last post of the previous
+        page (keyset pagination); when given, `offset` is ignored.
+        """
         limit, offset = self._normalize_pagination(limit, offset)
 
         is_liked_by_me = exists(
@@ -61,10 +68,13 @@ class PostRepository:
             .outerjoin(UserInfo, UserInfo.user_id == User.id)
             .where(Post.is_deleted == False)
             .where(Post.status == PostStatus.ACCEPTED)
-            .order_by(Post.created_at.desc())
+            .order_by(Post.created_at.desc(), Post.id.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if after is not None:
+            stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+        else:
+            stmt = stmt.offset(offset)
 
         result = await self.session.exec(stmt)
         rows = result.all()
@@ -261,6 +271,7 @@ class PostRepository:
         post_id: int,
         limit: int | None = 20,
         offset: int | None = 0,
+        after: tuple[datetime, int] | None = None,
     ) -> list[dict]:
         """List all comments for a post with author information.
 
@@ -268,6 +279,8 @@ class PostRepository:
             post_id: ID of the post to get comments for
             limit: Maximum number of comments to return
             offset: Number of comments to skip
+            after: (created_at, comment_id) of the last comment of the previous
+                page; when given, `offset` is ignored
 
         Returns:
             List of comment dictionaries with author info
@@ -289,10 +302,13 @@ class PostRepository:
             .outerjoin(UserInfo, UserInfo.user_id == User.id)
             .where(PostComment.post_id == post_id)
             .where(PostComment.is_deleted == False)
-            .order_by(PostComment.created_at.asc())
+            .order_by(PostComment.created_at.asc(), PostComment.id.asc())
             .limit(limit)
-            .offset(offset)
         )
+        if after is not None:
+            stmt = stmt.where(tuple_(PostComment.created_at, PostComment.id) > tuple_(*after))
+        else:
+            stmt = stmt.offset(offset)
 
         result = await self.session.exec(stmt)
         rows = result.all()
@@ -24,12 +24,16 @@ class TopicRepository:
         user_id: int,
         include_deleted: bool = True,
         published_only: bool = False,
+        count_completed_lessons: bool = True,
     ) -> List[Dict[str, Any]]:
         """Return topics with aggregated section and lesson counts for a user.
 
         Each item contains: id, name, description, total_sections, completed_sections, 
         total_lessons, completed_lessons, progress.
         Ordered by topic.order_index then id.
+
+        `count_completed_lessons=False` skips the per-topic lesson query
+        (completed_lessons is then 0); see `count_completed_lessons()`.
         """
 
         lesson_on = Lesson.topic_id == Topic.id
@@ -84,29 +88,10 @@ class TopicRepository:
             # Calculate completed lessons: lessons where all sections are completed
             # We'll do this in a separate query for each topic (still better than N+1 from frontend)
             completed_lessons = 0
-            if total_lessons > 0:
-                # Count lessons where total sections == completed sections
-                lesson_completion_stmt = (
-                    select(func.count(Lesson.id))
-                    .select_from(Lesson)
-                    .join(LessonSection, LessonSection.lesson_id == Lesson.id)
-                    .join(
-                        UserProgress,
-                        (UserProgress.section_id == LessonSection.id)
-                        & (UserProgress.user_id == user_id)
-                        & (UserProgress.status == ProgressStatus.COMPLETED),
-                        isouter=True
-                    )
-                    .where(Lesson.topic_id == row.topic_id)
-                    .where(Lesson.is_deleted == False)
-                    .where(LessonSection.is_deleted == False)
-                    .group_by(Lesson.id)
-                    .having(
-                        func.count(LessonSection.id) == func.count(UserProgress.section_id)
-                    )
+            if total_lessons > 0 and count_completed_lessons:
+                completed_lessons = await self.count_completed_lessons(
+                    user_id=user_id, topic_id=int(row.topic_id)
                 )
-                result_completed = await self.session.exec(lesson_completion_stmt)
-                completed_lessons = len(result_completed.all())
             
             topics_raw.append(
                 {
@@ -123,6 +108,45 @@ class TopicRepository:
 
         return topics_raw
 
+    async def count_completed_lessons(self, *, user_id: int, topic_id: int) -> int:
+        """Lessons of a topic where the user completed every section"""
+        # Count lessons where total sections == completed sections
+        lesson_completion_stmt = (
+            select(func.count(Lesson.id))
+            .select_from(Lesson)
+            .join(LessonSection, LessonSection.lesson_id == Lesson.id)
+            .join(
+                UserProgress,
+                (UserProgress.section_id == LessonSection.id)
+                & (UserProgress.user_id == user_id)
+                & (UserProgress.status == ProgressStatus.COMPLETED),
+                isouter=True
+            )
+            .where(Lesson.topic_id == topic_id)
+            .where(Lesson.is_deleted == False)
+            .where(LessonSection.is_deleted == False)
+            .group_by(Lesson.id)
+            .having(
+                func.count(LessonSection.id) == func.count(UserProgress.section_id)
+            )
+        )
+        result_completed = await self.session.exec(lesson_completion_stmt)
+        return len(result_completed.all())
+
+    @staticmethod
+    def current_topic_index(topics: List[Dict[str, Any]]) -> Optional[int]:
+        """Index of the single "current" topic in `get_topics_progress` order.
+
+        - first topic that isn't fully completed
+        - if all are completed, the last topic
+        """
+        if not topics:
+            return None
+        for idx, t in enumerate(topics):
+            if t["total_sections"] > 0 and t["completed_sections"] < t["total_sections"]:
+                return idx
+        return len(topics) - 1
+
     async def create_topic(self, user_id: int, form: TopicCreate) -> Topic:
         """Create a new topic.
         
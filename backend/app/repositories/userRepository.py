@@ -4,10 +4,13 @@ from typing import Optional, Tuple
 from fastapi import Depends, HTTPException
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
-from models.user import ActivityType, User, UserPoints, UserRole, Role, RoleType, UserInfo, UserXPLog
+from models.user import ActivityType, User, UserPoints, UserRole, Role, RoleType, UserInfo, UserXPLog, UserXPDaily
 from schemas.user import UserProfileUpdate, UserSignUp, UserUpdate, UserPointsUpdate, UserInfoUpdate
 from database.session import get_session
+from core.auth_cache import invalidate_roles, invalidate_user, role_cache
+from services.leaderboard_engine import queue_leaderboard_update
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -60,19 +63,33 @@ class UserRepository:
             True,
         )
 
-    async def regen_energy_if_needed(self, user_id: int) -> UserPoints:
+    async def regen_energy_if_needed(
+        self,
+        user_id: int,
+        *,
+        commit: bool = True,
+        user_point: Optional[UserPoints] = None,
+    ) -> UserPoints:
         """Lazily regenerate energy for a user.
 
         - Does not consume energy
         - Persists changes only when regen actually occurs (or row is created)
+
+        When `commit=False`, this will only flush so callers can wrap multiple
+        updates in a single outer transaction. Pass `user_point` when the
+        caller has already loaded it.
         """
 
-        user_point = await self.get_user_point(user_id)
+        if user_point is None:
+            user_point = await self.get_user_point(user_id)
         if not user_point:
             user_point = UserPoints(user_id=user_id)
             self.session.add(user_point)
-            await self.session.commit()
-            await self.session.refresh(user_point)
+            if commit:
+                await self.session.commit()
+                await self.session.refresh(user_point)
+            else:
+                await self.session.flush()
             return user_point
 
         now_utc = datetime.now(timezone.utc)
@@ -93,8 +110,11 @@ class UserRepository:
         user_point.energy = new_energy
         user_point.last_energy_update = new_last_update
         self.session.add(user_point)
-        await self.session.commit()
-        await self.session.refresh(user_point)
+        if commit:
+            await self.session.commit()
+            await self.session.refresh(user_point)
+        else:
+            await self.session.flush()
         return user_point
     
     def __init__(self, session: AsyncSession):
@@ -115,12 +135,10 @@ class UserRepository:
         """
         
         # find default "learner" role by type
-        stmt = select(Role).where(Role.type == RoleType.LEARNER)
-        result = await self.session.exec(stmt)
-        role = result.first()
+        learner_role_id = await self._get_role_id(RoleType.LEARNER)
         
         # Validate that learner role exists
-        if not role:
+        if learner_role_id is None:
             raise HTTPException(status_code=500, detail="Default learner role not found")
 
         # Check if user already exists
@@ -135,24 +153,26 @@ class UserRepository:
             if getattr(self.session, "in_transaction", None) and self.session.in_transaction():
                 self.session.add(user)
                 await self.session.flush()  # ensure user.id is available
-                user_role = UserRole(user_id=user.id, role_id=role.id)
+                user_role = UserRole(user_id=user.id, role_id=learner_role_id)
                 self.session.add(user_role)
                 # create an empty user profile row linked to the user
                 user_info = UserInfo(user_id=user.id)
                 self.session.add(user_info)
                 user_point = UserPoints(user_id=user.id)
                 self.session.add(user_point)
+                queue_leaderboard_update(self.session, "add", user.id)
             else:
                 async with self.session.begin():
                     self.session.add(user)
                     await self.session.flush()  # ensure user.id is available
-                    user_role = UserRole(user_id=user.id, role_id=role.id)
+                    user_role = UserRole(user_id=user.id, role_id=learner_role_id)
                     self.session.add(user_role)
                     # create an empty user profile row linked to the user
                     user_info = UserInfo(user_id=user.id)
                     self.session.add(user_info)
                     user_point = UserPoints(user_id=user.id)
                     self.session.add(user_point)
+                    queue_leaderboard_update(self.session, "add", user.id)
 
             # refresh user instance after commit/flush
             await self.session.commit()
@@ -174,7 +194,9 @@ class UserRepository:
         Returns:
             User instance or None if not found
         """
-        statement = select(User).where(User.id == user_id)
+        # populate_existing: the request's current user may be a cached copy
+        # already in the session; writes must start from the stored row
+        statement = select(User).where(User.id == user_id).execution_options(populate_existing=True)
         result = await self.session.exec(statement)
         return result.first() 
     
@@ -217,21 +239,26 @@ class UserRepository:
         result = await self.session.exec(statement)
         return result.first()
     
-    async def get_all_users(self, skip: int = 0, limit: int = 10) -> list[User]:
-        """Get all users with pagination.
+    async def get_all_users(self, skip: int = 0, limit: int = 10, after_id: Optional[int] = None) -> list[User]:
+        """Get all users with pagination, ordered by id.
         
         Args:
             skip: Number of users to skip
             limit: Maximum number of users to return
+            after_id: Last user id of the previous page (keyset); replaces skip
             
         Returns:
             List of User instances
         """
-        statement = select(User).offset(skip).limit(limit)
+        statement = select(User).order_by(User.id).limit(limit)
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        else:
+            statement = statement.offset(skip)
         result = await self.session.exec(statement)
         return result.all()
     
-    async def get_all_users_enriched(self, skip: int = 0, limit: int = 50):
+    async def get_all_users_enriched(self, skip: int = 0, limit: int = 50, after_id: Optional[int] = None):
         """Get all users with their profiles and roles in a single optimized query.
         
         This method solves the N+1 query problem by using:
@@ -241,6 +268,7 @@ class UserRepository:
         Args:
             skip: Number of users to skip
             limit: Maximum number of users to return
+            after_id: Last user id of the previous page (keyset); replaces skip
             
         Returns:
             List of dicts with user, profile, and roles data
@@ -262,9 +290,13 @@ class UserRepository:
                 UserInfo.last_name,
             )
             .outerjoin(UserInfo, User.id == UserInfo.user_id)
-            .offset(skip)
+            .order_by(User.id)
             .limit(limit)
         )
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
         
         result = await self.session.exec(stmt)
         users_data = result.all()
@@ -333,6 +365,7 @@ class UserRepository:
             setattr(user, field, value)
         
         self.session.add(user)
+        invalidate_user(self.session, user_id=user_id)
         await self.session.commit()
         await self.session.refresh(user)
         return user
@@ -369,6 +402,7 @@ class UserRepository:
                 setattr(profile, field, value)
 
             self.session.add(profile)
+            queue_leaderboard_update(self.session, "set", user_id, username=profile.username)
             await self.session.commit()
             await self.session.refresh(profile)
             return profile
@@ -415,6 +449,7 @@ class UserRepository:
         current_xp = int(getattr(user_point, "xp", 0) or 0)
         user_point.xp = current_xp + amount
         self.session.add(user_point)
+        queue_leaderboard_update(self.session, "set", user_id, xp=user_point.xp)
 
         if commit:
             await self.session.commit()
@@ -432,7 +467,7 @@ class UserRepository:
         xp_amount: int,
         commit: bool = True,
     ) -> UserXPLog:
-        """Insert a XP log entry.
+        """Insert a XP log entry and add it to the user's daily XP bucket.
 
         When `commit=False`, this will only flush so callers can wrap multiple
         updates in a single outer transaction.
@@ -448,6 +483,19 @@ class UserRepository:
         )
         self.session.add(log_row)
 
+        # Week/month leaderboards sum these buckets instead of the raw log
+        bucket = pg_insert(UserXPDaily).values(
+            user_id=user_id,
+            day=datetime.now(timezone.utc).date(),
+            xp=xp_amount,
+        )
+        await self.session.exec(
+            bucket.on_conflict_do_update(
+                index_elements=[UserXPDaily.user_id, UserXPDaily.day],
+                set_={"xp": UserXPDaily.xp + bucket.excluded.xp},
+            )
+        )
+
         if commit:
             await self.session.commit()
             await self.session.refresh(log_row)
@@ -480,6 +528,7 @@ class UserRepository:
                 setattr(user_point, field, value)
             
             self.session.add(user_point)
+            queue_leaderboard_update(self.session, "set", user_id, xp=user_point.xp, streak=user_point.streak)
             await self.session.commit()
             await self.session.refresh(user_point)
             return user_point
@@ -520,6 +569,8 @@ class UserRepository:
             user.last_active_date = now_utc
             self.session.add(user)
             self.session.add(user_point)
+            invalidate_user(self.session, user_id=user_id)
+            queue_leaderboard_update(self.session, "set", user_id, streak=current_streak)
             return current_streak, True
 
         # Normalize last_active to UTC date for comparison
@@ -546,6 +597,8 @@ class UserRepository:
         user.last_active_date = now_utc
         self.session.add(user)
         self.session.add(user_point)
+        invalidate_user(self.session, user_id=user_id)
+        queue_leaderboard_update(self.session, "set", user_id, streak=current_streak)
         return current_streak, True
 
     async def consume_learning_energy(self, user_id: int, *, cost: int = 1) -> int:
@@ -605,19 +658,31 @@ class UserRepository:
         self,
         *,
         user_id: int,
-        last_active_date: Optional[datetime],
+        commit: bool = True,
+        user_point: Optional[UserPoints] = None,
     ) -> Tuple[int, bool]:
         """Reconcile streak when user opens the app (read-time).
 
         This keeps the database in sync even if the user hasn't completed a section
         for multiple days.
 
+        last_active_date is read from the database, never from the request's
+        (possibly cached) current user: a stale value would reset a streak
+        that was just extended.
+
+        When `commit=False`, this will only flush so callers can wrap multiple
+        updates in a single outer transaction. Pass `user_point` when the
+        caller has already loaded it.
+
         Returns:
             (effective_streak, is_streak_active_today)
         """
 
         today = datetime.now(timezone.utc).date()
 
+        user = await self.get_user_by_id(user_id)
+        last_active_date = user.last_active_date if user else None
+
         if last_active_date is None:
             last_active_utc_date = None
         else:
@@ -629,12 +694,17 @@ class UserRepository:
         is_active_today = last_active_utc_date == today
         is_broken = last_active_utc_date is None or last_active_utc_date < (today - timedelta(days=1))
 
-        user_point = await self.get_user_point(user_id)
+        if user_point is None:
+            user_point = await self.get_user_point(user_id)
         effective_streak = 0 if is_broken else (int(user_point.streak or 0) if user_point else 0)
 
         if is_broken and user_point and int(user_point.streak or 0) != 0:
             user_point.streak = 0
             self.session.add(user_point)
+            queue_leaderboard_update(self.session, "set", user_id, streak=0)
+            if not commit:
+                await self.session.flush()
+                return effective_streak, is_active_today
             try:
                 await self.session.commit()
                 await self.session.refresh(user_point)
@@ -661,6 +731,8 @@ class UserRepository:
         
         user.is_banned = True
         self.session.add(user)
+        queue_leaderboard_update(self.session, "remove", user_id)
+        invalidate_user(self.session, user_id=user_id)
         await self.session.commit()
         await self.session.refresh(user)
         return user
@@ -683,6 +755,8 @@ class UserRepository:
         
         user.is_banned = False
         self.session.add(user)
+        queue_leaderboard_update(self.session, "invalidate", user_id)
+        invalidate_user(self.session, user_id=user_id)
         await self.session.commit()
         await self.session.refresh(user)
         return user
@@ -702,6 +776,8 @@ class UserRepository:
             raise HTTPException(status_code=404, detail="User not found")
         
         await self.session.delete(user)
+        queue_leaderboard_update(self.session, "remove", user_id)
+        invalidate_user(self.session, firebase_uid=user.firebase_uid)
         await self.session.commit()
         return True
 
@@ -725,11 +801,11 @@ class UserRepository:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get or create role
-        role = await self._get_or_create_role(role_type)
+        role_id = await self._get_or_create_role_id(role_type)
         
         # Check if role already assigned
         stmt = select(UserRole).where(
-            (UserRole.user_id == user_id) & (UserRole.role_id == role.id)
+            (UserRole.user_id == user_id) & (UserRole.role_id == role_id)
         )
         result = await self.session.exec(stmt)
         existing = result.first()
@@ -741,8 +817,10 @@ class UserRepository:
             )
         
         # Create new user role
-        user_role = UserRole(user_id=user_id, role_id=role.id)
+        user_role = UserRole(user_id=user_id, role_id=role_id)
         self.session.add(user_role)
+        queue_leaderboard_update(self.session, "invalidate", user_id)
+        invalidate_roles(self.session, user_id)
         await self.session.commit()
         await self.session.refresh(user_role)
         return user_role
@@ -763,13 +841,13 @@ class UserRepository:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get role
-        role = await self._get_role_by_type(role_type)
-        if not role:
+        role_id = await self._get_role_id(role_type)
+        if role_id is None:
             raise HTTPException(status_code=404, detail=f"Role {role_type.value} not found")
         
         # Find user role
         stmt = select(UserRole).where(
-            (UserRole.user_id == user_id) & (UserRole.role_id == role.id)
+            (UserRole.user_id == user_id) & (UserRole.role_id == role_id)
         )
         result = await self.session.exec(stmt)
         user_role = result.first()
@@ -782,6 +860,8 @@ class UserRepository:
         
         # Delete user role
         await self.session.delete(user_role)
+        queue_leaderboard_update(self.session, "invalidate", user_id)
+        invalidate_roles(self.session, user_id)
         await self.session.commit()
 
     async def get_user_roles(self, user_id: int) -> list[dict]:
@@ -830,49 +910,65 @@ class UserRepository:
         Returns:
             True if user has role, False otherwise
         """
-        role = await self._get_role_by_type(role_type)
-        if not role:
-            return False
+        return role_type in await self.get_role_types(user_id)
+
+    async def get_role_types(self, user_id: int) -> frozenset[RoleType]:
+        """Role types of a user, served from the role cache when possible.
         
-        stmt = select(UserRole).where(
-            (UserRole.user_id == user_id) & (UserRole.role_id == role.id)
-        )
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Frozenset of RoleType (empty if the user has no roles)
+        """
+        roles = role_cache.get_roles(user_id)
+        if roles is not None:
+            return roles
+        
+        # Not cached if roles change (and commit) while this SELECT runs
+        generation = role_cache.generation
+        stmt = select(Role.type).join(UserRole, UserRole.role_id == Role.id).where(UserRole.user_id == user_id)
         result = await self.session.exec(stmt)
-        return result.first() is not None
+        return role_cache.put_roles(user_id, result.all(), generation=generation)
 
     # --- Helper methods ---
-    async def _get_or_create_role(self, role_type: RoleType) -> Role:
+    async def _get_or_create_role_id(self, role_type: RoleType) -> int:
         """Get or create a role by type.
         
         Args:
             role_type: RoleType to get or create
             
         Returns:
-            Role object
+            Role id
         """
-        stmt = select(Role).where(Role.type == role_type)
-        result = await self.session.exec(stmt)
-        role = result.first()
-        
-        if role:
-            return role
+        role_id = await self._get_role_id(role_type)
+        if role_id is not None:
+            return role_id
         
         # Create role if not exists
         role = Role(type=role_type, description=f"{role_type.value} role")
         self.session.add(role)
         await self.session.commit()
         await self.session.refresh(role)
-        return role
+        role_cache.put_role_id(role_type, role.id)
+        return role.id
 
-    async def _get_role_by_type(self, role_type: RoleType) -> Optional[Role]:
-        """Get role by type.
+    async def _get_role_id(self, role_type: RoleType) -> Optional[int]:
+        """Get role id by type; roles are static, so ids are cached per process.
         
         Args:
             role_type: RoleType to retrieve
             
         Returns:
-            Role object or None if not found
+            Role id or None if not found
         """
-        stmt = select(Role).where(Role.type == role_type)
+        role_id = role_cache.role_id(role_type)
+        if role_id is not None:
+            return role_id
+        
+        stmt = select(Role.id).where(Role.type == role_type)
         result = await self.session.exec(stmt)
-        return result.first()
\ No newline at end of file
+        role_id = result.first()
+        if role_id is not None:
+            role_cache.put_role_id(role_type, role_id)
+        return role_id
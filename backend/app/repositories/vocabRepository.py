@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Optional, Dict, Any
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from models.vocab import Vocab, UserWord, ReviewStatus, utc_now
@@ -65,6 +67,51 @@ class VocabRepository:
             return existing
         return await self.create_vocab(word=word, definition=definition, audio_url=audio_url, phonetic=phonetic)
 
+    async def update_vocab_details(
+        self,
+        vocab: Vocab,
+        definition: Optional[Dict[str, Any]] = None,
+        audio_url: Optional[str] = None,
+        phonetic: Optional[str] = None,
+    ) -> Vocab:
+        """Fill in dictionary details of an existing vocab, keeping values already set"""
+        vocab.definition = vocab.definition or definition
+        vocab.audio_url = vocab.audio_url or audio_url
+        vocab.phonetic = vocab.phonetic or phonetic
+        self.session.add(vocab)
+        await self.session.commit()
+        await self.session.refresh(vocab)
+        return vocab
+
+    async def list_words_with_definition(self, words: list[str]) -> set[str]:
+        """Which of `words` already have dictionary details stored"""
+        if not words:
+            return set()
+        statement = select(Vocab.word).where(Vocab.word.in_(words), Vocab.definition.is_not(None))
+        result = await self.session.exec(statement)
+        return set(result.all())
+
+    async def upsert_vocabs(self, rows: list[Dict[str, Any]], commit: bool = True) -> int:
+        """Insert dictionary entries in one statement; existing words keep values already set.
+
+        Each row: {"word", "definition", "audio_url", "phonetic"}
+        """
+        if not rows:
+            return 0
+        stmt = pg_insert(Vocab).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vocab.word],
+            set_={
+                "definition": func.coalesce(Vocab.definition, stmt.excluded.definition),
+                "audio_url": func.coalesce(Vocab.audio_url, stmt.excluded.audio_url),
+                "phonetic": func.coalesce(Vocab.phonetic, stmt.excluded.phonetic),
+            },
+        )
+        await self.session.exec(stmt)
+        if commit:
+            await self.session.commit()
+        return len(rows)
+
     async def get_user_word(self, user_id: int, vocab_id: int) -> UserWord | None:
         statement = select(UserWord).where(
             UserWord.user_id == user_id,
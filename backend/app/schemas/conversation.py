@@ -1,9 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
+from services.conversation_sessions import DEFAULT_SESSION_ID, MAX_SESSION_ID_LENGTH
+
 
 class ConversationRequest(BaseModel):
     message: str
+    session_id: str = Field(DEFAULT_SESSION_ID, max_length=MAX_SESSION_ID_LENGTH)
 
 
 class ConversationResponse(BaseModel):
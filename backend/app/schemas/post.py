@@ -79,10 +79,12 @@ class AdminPostListItem(BaseModel):
 
 class AdminPostListResponse(BaseModel):
     """Response schema for list of posts with pagination"""
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
     posts: list[AdminPostListItem]
+    # Pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class AdminUserPostsResponse(BaseModel):
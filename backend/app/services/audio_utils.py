@@ -1,10 +1,265 @@
-import librosa
-import numpy as np
 import io
+import logging
+import shutil
+import struct
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_SECONDS = 30
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_PCM_DTYPES = {1: np.dtype("u1"), 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+def load_audio_from_bytes(
+    audio_bytes: bytes, sr: int = 16000, max_seconds: float = MAX_SECONDS
+) -> np.ndarray:
+    """Decode an upload to mono float32 at `sr`, keeping at most `max_seconds`.
+
+    Decoders are tried from cheapest to most general:
+    1. PCM/float WAV parsed in place (no resampling when already at `sr`)
+    2. libsndfile, reading only the frames under the cap (ogg/opus, flac, mp3)
+    3. ffmpeg with `-t` so containers like webm stop decoding at the cap
+    4. librosa (full decode), the original path
+    """
+    audio = _load_wav(audio_bytes, sr, max_seconds)
+    if audio is None:
+        audio = _load_soundfile(audio_bytes, sr, max_seconds)
+    if audio is None:
+        audio = _load_ffmpeg(audio_bytes, sr, max_seconds)
+    if audio is None:
+        audio = _load_librosa(audio_bytes, sr, max_seconds)
+    return audio
+
+
+def _load_wav(audio_bytes: bytes, sr: int, max_seconds: float) -> Optional[np.ndarray]:
+    if len(audio_bytes) < 12 or audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    data_offset = data_size = None
+    offset = 12
+    while offset + 8 <= len(audio_bytes):
+        chunk_id = audio_bytes[offset:offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", audio_bytes, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            fmt = struct.unpack_from("<HHIIHH", audio_bytes, body)
+            if fmt[0] == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # Real format code is the first two bytes of the SubFormat GUID
+                (sub_format,) = struct.unpack_from("<H", audio_bytes, body + 24)
+                fmt = (sub_format,) + fmt[1:]
+        elif chunk_id == b"data":
+            data_offset = body
+            # Streamed WAVs may carry 0 / 0xFFFFFFFF here: trust the buffer instead
+            data_size = min(chunk_size, len(audio_bytes) - body) or len(audio_bytes) - body
+            break
+        offset = body + chunk_size + (chunk_size & 1)
+
+    if fmt is None or data_offset is None:
+        return None
+
+    format_code, channels, rate, _, _, bits = fmt
+    sample_width = bits // 8
+    if format_code == _WAVE_FORMAT_PCM and sample_width in _PCM_DTYPES:
+        dtype = _PCM_DTYPES[sample_width]
+    elif format_code == _WAVE_FORMAT_IEEE_FLOAT and sample_width == 4:
+        dtype = np.dtype("<f4")
+    else:
+        return None
+    if channels <= 0 or rate <= 0:
+        return None
+
+    max_frames = int(rate * max_seconds)
+    n_frames = min(data_size // (sample_width * channels), max_frames)
+
+    # View over the upload itself; the float32 conversion below is the only copy
+    raw = np.frombuffer(audio_bytes, dtype=dtype, count=n_frames * channels, offset=data_offset)
+    if dtype.kind == "u":
+        audio = raw.astype(np.float32)
+        audio -= 128.0
+        audio *= 1.0 / 128.0
+    elif dtype.kind == "i":
+        audio = raw.astype(np.float32)
+        audio *= 1.0 / float(2 ** (bits - 1))
+    else:
+        audio = raw.astype(np.float32, copy=True)
+
+    return _to_target(audio, channels, rate, sr)
+
+
+def _load_soundfile(audio_bytes: bytes, sr: int, max_seconds: float) -> Optional[np.ndarray]:
+    try:
+        import soundfile as sf
+    except ImportError:
+        return None
+
+    try:
+        with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
+            rate, channels = f.samplerate, f.channels
+            audio = f.read(frames=int(rate * max_seconds), dtype="float32", always_2d=False)
+    except Exception:
+        return None
+
+    return _to_target(audio.reshape(-1), channels, rate, sr)
+
+
+def _load_ffmpeg(audio_bytes: bytes, sr: int, max_seconds: float) -> Optional[np.ndarray]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+
+    cmd = [
+        ffmpeg, "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-t", str(max_seconds),
+        "-f", "f32le", "-ac", "1", "-ar", str(sr),
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, input=audio_bytes, capture_output=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"ffmpeg decode failed: {e}")
+        return None
+    if proc.returncode != 0 or not proc.stdout:
+        return None
+
+    # ffmpeg already produced mono float32 at `sr`; copy once to own the buffer
+    return np.frombuffer(proc.stdout, dtype="<f4").astype(np.float32, copy=True)
 
 
-def load_audio_from_bytes(audio_bytes: bytes, sr: int = 16000) -> np.ndarray:
+def _load_librosa(audio_bytes: bytes, sr: int, max_seconds: float) -> np.ndarray:
+    import librosa
+
     audio, _ = librosa.load(io.BytesIO(audio_bytes), sr=sr)
 
-    max_len = sr * 30
+    max_len = int(sr * max_seconds)
     return audio[:max_len]
+
+
+def _to_target(audio: np.ndarray, channels: int, rate: int, sr: int) -> np.ndarray:
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    if rate != sr:
+        audio = resample(audio, rate, sr)
+    return audio
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Fast resampling: soxr when available (ships with librosa), else polyphase."""
+    if orig_sr == target_sr:
+        return audio
+    try:
+        import soxr
+
+        return soxr.resample(audio, orig_sr, target_sr, quality="HQ").astype(np.float32, copy=False)
+    except ImportError:
+        from math import gcd
+        from scipy.signal import resample_poly
+
+        g = gcd(orig_sr, target_sr)
+        return resample_poly(audio, target_sr // g, orig_sr // g).astype(np.float32, copy=False)
+
+
+# --- Voice activity trimming ---
+@dataclass
+class TrimResult:
+    audio: np.ndarray
+    start: int
+    end: int
+    original_samples: int
+
+    @property
+    def is_silent(self) -> bool:
+        return self.end <= self.start
+
+    @property
+    def samples_saved(self) -> int:
+        return self.original_samples - len(self.audio)
+
+
+class VadStats:
+    """Process-wide counters of how much audio trimming kept away from the models"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.silent_clips = 0
+        self.samples_in = 0
+        self.samples_out = 0
+
+    def record(self, result: TrimResult) -> None:
+        with self._lock:
+            self.clips += 1
+            self.silent_clips += int(result.is_silent)
+            self.samples_in += result.original_samples
+            self.samples_out += len(result.audio)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            saved = self.samples_in - self.samples_out
+            return {
+                "clips": self.clips,
+                "silent_clips": self.silent_clips,
+                "samples_in": self.samples_in,
+                "samples_saved": saved,
+                "saved_ratio": saved / self.samples_in if self.samples_in else 0.0,
+            }
+
+
+vad_stats = VadStats()
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sr: int = 16000,
+    top_db: float = 35.0,
+    min_rms: float = 0.005,
+    frame_ms: float = 25.0,
+    hop_ms: float = 10.0,
+    pad_ms: float = 150.0,
+) -> TrimResult:
+    """Cut leading/trailing silence using frame energy.
+
+    A frame counts as speech when its RMS is within `top_db` of the loudest
+    frame and above the absolute floor `min_rms` (so a clip of pure room
+    noise is reported silent instead of being normalized up). `pad_ms` of
+    context is kept around the detected speech so word onsets survive.
+    The returned audio is a view into the input, not a copy.
+    """
+    n = len(audio)
+    frame = max(1, int(sr * frame_ms / 1000))
+    hop = max(1, int(sr * hop_ms / 1000))
+    if n < frame:
+        result = TrimResult(audio=audio[:0], start=0, end=0, original_samples=n)
+        vad_stats.record(result)
+        return result
+
+    # Frame energies from a running sum of squares: O(n), no frame copies
+    energy = np.concatenate(([0.0], np.cumsum(np.square(audio, dtype=np.float64))))
+    starts = np.arange(0, n - frame + 1, hop)
+    rms = np.sqrt((energy[starts + frame] - energy[starts]) / frame)
+
+    peak = float(rms.max())
+    threshold = max(min_rms, peak * 10 ** (-top_db / 20))
+    voiced = np.flatnonzero(rms >= threshold) if peak >= min_rms else np.empty(0, dtype=int)
+
+    if voiced.size == 0:
+        result = TrimResult(audio=audio[:0], start=0, end=0, original_samples=n)
+    else:
+        pad = int(sr * pad_ms / 1000)
+        start = max(0, int(starts[voiced[0]]) - pad)
+        end = min(n, int(starts[voiced[-1]]) + frame + pad)
+        result = TrimResult(audio=audio[start:end], start=start, end=end, original_samples=n)
+
+    vad_stats.record(result)
+    return result
@@ -1,50 +1,11 @@
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
+from services.conversation_sessions import ConversationSession
+from core.config import settings
 from services.gemini_client import GeminiClient
+from services.prompt_builder import ChatPromptBuilder
 
-
-class ConversationChatService:
-    """
-    Conversation-only chatbot
-    - No pronunciation scoring
-    - No wav2vec
-    """
-
-    def __init__(self, llm: GeminiClient):
-        self.llm = llm
-        self.history: List[Dict[str, str]] = []
-
-    def chat(self, message: str) -> str:
-        prompt = self._build_prompt(message)
-        reply = self.llm.generate(prompt)
-
-        self.history.append({"role": "user", "content": message})
-        self.history.append({"role": "assistant", "content": reply})
-
-        return reply
-
-    def chat_english(self, message: str) -> str:
-        """Chat with English-only response (for voice mode)"""
-        prompt = self._build_prompt_english(message)
-        reply = self.llm.generate(prompt)
-
-        self.history.append({"role": "user", "content": message})
-        self.history.append({"role": "assistant", "content": reply})
-
-        return reply
-
-    def reset(self):
-        self.history.clear()
-
-    def get_history(self):
-        return self.history
-
-    def _build_prompt(self, message: str) -> str:
-        history_text = "\n".join(
-            f"{h['role'].capitalize()}: {h['content']}"
-            for h in self.history[-6:]  # limit memory
-        )
-
-        return f"""
+# Static instruction blocks: the conversation-dependent parts are appended by ChatPromptBuilder
+CHAT_PREFIX = """
 You are a friendly language learning assistant named Katbot.
 
 Rules:
@@ -54,22 +15,9 @@ Rules:
 - Gently correct mistakes when helping with language learning
 - Encourage and motivate the learner
 - Be helpful, friendly, and supportive
-
-Conversation so far:
-{history_text}
-
-User: {message}
-Assistant:
 """
 
-    def _build_prompt_english(self, message: str) -> str:
-        """Build prompt that forces English response (for voice mode)"""
-        history_text = "\n".join(
-            f"{h['role'].capitalize()}: {h['content']}"
-            for h in self.history[-6:]  # limit memory
-        )
-
-        return f"""
+CHAT_PREFIX_ENGLISH = """
 You are a friendly English language learning assistant named Katbot.
 
 Rules:
@@ -81,10 +29,69 @@ Rules:
 - Encourage and motivate the learner
 - Be helpful, friendly, and supportive
 - Keep responses concise and easy to understand when spoken aloud
+"""
 
-Conversation so far:
-{history_text}
 
-User: {message}
-Assistant:
-"""
+class ConversationChatService:
+    """
+    Conversation-only chatbot
+    - No pronunciation scoring
+    - No wav2vec
+    - Stateless: history lives in the ConversationSession passed in
+    """
+
+    def __init__(self, llm: GeminiClient):
+        self.llm = llm
+        options = dict(
+            token_budget=settings.chat_prompt_token_budget,
+            recent_turns=settings.chat_recent_turns,
+            summary_every=settings.chat_summary_every_turns,
+        )
+        self.prompts = ChatPromptBuilder(CHAT_PREFIX, **options)
+        self.prompts_english = ChatPromptBuilder(CHAT_PREFIX_ENGLISH, **options)
+
+    async def chat(self, session: ConversationSession, message: str) -> str:
+        prompt = self._build_prompt(session, message)
+        reply = await self.llm.generate(prompt)
+
+        session.add_turn(message, reply)
+
+        return reply
+
+    async def chat_english(self, session: ConversationSession, message: str) -> str:
+        """Chat with English-only response (for voice mode)"""
+        prompt = self._build_prompt_english(session, message)
+        reply = await self.llm.generate(prompt)
+
+        session.add_turn(message, reply)
+
+        return reply
+
+    async def chat_stream(
+        self, session: ConversationSession, message: str, english: bool = False
+    ) -> AsyncIterator[str]:
+        """Yield the reply as it is generated; history is written once it ends"""
+        prompt = self._build_prompt_english(session, message) if english else self._build_prompt(session, message)
+        parts: List[str] = []
+        try:
+            async for chunk in self.llm.stream(prompt):
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # Also keep what was already shown if the client went away mid-reply
+            if parts:
+                session.add_turn(message, "".join(parts))
+
+    def _build_prompt(self, session: ConversationSession, message: str) -> str:
+        return self.prompts.build(session, message)
+
+    def _build_prompt_english(self, session: ConversationSession, message: str) -> str:
+        """Build prompt that forces English response (for voice mode)"""
+        return self.prompts_english.build(session, message)
+
+    def needs_summary(self, session: ConversationSession) -> bool:
+        return self.prompts.needs_summary(session)
+
+    async def refresh_summary(self, session: ConversationSession) -> bool:
+        """Fold older turns into the session summary (one extra LLM call)"""
+        return await self.prompts.refresh_summary(session, self.llm)
@@ -0,0 +1,180 @@
+"""
+Per-user chatbot conversations.
+
+A conversation is identified by (user uid, session id) and keeps at most
+`max_messages` messages (ring buffer: the oldest turns fall off), plus a
+rolling summary of older turns maintained by the prompt builder.
+
+- MemorySessionStore: process-local, at most `max_sessions` conversations
+  with least-recently-used eviction
+- DatabaseSessionStore: one `conversation_sessions` row per conversation,
+  so history survives restarts and is shared by every worker
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.config import settings
+from database.session import async_session_maker
+from repositories.conversationRepository import ConversationRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+# conversation_sessions.session_id is VARCHAR(64)
+MAX_SESSION_ID_LENGTH = 64
+
+SessionKey = Tuple[str, str]
+
+
+class ConversationSession:
+    def __init__(
+        self,
+        user_uid: str,
+        session_id: str,
+        max_messages: int,
+        history: Optional[List[Dict[str, str]]] = None,
+        summary: str = "",
+        summarized_count: int = 0,
+        message_count: Optional[int] = None,
+    ):
+        self.user_uid = user_uid
+        self.session_id = session_id
+        self.history: Deque[Dict[str, str]] = deque(history or [], maxlen=max_messages)
+        self.summary = summary
+        # Counters over the whole conversation, not just what the ring buffer still holds
+        self.summarized_count = summarized_count
+        self.message_count = len(self.history) if message_count is None else message_count
+
+    @property
+    def key(self) -> SessionKey:
+        return (self.user_uid, self.session_id)
+
+    def add_turn(self, message: str, reply: str) -> None:
+        self.history.append({"role": "user", "content": message})
+        self.history.append({"role": "assistant", "content": reply})
+        self.message_count += 2
+
+    def messages(self) -> List[Dict[str, str]]:
+        return list(self.history)
+
+
+class SessionStore(ABC):
+    def __init__(self, max_messages: int = 20):
+        self.max_messages = max_messages
+
+    @abstractmethod
+    async def load(self, user_uid: str, session_id: str) -> ConversationSession:
+        ...
+
+    @abstractmethod
+    async def save(self, session: ConversationSession) -> None:
+        ...
+
+    @abstractmethod
+    async def save_summary(self, session: ConversationSession) -> None:
+        """Persist only the summary, without overwriting newer history"""
+
+    @abstractmethod
+    async def reset(self, user_uid: str, session_id: str) -> None:
+        ...
+
+    def stats(self) -> Dict:
+        return {"backend": type(self).__name__, "max_messages": self.max_messages}
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, max_sessions: int = 1000, max_messages: int = 20):
+        super().__init__(max_messages)
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[SessionKey, ConversationSession]" = OrderedDict()
+        self.evictions = 0
+
+    async def load(self, user_uid: str, session_id: str) -> ConversationSession:
+        key = (user_uid, session_id)
+        session = self._sessions.get(key)
+        if session is not None:
+            self._sessions.move_to_end(key)
+            return session
+
+        session = ConversationSession(user_uid, session_id, self.max_messages)
+        self._sessions[key] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        return session
+
+    async def save(self, session: ConversationSession) -> None:
+        # History is mutated in place; nothing to write back
+        pass
+
+    async def save_summary(self, session: ConversationSession) -> None:
+        pass
+
+    async def reset(self, user_uid: str, session_id: str) -> None:
+        self._sessions.pop((user_uid, session_id), None)
+
+    def stats(self) -> Dict:
+        return {
+            **super().stats(),
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "evictions": self.evictions,
+        }
+
+
+class DatabaseSessionStore(SessionStore):
+    def __init__(self, session_factory=async_session_maker, max_messages: int = 20):
+        super().__init__(max_messages)
+        self.session_factory = session_factory
+
+    async def load(self, user_uid: str, session_id: str) -> ConversationSession:
+        async with self.session_factory() as db:
+            row = await ConversationRepository(db).get(user_uid, session_id)
+        if row is None:
+            return ConversationSession(user_uid, session_id, self.max_messages)
+        return ConversationSession(
+            user_uid,
+            session_id,
+            self.max_messages,
+            history=row.history,
+            summary=row.summary,
+            summarized_count=row.summarized_count,
+            message_count=row.message_count,
+        )
+
+    async def save(self, session: ConversationSession) -> None:
+        async with self.session_factory() as db:
+            await ConversationRepository(db).save_history(
+                session.user_uid, session.session_id, session.messages(), session.message_count
+            )
+
+    async def save_summary(self, session: ConversationSession) -> None:
+        async with self.session_factory() as db:
+            await ConversationRepository(db).save_summary(
+                session.user_uid, session.session_id, session.summary, session.summarized_count
+            )
+
+    async def reset(self, user_uid: str, session_id: str) -> None:
+        async with self.session_factory() as db:
+            await ConversationRepository(db).delete(user_uid, session_id)
+
+
+# Singleton instance
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    global _session_store
+    if _session_store is None:
+        if settings.conversation_store == "database":
+            logger.info("Conversation sessions persisted in the database")
+            _session_store = DatabaseSessionStore(max_messages=settings.conversation_max_messages)
+        else:
+            _session_store = MemorySessionStore(
+                max_sessions=settings.conversation_max_sessions,
+                max_messages=settings.conversation_max_messages,
+            )
+    return _session_store
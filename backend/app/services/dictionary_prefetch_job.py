@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Callable, Iterable
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.lesson import Lesson, LessonSection, LessonStatus, Question
+from repositories.vocabRepository import VocabRepository
+from services.dictionary_service import (
+    DictionaryUpstreamError,
+    DictionaryWordNotFoundError,
+    get_dictionary_cache,
+    lookup_word,
+)
+from services.http_client import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+# JSONB keys that hold vocabulary terms in lesson / section / question content
+_TERM_KEYS = {"vocabulary", "words", "word", "phrase", "term"}
+# Single dictionary headwords only: phrases and sentences are not in dictionaryapi.dev
+_WORD_RE = re.compile(r"^[a-z][a-z'\-]{0,63}$")
+
+
+def extract_terms(content: Any) -> set[str]:
+    """Vocabulary terms found anywhere in a content JSON document"""
+    terms: set[str] = set()
+
+    def add(value: Any) -> None:
+        if isinstance(value, str):
+            word = value.strip().lower()
+            if _WORD_RE.match(word):
+                terms.add(word)
+        elif isinstance(value, list):
+            for item in value:
+                add(item)
+        elif isinstance(value, dict):
+            # e.g. {"word": "hello", "meaning": ...} inside a vocabulary list
+            for key in ("word", "phrase", "term"):
+                add(value.get(key))
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in _TERM_KEYS:
+                    add(value)
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(content)
+    return terms
+
+
+class DictionaryPrefetchJob:
+    """Resolve vocabulary of published content into `vocabs` ahead of learners.
+
+    Scans Lesson / LessonSection / Question content, skips words that already
+    have details stored, looks the rest up upstream with bounded concurrency
+    and upserts the results in batches.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        concurrency: int = 4,
+        batch_size: int = 100,
+    ):
+        self._session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def run(self) -> dict[str, int]:
+        logger.info("DictionaryPrefetchJob started")
+
+        async with self._session_factory() as session:
+            terms = await self._collect_terms(session)
+            missing = await self._missing(session, sorted(terms))
+
+        stats = {"terms": len(terms), "missing": len(missing), "stored": 0, "not_found": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        circuit_open = asyncio.Event()
+
+        async def resolve(word: str) -> dict[str, Any] | None:
+            if circuit_open.is_set():
+                return None
+            async with semaphore:
+                try:
+                    # Keyed by the term as written in lessons, which is what learners look up
+                    return {**await lookup_word(word), "word": word}
+                except DictionaryWordNotFoundError:
+                    stats["not_found"] += 1
+                except DictionaryUpstreamError as exc:
+                    stats["failed"] += 1
+                    if isinstance(exc.__cause__, CircuitOpenError):
+                        # Upstream is down: stop instead of queueing the rest behind the breaker
+                        circuit_open.set()
+            return None
+
+        for start in range(0, len(missing), self.batch_size):
+            chunk = missing[start:start + self.batch_size]
+            payloads = [p for p in await asyncio.gather(*(resolve(w) for w in chunk)) if p]
+            stats["stored"] += await self._store(payloads)
+            if circuit_open.is_set():
+                logger.warning("DictionaryPrefetchJob stopped early: dictionary API circuit is open")
+                break
+
+        logger.info("DictionaryPrefetchJob finished %s", stats)
+        return stats
+
+    async def _collect_terms(self, session: AsyncSession) -> set[str]:
+        published = LessonStatus.PUBLISHED
+        queries = [
+            select(Lesson.content).where(Lesson.status == published, Lesson.is_deleted == False),  # noqa: E712
+            select(LessonSection.content)
+            .join(Lesson, Lesson.id == LessonSection.lesson_id)
+            .where(Lesson.status == published, Lesson.is_deleted == False, LessonSection.is_deleted == False),  # noqa: E712
+            select(Question.content)
+            .join(LessonSection, LessonSection.id == Question.section_id)
+            .join(Lesson, Lesson.id == LessonSection.lesson_id)
+            .where(
+                Question.status == published,
+                Question.is_deleted == False,  # noqa: E712
+                Lesson.status == published,
+                Lesson.is_deleted == False,  # noqa: E712
+                LessonSection.is_deleted == False,  # noqa: E712
+            ),
+        ]
+
+        terms: set[str] = set()
+        for statement in queries:
+            result = await session.exec(statement)
+            for content in result.all():
+                terms |= extract_terms(content)
+        return terms
+
+    async def _missing(self, session: AsyncSession, words: list[str]) -> list[str]:
+        repo = VocabRepository(session)
+        known: set[str] = set()
+        for start in range(0, len(words), 1000):
+            known |= await repo.list_words_with_definition(words[start:start + 1000])
+        return [w for w in words if w not in known]
+
+    async def _store(self, payloads: Iterable[dict[str, Any]]) -> int:
+        rows = {p["word"]: p for p in payloads}
+        if not rows:
+            return 0
+
+        async with self._session_factory() as session:
+            stored = await VocabRepository(session).upsert_vocabs(
+                [
+                    {
+                        "word": p["word"],
+                        "definition": p["definition"],
+                        "audio_url": p["audio_url"],
+                        "phonetic": p["phonetic"],
+                    }
+                    for p in rows.values()
+                ]
+            )
+
+        cache = get_dictionary_cache()
+        for payload in rows.values():
+            cache.prime(payload)
+        return stored
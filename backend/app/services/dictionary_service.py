@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from models.vocab import Vocab
+from repositories.vocabRepository import VocabRepository
+from services.http_client import CircuitOpenError, get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class DictionaryWordNotFoundError(Exception):
@@ -117,8 +129,9 @@ async def lookup_word(raw_word: str) -> dict[str, Any]:
     url = f"{_DICTIONARY_API_BASE_URL}/{word}"
 
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT_SECONDS) as client:
-            resp = await client.get(url)
+        resp = await get_http_client().get(url, timeout=_TIMEOUT_SECONDS)
+    except CircuitOpenError as exc:
+        raise DictionaryUpstreamError("Dictionary API unavailable (circuit open)") from exc
     except httpx.TimeoutException as exc:
         raise DictionaryUpstreamError("Dictionary API timeout") from exc
     except httpx.HTTPError as exc:
@@ -154,3 +167,139 @@ async def lookup_word(raw_word: str) -> dict[str, Any]:
         "audio_url": audio_url,
         "phonetic": phonetic,
     }
+
+
+# --- Read-through cache ---
+class DictionaryCache:
+    """Word lookups: in-process LRU -> `vocabs` table -> dictionaryapi.dev.
+
+    - upstream results are written to `vocabs`, so they survive restarts
+    - upstream 404s are cached as negatives for `negative_ttl_seconds`
+    - concurrent lookups of the same word share one upstream request
+    - upstream errors (timeouts, 5xx) are not cached
+    """
+
+    def __init__(self, max_entries: int = 5000, negative_ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # word -> payload, or None for a cached 404 (with its expiry in _negative_until)
+        self._entries: OrderedDict[str, dict[str, Any] | None] = OrderedDict()
+        self._negative_until: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.stats_counters = {"memory_hits": 0, "negative_hits": 0, "db_hits": 0, "upstream_calls": 0}
+
+    async def lookup(self, raw_word: str, session: AsyncSession) -> dict[str, Any]:
+        """Same contract as `lookup_word`, served locally whenever possible."""
+        word = _normalize_word(raw_word)
+        if not word:
+            raise ValueError("word is required")
+
+        if word in self._entries:
+            payload = self._entries[word]
+            if payload is not None:
+                self._entries.move_to_end(word)
+                self.stats_counters["memory_hits"] += 1
+                return payload
+            if self._negative_until.get(word, 0) > time.monotonic():
+                self.stats_counters["negative_hits"] += 1
+                raise DictionaryWordNotFoundError("Word not found")
+            self._forget(word)
+
+        # Rows saved from the client without a definition don't count as a lookup result
+        vocab = await VocabRepository(session).get_vocab_by_word(word)
+        if vocab is not None and vocab.definition:
+            payload = _vocab_payload(vocab)
+            self._remember(word, payload)
+            self.stats_counters["db_hits"] += 1
+            return payload
+
+        task = self._inflight.get(word)
+        leader = task is None
+        if leader:
+            self.stats_counters["upstream_calls"] += 1
+            task = asyncio.create_task(lookup_word(word))
+            self._inflight[word] = task
+            task.add_done_callback(lambda _: self._inflight.pop(word, None))
+
+        try:
+            payload = await asyncio.shield(task)
+        except DictionaryWordNotFoundError:
+            self._remember(word, None)
+            raise
+
+        self._remember(word, payload)
+        if leader:
+            await self._persist(word, payload, vocab, session)
+        return payload
+
+    def prime(self, payload: dict[str, Any]) -> None:
+        """Put an already resolved payload in the memory tier"""
+        self._remember(payload["word"], payload)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "negative_entries": len(self._negative_until),
+            "inflight": len(self._inflight),
+            **self.stats_counters,
+        }
+
+    def _remember(self, word: str, payload: dict[str, Any] | None) -> None:
+        self._entries[word] = payload
+        self._entries.move_to_end(word)
+        if payload is None:
+            self._negative_until[word] = time.monotonic() + self.negative_ttl_seconds
+        else:
+            self._negative_until.pop(word, None)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._negative_until.pop(evicted, None)
+
+    def _forget(self, word: str) -> None:
+        self._entries.pop(word, None)
+        self._negative_until.pop(word, None)
+
+    async def _persist(self, word: str, payload: dict[str, Any], existing: Vocab | None, session: AsyncSession) -> None:
+        repo = VocabRepository(session)
+        try:
+            if existing is None:
+                await repo.create_vocab(
+                    word=word,
+                    definition=payload["definition"],
+                    audio_url=payload["audio_url"],
+                    phonetic=payload["phonetic"],
+                )
+            else:
+                await repo.update_vocab_details(
+                    existing,
+                    definition=payload["definition"],
+                    audio_url=payload["audio_url"],
+                    phonetic=payload["phonetic"],
+                )
+        except Exception as exc:
+            # The lookup itself succeeded; the next cold start just goes upstream again
+            await session.rollback()
+            logger.warning(f"Could not store dictionary entry '{word}': {exc}")
+
+
+def _vocab_payload(vocab: Vocab) -> dict[str, Any]:
+    return {
+        "word": vocab.word,
+        "definition": vocab.definition or {},
+        "audio_url": vocab.audio_url,
+        "phonetic": vocab.phonetic,
+    }
+
+
+# Singleton instance
+_dictionary_cache: DictionaryCache | None = None
+
+
+def get_dictionary_cache() -> DictionaryCache:
+    global _dictionary_cache
+    if _dictionary_cache is None:
+        _dictionary_cache = DictionaryCache(
+            max_entries=settings.dictionary_cache_max_entries,
+            negative_ttl_seconds=settings.dictionary_negative_ttl_seconds,
+        )
+    return _dictionary_cache
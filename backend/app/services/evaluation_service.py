@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from services.audio_utils import load_audio_from_bytes
+import numpy as np
+from services.audio_utils import load_audio_from_bytes, trim_silence
 from services.score_mapper import map_raw_score_to_10
 from ml_models.wav2vec_scorer import extract_pronunciation_errors
 
@@ -7,10 +9,36 @@ logger = logging.getLogger(__name__)
 
 
 class PronunciationEvaluationService:
-    def __init__(self, scorer):
+    def __init__(self, scorer, engine=None):
         self.scorer = scorer
+        self.engine = engine
 
     def evaluate(self, audio_bytes: bytes, reference: str):
+        audio = self._load_audio(audio_bytes, reference)
+        if audio is None:
+            return self._no_speech_result(reference)
+
+        raw = self.scorer.score_pronunciation(audio, reference)
+        return self._build_result(raw)
+
+    async def evaluate_async(self, audio_bytes: bytes, reference: str):
+        """Same as `evaluate`, but decoding and inference run off the event loop.
+
+        Inference goes through the batching engine when one is configured.
+        """
+        audio = await asyncio.to_thread(self._load_audio, audio_bytes, reference)
+        if audio is None:
+            return self._no_speech_result(reference)
+
+        if self.engine is not None:
+            raw = await self.engine.score(audio, reference)
+        else:
+            raw = await asyncio.to_thread(self.scorer.score_pronunciation, audio, reference)
+
+        return self._build_result(raw)
+
+    def _load_audio(self, audio_bytes: bytes, reference: str) -> np.ndarray | None:
+        """Decode and trim silence. Returns None when the clip has no speech."""
         logger.info(f"Evaluating pronunciation for: '{reference}'")
         logger.info(f"Audio size: {len(audio_bytes)} bytes")
 
@@ -19,16 +47,24 @@ class PronunciationEvaluationService:
             f"Loaded audio shape: {audio.shape}, duration: {len(audio)/16000:.2f}s"
         )
 
-        # Check if audio is too quiet or empty
-        import numpy as np
+        trimmed = trim_silence(audio)
+        if trimmed.is_silent:
+            logger.warning("No speech detected, skipping inference")
+            return None
 
-        audio_max = np.max(np.abs(audio))
-        logger.info(f"Audio max amplitude: {audio_max}")
+        logger.info(
+            f"Trimmed silence: kept {len(trimmed.audio)/16000:.2f}s, "
+            f"saved {trimmed.samples_saved} samples"
+        )
+        return trimmed.audio
 
-        if audio_max < 0.01:
-            logger.warning("Audio appears to be very quiet or silent")
+    def _no_speech_result(self, reference: str):
+        # Same payload shape as a real attempt where nothing was recognized
+        result = self._build_result(self.scorer.score_transcript("", reference))
+        result["no_speech"] = True
+        return result
 
-        raw = self.scorer.score_pronunciation(audio, reference)
+    def _build_result(self, raw: dict):
         logger.info(
             f"Raw score: {raw['overall_score']}, predicted: '{raw['predicted_text']}'"
         )
@@ -43,4 +79,5 @@ class PronunciationEvaluationService:
             "errors": extract_pronunciation_errors(raw["word_scores"]),
             "predicted_text": raw["predicted_text"],
             "reference_text": raw["reference_text"],
+            "no_speech": False,
         }
@@ -0,0 +1,129 @@
+"""
+In-process feedback jobs for the two-phase pronunciation assess.
+
+The assessment is returned as soon as it is scored; the LLM feedback keeps
+generating in a background task. Clients poll the job, or subscribe and get
+the chunks produced so far replayed followed by the live ones.
+Finished jobs are kept for `ttl_seconds` and then dropped.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class FeedbackJob:
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = PENDING
+        self.parts: List[str] = []
+        self.error: Optional[str] = None
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def feedback(self) -> Optional[str]:
+        return "".join(self.parts) if self.status == DONE else None
+
+    def append(self, chunk: str) -> None:
+        self.parts.append(chunk)
+        self._notify()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.status = FAILED if error else DONE
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake current waiters, later waiters block on a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def chunks(self) -> AsyncIterator[str]:
+        """Replay chunks produced so far, then follow until the job finishes"""
+        sent = 0
+        while True:
+            while sent < len(self.parts):
+                yield self.parts[sent]
+                sent += 1
+            if self.status != PENDING:
+                return
+            await self._changed.wait()
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "feedback": self.feedback,
+            "error": self.error,
+        }
+
+
+class FeedbackJobStore:
+    def __init__(self, ttl_seconds: float = 600):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, FeedbackJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def completed(self, feedback: str) -> FeedbackJob:
+        """Register a job whose feedback is already known (templates, no speech)"""
+        job = self._new_job()
+        job.append(feedback)
+        job.finish()
+        return job
+
+    def submit(self, chunks: AsyncIterator[str]) -> FeedbackJob:
+        """Start consuming `chunks` in the background and return the pending job"""
+        job = self._new_job()
+        task = asyncio.create_task(self._run(job, chunks))
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[FeedbackJob]:
+        self._evict_expired()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        return {
+            "jobs": len(self._jobs),
+            "pending": sum(1 for j in self._jobs.values() if j.status == PENDING),
+            "running_tasks": len(self._tasks),
+        }
+
+    def _new_job(self) -> FeedbackJob:
+        self._evict_expired()
+        job = FeedbackJob(uuid.uuid4().hex)
+        self._jobs[job.id] = job
+        return job
+
+    async def _run(self, job: FeedbackJob, chunks: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in chunks:
+                job.append(chunk)
+        except Exception as e:
+            logger.error(f"Feedback job {job.id} failed: {e}")
+            job.finish(error=str(e))
+        else:
+            job.finish()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -1,8 +1,59 @@
+from typing import AsyncIterator, Optional
+
+# Canned feedback for strong attempts, same "Nhận xét / Mẹo 1 / Mẹo 2" layout
+# as the LLM prompt asks for. Keyed by rounded score; `{words}` lists the
+# words that still had (minor) issues.
+_PRAISE = {
+    10: "Nhận xét: Xuất sắc! Bạn phát âm \"{reference}\" rất chuẩn và tự nhiên.",
+    9: "Nhận xét: Rất tốt! Phát âm của bạn gần như hoàn hảo.",
+    8: "Nhận xét: Tốt lắm! Bạn phát âm rõ ràng, chỉ còn vài điểm nhỏ.",
+}
+_TIPS_CLEAN = (
+    "Mẹo 1: Thử nói nhanh hơn một chút mà vẫn giữ rõ từng âm cuối.\n"
+    "Mẹo 2: Chú ý ngữ điệu lên xuống để câu nói tự nhiên như người bản xứ."
+)
+_TIPS_WITH_ERRORS = (
+    "Mẹo 1: Nghe lại và luyện riêng {words}, chú ý khẩu hình miệng.\n"
+    "Mẹo 2: Ghép lại cả câu và nói chậm, nhấn đúng trọng âm của từng từ."
+)
+
+
 class FeedbackService:
-    def __init__(self, llm):
+    def __init__(self, llm, template_min_score: float = 8.0):
         self.llm = llm
+        self.template_min_score = template_min_score
+
+    async def generate(self, assessment: dict):
+        cached = self.template_feedback(assessment)
+        if cached is not None:
+            return cached
+        return await self.llm.generate(self._build_prompt(assessment))
+
+    async def stream(self, assessment: dict) -> AsyncIterator[str]:
+        cached = self.template_feedback(assessment)
+        if cached is not None:
+            yield cached
+            return
+        async for chunk in self.llm.stream(self._build_prompt(assessment)):
+            yield chunk
+
+    def template_feedback(self, assessment: dict) -> Optional[str]:
+        """Canned feedback for high scores, None when the LLM should answer."""
+        score = assessment.get("score", 0)
+        if score < self.template_min_score:
+            return None
+
+        bucket = max(k for k in _PRAISE if k <= max(8, round(score)))
+        praise = _PRAISE[bucket].format(reference=assessment.get("reference_text", ""))
+
+        words = [e.get("word", "") for e in assessment.get("errors", []) if e.get("word")]
+        if words:
+            tips = _TIPS_WITH_ERRORS.format(words=", ".join(f"'{w}'" for w in words[:3]))
+        else:
+            tips = _TIPS_CLEAN
+        return f"{praise}\n{tips}"
 
-    def generate(self, assessment: dict):
+    def _build_prompt(self, assessment: dict) -> str:
         # Format errors for better feedback
         errors_text = ""
         for error in assessment.get("errors", []):
@@ -29,7 +80,7 @@ class FeedbackService:
         predicted_text = assessment.get("predicted_text", "")
         reference_text = assessment.get("reference_text", "")
 
-        prompt = f"""
+        return f"""
 You are an English pronunciation coach.
 
 Target text: "{reference_text}"
@@ -53,4 +104,3 @@ Nhận xét:
 Mẹo 1:
 Mẹo 2:
 """
-        return self.llm.generate(prompt)
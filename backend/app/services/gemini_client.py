@@ -1,15 +1,193 @@
-from google import genai
-import os
+"""
+Async LLM client shared by the chat, practice-material and feedback services.
 
-class GeminiClient:
-    def __init__(self):
-        self.client = genai.Client(
-            api_key=os.environ["GEMINI_API_KEY"]
-        )
+- one process-wide client, so the underlying HTTP connection pool is reused
+- per-call timeout, bounded concurrency (semaphore)
+- retry with exponential backoff and full jitter on transient errors
+- pluggable backend: Gemini in production, FakeLLMBackend for local runs/tests
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    pass
+
+
+class LLMBackend(ABC):
+    @abstractmethod
+    async def generate(self, prompt: str) -> str:
+        ...
 
-    def generate(self, prompt: str) -> str:
-        resp = self.client.models.generate_content(
-            model="models/gemini-2.5-flash-lite",
-            contents=prompt
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        # Backends without native streaming deliver the whole reply as one chunk
+        yield await self.generate(prompt)
+
+    def is_retryable(self, exc: Exception) -> bool:
+        return isinstance(exc, asyncio.TimeoutError)
+
+
+class GenaiBackend(LLMBackend):
+    """google-genai async API; one Client keeps one pooled HTTP client"""
+
+    def __init__(self, api_key: str, model: str):
+        from google import genai
+
+        self.model = model
+        self.client = genai.Client(api_key=api_key)
+
+    async def generate(self, prompt: str) -> str:
+        resp = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
         )
         return resp.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        chunks = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=prompt,
+        )
+        async for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
+
+    def is_retryable(self, exc: Exception) -> bool:
+        import httpx
+        from google.genai import errors
+
+        if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+            return True
+        if isinstance(exc, errors.APIError):
+            return getattr(exc, "code", None) in _RETRYABLE_STATUS
+        return False
+
+
+class FakeLLMBackend(LLMBackend):
+    """Offline backend: answers from `handler(prompt)` without any network call"""
+
+    def __init__(self, handler: Optional[Callable[[str], str]] = None, delay: float = 0.0):
+        self.handler = handler or (lambda prompt: "[fake-llm] " + prompt.strip()[:80])
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def generate(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.handler(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        text = await self.generate(prompt)
+        for i, word in enumerate(text.split(" ")):
+            yield word if i == 0 else " " + word
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        backend: Optional[LLMBackend] = None,
+        timeout: float = 30.0,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
+        self.backend = backend or _default_backend()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def generate(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                # Hold a slot only while the request is in flight, not while backing off
+                async with self._semaphore:
+                    return await asyncio.wait_for(
+                        self.backend.generate(prompt), timeout=self.timeout
+                    )
+            except Exception as exc:
+                if not self.backend.is_retryable(exc):
+                    raise
+                if attempt >= self.max_retries:
+                    raise LLMUnavailableError(f"LLM call failed after {attempt + 1} attempts") from exc
+
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                logger.warning(
+                    "LLM call failed (%s), retry %s/%s in %.2fs",
+                    type(exc).__name__, attempt + 1, self.max_retries, delay,
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as the model produces them.
+
+        Failures before the first chunk are retried like `generate`; once
+        text has been sent downstream the error is raised as-is. `timeout`
+        applies to each wait for the next chunk.
+        """
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with self._semaphore:
+                    chunks = self.backend.stream(prompt).__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        yield chunk
+            except Exception as exc:
+                if started or not self.backend.is_retryable(exc):
+                    raise
+                if attempt >= self.max_retries:
+                    raise LLMUnavailableError(f"LLM stream failed after {attempt + 1} attempts") from exc
+
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                logger.warning(
+                    "LLM stream failed (%s), retry %s/%s in %.2fs",
+                    type(exc).__name__, attempt + 1, self.max_retries, delay,
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+def _default_backend() -> LLMBackend:
+    if settings.llm_backend == "fake":
+        logger.info("Using fake LLM backend (LLM_BACKEND=fake)")
+        return FakeLLMBackend()
+    return GenaiBackend(api_key=settings.gemini_api_key, model=settings.gemini_model)
+
+
+# Singleton instance
+_gemini_client: Optional[GeminiClient] = None
+
+
+def get_gemini_client() -> GeminiClient:
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = GeminiClient(
+            timeout=settings.llm_timeout_seconds,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+        )
+    return _gemini_client
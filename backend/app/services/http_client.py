@@ -0,0 +1,220 @@
+"""
+Application-wide outbound HTTP client.
+
+One httpx.AsyncClient for the whole process (created in the main.py
+lifespan), so upstream calls reuse keep-alive connections instead of paying
+TCP + TLS setup every time. On top of it, per upstream host:
+- a concurrency cap (semaphore)
+- a circuit breaker: after `failure_threshold` consecutive failures the host
+  is failed fast for `reset_timeout` seconds, then one trial request decides
+  whether to close the circuit again
+- a latency histogram (request + response body, in milliseconds)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.config import settings
+from core.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Up to well past the request timeout (HTTP_TIMEOUT_SECONDS, 10s by default)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without touching the network while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_running:
+            # Let exactly one request probe the host
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; True when this one (re)opened the circuit"""
+        self.failures += 1
+        self._trial_running = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        self._trial_running = False
+
+
+class _HostState:
+    def __init__(self, max_concurrency: int, failure_threshold: int, reset_timeout: float):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyHistogram(LATENCY_BUCKETS_MS)
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+
+
+class HttpClient:
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_concurrency: int = 16,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        http2: bool = True,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, _HostState] = {}
+        self.http2 = http2 and _h2_available()
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            http2=self.http2,
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the host's concurrency cap and circuit breaker.
+
+        Transport errors and 5xx responses count as failures; any other
+        response (including 404) counts as a healthy host.
+        """
+        host = urlsplit(url).netloc
+        state = self._host(host)
+
+        if not state.breaker.allow():
+            state.rejected += 1
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        async with state.semaphore:
+            state.requests += 1
+            started = time.perf_counter()
+            try:
+                resp = await self.client.request(method, url, **kwargs)
+            except httpx.HTTPError:
+                self._failed(host, state)
+                raise
+            except BaseException:
+                # Cancelled: says nothing about the host, but free a half-open trial
+                state.breaker.release_trial()
+                raise
+            finally:
+                state.latency.observe((time.perf_counter() - started) * 1000)
+
+        if resp.status_code >= 500:
+            self._failed(host, state)
+        else:
+            state.breaker.record_success()
+        return resp
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict:
+        return {
+            "http2": self.http2,
+            "hosts": {
+                host: {
+                    "circuit": state.breaker.state,
+                    "consecutive_failures": state.breaker.failures,
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "rejected": state.rejected,
+                    "latency": state.latency.snapshot(),
+                }
+                for host, state in self._hosts.items()
+            },
+        }
+
+    def _failed(self, host: str, state: _HostState) -> None:
+        state.errors += 1
+        if state.breaker.record_failure():
+            logger.warning(
+                f"Circuit open for {host} after {state.breaker.failures} consecutive failures, "
+                f"retrying in {state.breaker.reset_timeout:.0f}s"
+            )
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(
+                self.per_host_concurrency, self.failure_threshold, self.reset_timeout
+            )
+        return state
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Singleton instance, owned by the main.py lifespan
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    global _http_client
+    if _http_client is None:
+        # Outside the app lifespan (scripts, jobs): create on first use
+        _http_client = HttpClient(
+            timeout=settings.http_timeout_seconds,
+            max_connections=settings.http_max_connections,
+            per_host_concurrency=settings.http_per_host_concurrency,
+            failure_threshold=settings.http_breaker_failure_threshold,
+            reset_timeout=settings.http_breaker_reset_seconds,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,210 @@
+"""
+In-memory all-time leaderboards (xp and streak).
+
+Each board is a list of (-score, user_id) kept sorted with bisect, the same
+order as `rank() OVER (ORDER BY score DESC, user_id ASC)`:
+- a user's rank is one binary search, a page is a slice
+- an update is a binary search plus one list insert/delete (a memmove)
+
+The boards are loaded once from the database, then kept current by the
+UserRepository writes that change xp, streak, username or board membership.
+Those writes only queue the change on the session; it is applied after the
+session commits (and dropped on rollback), so the boards never show
+uncommitted values. Each worker has its own copy, so the boards are also
+reloaded every `resync_seconds` to pick up writes made by other workers.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.leaderboard_snapshot import LeaderboardType
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "leaderboard_updates"
+
+
+@dataclass
+class BoardEntry:
+    user_id: int
+    username: Optional[str]
+    xp: int
+    streak: int
+
+    def score(self, lb_type: LeaderboardType) -> int:
+        return self.xp if lb_type == LeaderboardType.xp else self.streak
+
+
+class _SortedBoard:
+    def __init__(self):
+        self.keys: List[Tuple[int, int]] = []
+
+    def load(self, keys: Iterable[Tuple[int, int]]) -> None:
+        self.keys = sorted(keys)
+
+    def add(self, key: Tuple[int, int]) -> None:
+        bisect.insort(self.keys, key)
+
+    def remove(self, key: Tuple[int, int]) -> None:
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def position(self, key: Tuple[int, int]) -> int:
+        return bisect.bisect_left(self.keys, key)
+
+    def position_after(self, key: Tuple[int, int]) -> int:
+        return bisect.bisect_right(self.keys, key)
+
+
+class LeaderboardEngine:
+    def __init__(self, resync_seconds: float = 300):
+        self.resync_seconds = resync_seconds
+        self._entries: Dict[int, BoardEntry] = {}
+        self._boards = {t: _SortedBoard() for t in LeaderboardType}
+        self._loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        # Changes committed while a reload is reading the database; re-applied
+        # on top of the loaded rows, which may predate them
+        self._during_load: Optional[List[Tuple[str, int, dict]]] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.resync_seconds
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[List[BoardEntry]]]) -> None:
+        if self.fresh:
+            return
+        async with self._load_lock:
+            if self.fresh:
+                return
+            self._during_load = []
+            try:
+                entries = await loader()
+                self._load(entries)
+                for op, user_id, fields in self._during_load:
+                    self._apply(op, user_id, fields)
+                self._loaded_at = time.monotonic()
+                logger.info(f"Leaderboard loaded: {len(entries)} learners")
+            finally:
+                self._during_load = None
+
+    def invalidate(self) -> None:
+        """Reload from the database on the next read (membership changed)"""
+        self._loaded_at = None
+
+    def apply(self, op: str, user_id: int, fields: dict) -> None:
+        if op == "invalidate":
+            self.invalidate()
+            return
+        if self._during_load is not None:
+            self._during_load.append((op, user_id, fields))
+        self._apply(op, user_id, fields)
+
+    def page(self, lb_type: LeaderboardType, offset: int, limit: int) -> List[Tuple[int, BoardEntry]]:
+        """(rank, entry) pairs of one page"""
+        keys = self._boards[lb_type].keys[offset:offset + limit]
+        return [(offset + i + 1, self._entries[user_id]) for i, (_, user_id) in enumerate(keys)]
+
+    def page_after(
+        self, lb_type: LeaderboardType, score: int, user_id: int, limit: int
+    ) -> List[Tuple[int, BoardEntry]]:
+        """Page following the entry (score, user_id), even if that entry has since moved"""
+        return self.page(lb_type, self._boards[lb_type].position_after((-score, user_id)), limit)
+
+    def rank_of(self, user_id: int, lb_type: LeaderboardType) -> Optional[Tuple[int, BoardEntry]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        return self._boards[lb_type].position(self._key(entry, lb_type)) + 1, entry
+
+    def stats(self) -> Dict:
+        return {
+            "learners": len(self._entries),
+            "loaded_seconds_ago": (
+                round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+            ),
+        }
+
+    @staticmethod
+    def _key(entry: BoardEntry, lb_type: LeaderboardType) -> Tuple[int, int]:
+        return -entry.score(lb_type), entry.user_id
+
+    def _load(self, entries: List[BoardEntry]) -> None:
+        self._entries = {e.user_id: e for e in entries}
+        for lb_type, board in self._boards.items():
+            board.load(self._key(e, lb_type) for e in entries)
+
+    def _apply(self, op: str, user_id: int, fields: dict) -> None:
+        entry = self._entries.get(user_id)
+        if op == "add" and entry is None:
+            entry = self._entries[user_id] = BoardEntry(
+                user_id=user_id,
+                username=fields.get("username"),
+                xp=int(fields.get("xp") or 0),
+                streak=int(fields.get("streak") or 0),
+            )
+            for lb_type, board in self._boards.items():
+                board.add(self._key(entry, lb_type))
+            return
+        if entry is None:
+            # Not on the boards (not a learner, banned, or not loaded yet)
+            return
+
+        if op == "remove":
+            for lb_type, board in self._boards.items():
+                board.remove(self._key(entry, lb_type))
+            del self._entries[user_id]
+            return
+
+        if "username" in fields:
+            entry.username = fields["username"]
+        for lb_type, attr in ((LeaderboardType.xp, "xp"), (LeaderboardType.streak, "streak")):
+            if attr not in fields:
+                continue
+            board = self._boards[lb_type]
+            board.remove(self._key(entry, lb_type))
+            setattr(entry, attr, int(fields[attr] or 0))
+            board.add(self._key(entry, lb_type))
+
+
+# Singleton instance
+_engine: Optional[LeaderboardEngine] = None
+
+
+def get_leaderboard_engine() -> LeaderboardEngine:
+    global _engine
+    if _engine is None:
+        _engine = LeaderboardEngine(resync_seconds=settings.leaderboard_resync_seconds)
+    return _engine
+
+
+def queue_leaderboard_update(session, op: str, user_id: int, **fields) -> None:
+    """Apply a board change once `session` commits.
+
+    op: "set" (xp / streak / username), "add" (new learner), "remove"
+    (banned or deleted) or "invalidate" (membership changed: reload).
+    """
+    session.info.setdefault(_PENDING_KEY, []).append((op, user_id, fields))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        engine = get_leaderboard_engine()
+        for op, user_id, fields in pending:
+            engine.apply(op, user_id, fields)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,58 +1,47 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Callable
 
-from sqlalchemy import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from models.leaderboard_snapshot import LeaderboardSnapshot, LeaderboardType
-from repositories.leaderboardRepository import LeaderboardPeriod, LeaderboardRepository
+from models.leaderboard_snapshot import LeaderboardType
+from repositories.leaderboardRepository import LeaderboardRepository
 
 
 logger = logging.getLogger(__name__)
 
 
 class LeaderboardSnapshotJob:
-    def __init__(self, session_factory: Callable[[], AsyncSession]):
+    """Store the day's all-time ranks (used for `rank_change`).
+
+    Each board is copied with a single INSERT ... SELECT into the day's
+    partition of leaderboard_snapshots; partitions older than
+    `retention_days` are dropped.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], retention_days: int = 30):
         self._session_factory = session_factory
+        self.retention_days = retention_days
 
-    async def run(self, snapshot_date: date | None = None) -> None:
+    async def run(self, snapshot_date: date | None = None) -> dict[str, int]:
         date_value = snapshot_date or datetime.now(timezone.utc).date()
         logger.info("LeaderboardSnapshotJob started (snapshot_date=%s)", date_value)
 
+        stats: dict[str, int] = {}
         async with self._session_factory() as session:
             repo = LeaderboardRepository(session)
+            await repo.prepare_snapshot_partition(date_value)
             for lb_type in (LeaderboardType.xp, LeaderboardType.streak):
-                rows = await repo.compute_full_rankings(lb_type=lb_type, period=LeaderboardPeriod.all)
-                await self._store(session, lb_type, date_value, rows)
-
-        logger.info("LeaderboardSnapshotJob finished (snapshot_date=%s)", date_value)
-
-    async def _store(
-        self,
-        session: AsyncSession,
-        lb_type: LeaderboardType,
-        snapshot_date: date,
-        rows: list[tuple[int, int]],
-    ) -> None:
-        await session.exec(
-            delete(LeaderboardSnapshot).where(
-                (LeaderboardSnapshot.type == lb_type)
-                & (LeaderboardSnapshot.snapshot_date == snapshot_date)
+                stats[lb_type.value] = await repo.store_snapshot(lb_type, date_value)
+            await session.commit()
+
+            dropped = await repo.drop_snapshot_partitions_before(
+                date_value - timedelta(days=self.retention_days)
             )
-        )
-
-        session.add_all(
-            [
-                LeaderboardSnapshot(
-                    user_id=user_id,
-                    type=lb_type,
-                    rank=rank,
-                    snapshot_date=snapshot_date,
-                )
-                for user_id, rank in rows
-            ]
-        )
-        await session.commit()
+            await session.commit()
+
+        stats["dropped_partitions"] = len(dropped)
+        logger.info("LeaderboardSnapshotJob finished (snapshot_date=%s) %s", date_value, stats)
+        return stats
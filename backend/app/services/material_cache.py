@@ -0,0 +1,150 @@
+"""
+Pooled cache for generated pronunciation practice material.
+
+Each (mode, level, topic) key owns a pool of LLM-generated items. Requests
+draw a random sample of `count` items from the pool, and every item can be
+served `max_serves` times before it is retired. When a pool drops below
+`low_watermark`, or outlives `ttl_seconds`, it is refilled in the
+background while the current items keep being served. Only a cold key (no
+pool yet, or not enough items for the requested count) waits for the LLM,
+and concurrent requests for the same cold key share one generation call.
+Keys are evicted least-recently-used beyond `max_keys`.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from services.pronunciation_service import PracticeService
+
+logger = logging.getLogger(__name__)
+
+MaterialKey = Tuple[str, str, str]
+
+
+class _Pool:
+    def __init__(self):
+        self.items: List[Dict] = []
+        self.serves: Dict[str, int] = {}
+        self.refreshed_at = 0.0
+        self.refill: Optional[asyncio.Task] = None
+
+
+class MaterialCache:
+    def __init__(
+        self,
+        practice: PracticeService,
+        pool_size: int = 30,
+        low_watermark: int = 10,
+        max_serves: int = 5,
+        ttl_seconds: float = 3600,
+        max_keys: int = 256,
+    ):
+        self.practice = practice
+        self.pool_size = pool_size
+        self.low_watermark = low_watermark
+        self.max_serves = max_serves
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._pools: "OrderedDict[MaterialKey, _Pool]" = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+
+    async def get(self, mode: str, count: int, level: str, topic: str) -> List[Dict]:
+        key = (mode, level.strip().lower(), topic.strip().lower())
+        pool = self._pool(key)
+
+        if len(pool.items) < count:
+            # Cold key: nothing (or too little) to serve, wait for a refill
+            self.misses += 1
+            # Shielded: a cancelled waiter (client went away) must not cancel
+            # the refill shared by every other waiter on this key
+            await asyncio.shield(self._ensure_refill(key, pool, batch=max(self.pool_size, count)))
+        else:
+            self.hits += 1
+            expired = time.monotonic() - pool.refreshed_at > self.ttl_seconds
+            if expired or len(pool.items) - count < self.low_watermark:
+                self._ensure_refill(key, pool, batch=self.pool_size, replace=expired)
+
+        return self._take(pool, count)
+
+    def stats(self) -> Dict:
+        return {
+            "keys": len(self._pools),
+            "items": sum(len(p.items) for p in self._pools.values()),
+            "refilling": sum(1 for p in self._pools.values() if p.refill is not None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "llm_calls": self.llm_calls,
+        }
+
+    def _pool(self, key: MaterialKey) -> _Pool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool()
+            while len(self._pools) > self.max_keys:
+                # An in-flight refill of an evicted key still finishes for its waiters
+                self._pools.popitem(last=False)
+        else:
+            self._pools.move_to_end(key)
+        return pool
+
+    def _take(self, pool: _Pool, count: int) -> List[Dict]:
+        picked = random.sample(pool.items, min(count, len(pool.items)))
+        for item in picked:
+            text = item["text"]
+            pool.serves[text] = pool.serves.get(text, 0) + 1
+            if pool.serves[text] >= self.max_serves:
+                pool.items.remove(item)
+                del pool.serves[text]
+        return picked
+
+    def _ensure_refill(self, key: MaterialKey, pool: _Pool, batch: int, replace: bool = False) -> asyncio.Task:
+        """Start a refill for `key` unless one is already running; returns the task"""
+        if pool.refill is None:
+            task = asyncio.create_task(self._refill(key, pool, batch, replace))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            pool.refill = task
+        return pool.refill
+
+    async def _refill(self, key: MaterialKey, pool: _Pool, batch: int, replace: bool) -> None:
+        mode, level, topic = key
+        try:
+            self.llm_calls += 1
+            if mode == "word":
+                raw = await self.practice.generate_words(batch, level, topic)
+                fresh = [{"type": "word", "text": w["word"]} for w in _as_list(raw) if w.get("word")]
+            else:
+                raw = await self.practice.generate_sentences(batch, level, topic)
+                fresh = [{"type": "sentence", "text": s["sentence"]} for s in _as_list(raw) if s.get("sentence")]
+        except Exception as e:
+            logger.error(f"Material refill for {key} failed: {e}")
+            if not pool.items:
+                raise
+            return
+        finally:
+            pool.refill = None
+
+        if replace and fresh:
+            pool.items, pool.serves = [], {}
+        limit = max(self.pool_size, batch)
+        seen = {item["text"].lower() for item in pool.items}
+        for item in fresh:
+            if item["text"].lower() not in seen and len(pool.items) < limit:
+                seen.add(item["text"].lower())
+                pool.items.append(item)
+        pool.refreshed_at = time.monotonic()
+        logger.info(f"Material pool {key} refilled: {len(pool.items)} items")
+
+
+def _as_list(raw) -> List[Dict]:
+    # The LLM sometimes answers a single object instead of an array
+    if isinstance(raw, dict):
+        return [raw]
+    return [item for item in raw if isinstance(item, dict)]
@@ -0,0 +1,127 @@
+"""
+Token-budgeted chat prompts.
+
+prompt = static prefix (built once) + rolling summary + recent turns + new message
+
+- turns not covered by the summary are added newest-first until
+  `token_budget` is used up, so the prompt size stays roughly constant
+  however long the conversation gets
+- turns older than the last `recent_turns` are folded into the session
+  summary by an extra LLM call, only once every `summary_every` turns
+- token counts are estimated (~4 characters per token); no tokenizer needed
+"""
+
+import logging
+from typing import Dict, List
+
+from services.conversation_sessions import ConversationSession
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+_SUMMARY_PROMPT = """
+Summarize this conversation between a language learner and the tutor Katbot
+in at most {max_words} words. Keep what matters for continuing it: the
+learner's name, level, goals, topics discussed and recurring mistakes.
+Write in the language the learner mostly uses.
+
+Previous summary:
+{summary}
+
+New messages:
+{messages}
+
+Summary:
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _format(message: Dict[str, str]) -> str:
+    return f"{message['role'].capitalize()}: {message['content']}"
+
+
+class ChatPromptBuilder:
+    def __init__(
+        self,
+        prefix: str,
+        token_budget: int = 1500,
+        recent_turns: int = 4,
+        summary_every: int = 6,
+        summary_max_words: int = 120,
+    ):
+        # `prefix` is the static instruction block, reused verbatim every call
+        self.prefix = prefix
+        self.prefix_tokens = estimate_tokens(prefix)
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.summary_every = summary_every
+        self.summary_max_words = summary_max_words
+
+    def build(self, session: ConversationSession, message: str) -> str:
+        tail = f"\nUser: {message}\nAssistant:\n"
+        summary = (
+            f"\nSummary of the earlier conversation:\n{session.summary}\n" if session.summary else ""
+        )
+        budget = self.token_budget - self.prefix_tokens - estimate_tokens(tail) - estimate_tokens(summary)
+
+        # Newest first until the budget runs out
+        lines: List[str] = []
+        for msg in reversed(self._since_summary(session)):
+            line = _format(msg)
+            cost = estimate_tokens(line)
+            if cost > budget:
+                if not lines and budget > 0:
+                    # Keep at least the tail of the last message
+                    lines.append("..." + line[-budget * CHARS_PER_TOKEN:])
+                break
+            lines.append(line)
+            budget -= cost
+        lines.reverse()
+
+        history = "\nConversation so far:\n" + "\n".join(lines) + "\n" if lines else ""
+        return self.prefix + summary + history + tail
+
+    def needs_summary(self, session: ConversationSession) -> bool:
+        return len(self._unsummarized(session)) >= self.summary_every * 2
+
+    def summary_prompt(self, session: ConversationSession) -> str:
+        return _SUMMARY_PROMPT.format(
+            max_words=self.summary_max_words,
+            summary=session.summary or "(none)",
+            messages="\n".join(_format(m) for m in self._unsummarized(session)),
+        )
+
+    async def refresh_summary(self, session: ConversationSession, llm) -> bool:
+        """Fold turns that left the recent window into the summary"""
+        pending = self._unsummarized(session)
+        if not pending:
+            return False
+        # Captured before the call: new turns may arrive while it runs
+        summarized_upto = session.message_count - self.recent_turns * 2
+        summary = await llm.generate(self.summary_prompt(session))
+        session.summary = summary.strip()
+        session.summarized_count = summarized_upto
+        logger.info(
+            f"Summarized {len(pending)} messages of conversation {session.key} "
+            f"(~{estimate_tokens(session.summary)} tokens)"
+        )
+        return True
+
+    def _since_summary(self, session: ConversationSession) -> List[Dict[str, str]]:
+        history = session.messages()
+        first_index = session.message_count - len(history)
+        return history[max(0, session.summarized_count - first_index):]
+
+    def _unsummarized(self, session: ConversationSession) -> List[Dict[str, str]]:
+        """Messages older than the recent window that are not in the summary yet"""
+        history = session.messages()
+        first_index = session.message_count - len(history)
+        end = session.message_count - self.recent_turns * 2
+        start = max(session.summarized_count, first_index)
+        if end <= start:
+            return []
+        return history[start - first_index:end - first_index]
@@ -8,7 +8,7 @@ class PracticeService:
     def __init__(self, llm: GeminiClient):
         self.llm = llm
 
-    def generate_words(self, count: int, level: str, topic: str) -> Dict:
+    async def generate_words(self, count: int, level: str, topic: str) -> Dict:
         prompt = f"""
 You are an English teacher.
 
@@ -26,9 +26,9 @@ Respond ONLY in valid JSON array:
   {{ "word": "..." }}
 ]
 """
-        return self._call_llm(prompt)
+        return await self._call_llm(prompt)
 
-    def generate_sentences(self, count: int, level: str, topic: str) -> Dict:
+    async def generate_sentences(self, count: int, level: str, topic: str) -> Dict:
         prompt = f"""
 You are an English pronunciation coach.
 
@@ -40,13 +40,16 @@ Constraints:
 - 6-12 words
 - Natural spoken English
 
-Return ONLY valid JSON:
-{{"sentence": "...", "focus": "..."}}
+Return ONLY valid JSON array:
+[
+  {{"sentence": "...", "focus": "..."}},
+  {{"sentence": "...", "focus": "..."}}
+]
 """
-        return self._call_llm(prompt)
+        return await self._call_llm(prompt)
 
-    def _call_llm(self, prompt: str) -> Dict:
-        raw = self.llm.generate(prompt)
+    async def _call_llm(self, prompt: str) -> Dict:
+        raw = await self.llm.generate(prompt)
 
         cleaned = raw.strip()
 
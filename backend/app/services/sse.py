@@ -0,0 +1,25 @@
+"""
+Server-sent events helpers.
+"""
+
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one SSE frame; `data` is JSON-encoded on a single line"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx-style proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
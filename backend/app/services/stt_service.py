@@ -6,40 +6,35 @@ import logging
 import numpy as np
 from typing import Optional
 
+from ml_models.model_registry import DEFAULT_MODEL_ID, get_model_registry
+from services.audio_utils import trim_silence
+
 logger = logging.getLogger(__name__)
 
 
 class STTService:
     """Speech-to-Text service"""
 
-    def __init__(self):
-        self.processor = None
-        self.model = None
-        self._initialized = False
+    def __init__(self, model_id: str = DEFAULT_MODEL_ID):
+        self.model_id = model_id
+        self._registry = get_model_registry()
 
     def _ensure_initialized(self):
-        """Lazy load the model"""
-        if self._initialized:
-            return
-
+        """Lazy load the model (shared with Wav2VecScorer via the registry)"""
         try:
-            from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
-            import torch
-
-            model_id = "facebook/wav2vec2-base-960h"
-            logger.info(f"🔄 Loading STT model: {model_id}")
-
-            self.processor = Wav2Vec2Processor.from_pretrained(model_id)
-            self.model = Wav2Vec2ForCTC.from_pretrained(model_id)
-            self.model.eval()
-
-            self._initialized = True
-            logger.info("✅ STT model loaded")
-
+            return self._registry.get(self.model_id)
         except Exception as e:
             logger.error(f"Failed to load STT model: {e}")
             raise
 
+    @property
+    def processor(self):
+        return self._ensure_initialized().processor
+
+    @property
+    def model(self):
+        return self._ensure_initialized().model
+
     def transcribe(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
         """
         Transcribe audio to text
@@ -53,23 +48,30 @@ class STTService:
         """
         import torch
 
-        self._ensure_initialized()
+        loaded = self._ensure_initialized()
 
         if audio is None or len(audio) == 0:
             return ""
 
+        # Only the voiced span goes through the transformer
+        trimmed = trim_silence(audio, sample_rate)
+        if trimmed.is_silent:
+            logger.info("No speech detected, skipping transcription")
+            return ""
+        audio = trimmed.audio
+
         try:
             # Preprocess audio
-            inputs = self.processor(
+            inputs = loaded.processor(
                 audio, sampling_rate=sample_rate, return_tensors="pt", padding=True
             )
 
             # Get predictions
             with torch.no_grad():
-                logits = self.model(inputs.input_values).logits
+                logits = loaded.model(inputs.input_values).logits
 
             predicted_ids = torch.argmax(logits, dim=-1)
-            transcription = self.processor.batch_decode(predicted_ids)[0]
+            transcription = loaded.processor.batch_decode(predicted_ids)[0]
 
             logger.info(f"Transcribed: '{transcription}'")
             return transcription.strip()
@@ -79,6 +81,135 @@ class STTService:
             raise
 
 
+    def predict_ids(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
+        """Greedy CTC token id per ~20 ms frame (not yet collapsed)"""
+        import torch
+
+        loaded = self._ensure_initialized()
+        inputs = loaded.processor(audio, sampling_rate=sample_rate, return_tensors="pt")
+        with torch.no_grad():
+            logits = loaded.model(inputs.input_values).logits
+        return torch.argmax(logits, dim=-1)[0].numpy()
+
+    def decode_ids(self, ids: np.ndarray) -> str:
+        """Collapse repeats/blanks of frame-level ids into text"""
+        if len(ids) == 0:
+            return ""
+        return self._ensure_initialized().processor.decode(ids).strip()
+
+
+class StreamingTranscriber:
+    """
+    Incremental CTC transcription over audio that arrives in pieces.
+
+    Audio is cut into fixed chunks. Each chunk is run with `left_s` of already
+    committed audio before it and `right_s` of lookahead after it, and only
+    the frames that fall inside the chunk are kept. Frame ids of all chunks
+    are concatenated and decoded together, so words split across a chunk
+    boundary still collapse correctly.
+
+    Not thread-safe: one instance per connection, driven sequentially.
+    """
+
+    FRAME_SAMPLES = 320  # wav2vec2 conv stack stride at 16 kHz (20 ms)
+
+    def __init__(
+        self,
+        stt: STTService,
+        sample_rate: int = 16000,
+        chunk_s: float = 2.0,
+        left_s: float = 0.48,
+        right_s: float = 0.32,
+        max_s: float = 30.0,
+        speech_rms: float = 0.01,
+        end_silence_s: float = 0.7,
+    ):
+        self.stt = stt
+        self.sample_rate = sample_rate
+        self.chunk = self._frames_aligned(chunk_s)
+        self.left = self._frames_aligned(left_s)
+        self.right = self._frames_aligned(right_s)
+        self.max_samples = int(max_s * sample_rate)
+        self.speech_rms = speech_rms
+        self.end_silence = int(end_silence_s * sample_rate)
+        # Preallocated once; feed() copies into it instead of re-concatenating
+        self._storage = np.zeros(self.max_samples, dtype=np.float32)
+        self.reset()
+
+    def _frames_aligned(self, seconds: float) -> int:
+        frames = max(1, round(seconds * self.sample_rate / self.FRAME_SAMPLES))
+        return frames * self.FRAME_SAMPLES
+
+    def reset(self) -> None:
+        self._length = 0
+        self._committed = 0
+        self._ids: list = []
+        self._speech_started = False
+        self._text = ""
+
+    @property
+    def _buffer(self) -> np.ndarray:
+        return self._storage[: self._length]
+
+    @property
+    def buffered_seconds(self) -> float:
+        return self._length / self.sample_rate
+
+    def feed(self, samples: np.ndarray) -> None:
+        samples = samples[: self.max_samples - self._length]
+        if len(samples) == 0:
+            return
+        if not self._speech_started and _rms(samples) >= self.speech_rms:
+            self._speech_started = True
+        self._storage[self._length : self._length + len(samples)] = samples
+        self._length += len(samples)
+
+    def is_full(self) -> bool:
+        return self._length >= self.max_samples
+
+    def end_of_speech(self) -> bool:
+        """Speech was heard and the most recent `end_silence_s` is quiet"""
+        if not self._speech_started or len(self._buffer) < self.end_silence:
+            return False
+        return _rms(self._buffer[-self.end_silence:]) < self.speech_rms
+
+    def process_ready(self) -> Optional[str]:
+        """Transcribe every complete chunk. Returns the new partial text, or None."""
+        progressed = False
+        while self._committed + self.chunk + self.right <= len(self._buffer):
+            self._commit(self._committed + self.chunk, final=False)
+            progressed = True
+        return self._update_text() if progressed else None
+
+    def finish(self) -> str:
+        """Transcribe whatever is left and return the full transcript"""
+        if self._committed < len(self._buffer) and self._speech_started:
+            self._commit(len(self._buffer), final=True)
+        return self._update_text()
+
+    def _commit(self, end: int, final: bool) -> None:
+        start = max(0, self._committed - self.left)
+        window_end = len(self._buffer) if final else min(len(self._buffer), end + self.right)
+        window = self._buffer[start:window_end]
+        if len(window) < self.FRAME_SAMPLES * 2:
+            self._committed = end
+            return
+
+        ids = self.stt.predict_ids(window, self.sample_rate)
+        first = (self._committed - start) // self.FRAME_SAMPLES
+        last = len(ids) if final else (end - start) // self.FRAME_SAMPLES
+        self._ids.extend(ids[first:last].tolist())
+        self._committed = end
+
+    def _update_text(self) -> str:
+        self._text = self.stt.decode_ids(np.asarray(self._ids, dtype=np.int64))
+        return self._text
+
+
+def _rms(samples: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+
+
 # Singleton instance
 _stt_service: Optional[STTService] = None
 
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Key: sha256 of (lang, normalized text). Two tiers:
+- memory: LRU capped by total bytes
+- disk: <dir>/<key[:2]>/<key>.mp3, capped by total bytes, least recently
+  used files are deleted first; writes go to a temp file + os.replace so
+  readers never see a partial MP3
+
+The key doubles as the HTTP ETag: the same text and language always map to
+the same audio.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path(__file__).parent.parent / "tts_cache"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(text: str, lang: str) -> str:
+    return hashlib.sha256(f"{lang}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = Path(directory) if directory else _DEFAULT_DIR
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (size, last access); rebuilt from the directory at startup
+        self._disk: Dict[str, Tuple[int, float]] = {}
+        self._disk_bytes = 0
+        # key -> event set when the in-flight synthesis of that key finishes
+        self._inflight: Dict[str, threading.Event] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._scan_disk()
+
+    def get_or_create(self, text: str, lang: str, synthesize: Callable[[str, str], bytes]) -> Tuple[bytes, str]:
+        """Cached audio for (text, lang), calling `synthesize` once on a miss.
+
+        Concurrent misses for the same key wait for the first caller instead
+        of synthesizing again.
+        """
+        key = cache_key(text, lang)
+        while True:
+            audio = self.get(key)
+            if audio is not None:
+                return audio, key
+
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    done = self._inflight[key] = threading.Event()
+            if waiter is not None:
+                waiter.wait()
+                continue
+            break
+
+        try:
+            self.misses += 1
+            audio = synthesize(normalize_text(text), lang)
+            self.put(key, audio)
+            return audio, key
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            done.set()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+            on_disk = key in self._disk
+
+        if not on_disk:
+            return None
+        try:
+            audio = self._path(key).read_bytes()
+        except OSError:
+            with self._lock:
+                self._forget_disk(key)
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk[key] = (len(audio), time.time())
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        with self._lock:
+            self._remember(key, audio)
+        try:
+            self._write_atomic(key, audio)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed for {key}: {e}")
+            return
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = (len(audio), time.time())
+            self._disk_bytes += len(audio)
+            self._evict_disk()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.mp3"
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _write_atomic(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _forget_disk(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[0]
+
+    def _evict_disk(self) -> None:
+        if self._disk_bytes <= self.disk_max_bytes:
+            return
+        for key, _ in sorted(self._disk.items(), key=lambda item: item[1][1]):
+            if self._disk_bytes <= self.disk_max_bytes:
+                break
+            self._forget_disk(key)
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _scan_disk(self) -> None:
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*/*"):
+            if path.suffix == ".tmp":
+                # Left over from a write interrupted by a crash
+                path.unlink(missing_ok=True)
+                continue
+            if path.suffix != ".mp3":
+                continue
+            stat = path.stat()
+            self._disk[path.stem] = (stat.st_size, stat.st_mtime)
+            self._disk_bytes += stat.st_size
+        self._evict_disk()
+        logger.info(f"TTS cache: {len(self._disk)} files ({self._disk_bytes} bytes) in {self.directory}")
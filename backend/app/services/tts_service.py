@@ -3,18 +3,50 @@ Text-to-Speech Service using gTTS (Google Text-to-Speech)
 Free and doesn't require API key
 """
 
+import asyncio
 import io
 import logging
+import re
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
 from gtts import gTTS
 
+from services.tts_cache import TTSCache, cache_key
+
 logger = logging.getLogger(__name__)
 
+# End of sentence (., !, ?, …, CJK-style marks) followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?…。！？])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+
+def split_sentences(text: str, max_chars: int = 200) -> List[str]:
+    """Split text into sentence-sized segments for incremental synthesis.
+
+    Sentences longer than `max_chars` are split again at clause punctuation,
+    then at word boundaries; short neighbours are not merged so the first
+    segment (and the first audio) stays small.
+    """
+    segments: List[str] = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        pieces = [sentence] if len(sentence) <= max_chars else _CLAUSE_END.split(sentence)
+        for piece in pieces:
+            while len(piece) > max_chars:
+                cut = piece.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                segments.append(piece[:cut].strip())
+                piece = piece[cut:]
+            if piece.strip():
+                segments.append(piece.strip())
+    return [s for s in segments if s]
+
 
 class TTSService:
     """Text-to-Speech service using gTTS"""
 
-    def __init__(self, default_lang: str = "en"):
+    def __init__(self, default_lang: str = "en", cache: Optional[TTSCache] = None):
         self.default_lang = default_lang
+        self.cache = cache
 
     def synthesize(self, text: str, lang: str = None) -> bytes:
         """
@@ -27,11 +59,76 @@ class TTSService:
         Returns:
             Audio bytes in MP3 format
         """
+        return self.synthesize_with_key(text, lang)[0]
+
+    def synthesize_with_key(self, text: str, lang: str = None) -> Tuple[bytes, str]:
+        """Same as `synthesize`, also returning the content key (usable as ETag)"""
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+
+        lang = lang or self.default_lang
+        if self.cache is not None:
+            return self.cache.get_or_create(text, lang, self._synthesize)
+        return self._synthesize(text, lang), cache_key(text, lang)
+
+    async def stream(self, text: str, lang: str = None, max_concurrency: int = 3) -> AsyncIterator[bytes]:
+        """Yield MP3 audio sentence by sentence, in order.
+
+        Segments are synthesized concurrently (at most `max_concurrency` at a
+        time, each through the cache), so the first bytes are ready once the
+        first sentence is done. MP3 frames can be concatenated, so the
+        chunks form one playable stream.
+        """
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
 
         lang = lang or self.default_lang
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
+        async def synthesize_segment(segment: str) -> bytes:
+            async with semaphore:
+                return await asyncio.to_thread(self.synthesize, segment, lang)
+
+        tasks = [asyncio.create_task(synthesize_segment(s)) for s in split_sentences(text)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # Client went away or a segment failed: stop the remaining work
+            for task in tasks:
+                task.cancel()
+
+    def cached(self, text: str, lang: str = None) -> Optional[bytes]:
+        """Complete audio for `text` if every segment is already cached, else None.
+
+        Segments are looked up the way `stream` synthesizes them, so the
+        result is the same bytes `stream` would yield.
+        """
+        if self.cache is None or not text or not text.strip():
+            return None
+        lang = lang or self.default_lang
+        parts = []
+        for segment in split_sentences(text):
+            audio = self.cache.get(cache_key(segment, lang))
+            if audio is None:
+                return None
+            parts.append(audio)
+        return b"".join(parts)
+
+    def cache_key(self, text: str, lang: str = None) -> str:
+        return cache_key(text, lang or self.default_lang)
+
+    def warm(self, texts: Iterable[Tuple[str, str]]) -> None:
+        """Synthesize (text, lang) pairs ahead of time so they are served from cache"""
+        for text, lang in texts:
+            try:
+                # Per sentence, the way `stream` looks segments up
+                for segment in split_sentences(text):
+                    self.synthesize(segment, lang)
+            except Exception as e:
+                logger.warning(f"TTS warm-up failed for '{text[:30]}': {e}")
+
+    def _synthesize(self, text: str, lang: str) -> bytes:
         try:
             # Create gTTS object
             tts = gTTS(text=text, lang=lang, slow=False)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from repositories.leaderboardRepository import LeaderboardRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class XPRollupCompactionJob:
+    """Keep the daily XP buckets (user_xp_daily) exact and small.
+
+    `log_xp_activity` increments today's bucket as XP is earned. This job
+    recomputes the last `reconcile_days` closed days from user_xp_log, fixing
+    any drift (rows written outside `log_xp_activity`, failed upserts), and
+    drops buckets older than `retention_days`: the week and month boards
+    never look further back than the start of the current month.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        retention_days: int = 62,
+        reconcile_days: int = 2,
+    ):
+        self._session_factory = session_factory
+        self.retention_days = retention_days
+        self.reconcile_days = reconcile_days
+
+    async def run(self, today: date | None = None) -> dict[str, int | str]:
+        today = today or datetime.now(timezone.utc).date()
+        since = today - timedelta(days=self.reconcile_days)
+        keep_from = today - timedelta(days=self.retention_days)
+        logger.info("XPRollupCompactionJob started (reconcile %s..%s)", since, today)
+
+        async with self._session_factory() as session:
+            repo = LeaderboardRepository(session)
+            await repo.rebuild_xp_buckets(since, today)
+            pruned = await repo.prune_xp_buckets(keep_from)
+            await session.commit()
+
+        stats = {"reconciled_from": since.isoformat(), "pruned": pruned}
+        logger.info("XPRollupCompactionJob finished %s", stats)
+        return stats
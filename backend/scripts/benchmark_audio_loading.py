@@ -0,0 +1,111 @@
+"""
+Micro-benchmark: audio_utils.load_audio_from_bytes vs the previous
+librosa.load(..., sr=16000) + truncate path.
+
+Clips are generated with ffmpeg in the formats browsers upload
+(webm/opus, 16 kHz mono wav, 48 kHz stereo wav, mp3), or passed in with
+--inputs. Reports median decode time, output length and max abs difference
+between the two paths.
+
+Usage:
+    python scripts/benchmark_audio_loading.py
+    python scripts/benchmark_audio_loading.py --seconds 45 --repeats 20
+    python scripts/benchmark_audio_loading.py --inputs a.webm b.wav
+"""
+import argparse
+import io
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import numpy as np
+
+from services.audio_utils import MAX_SECONDS, load_audio_from_bytes
+
+SAMPLE_RATE = 16000
+
+# name -> ffmpeg output arguments
+_FORMATS = {
+    "wav_16k_mono.wav": ["-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le"],
+    "wav_48k_stereo.wav": ["-ar", "48000", "-ac", "2", "-c:a", "pcm_s16le"],
+    "webm_opus.webm": ["-ar", "48000", "-ac", "1", "-c:a", "libopus", "-b:a", "32k"],
+    "mp3_44k.mp3": ["-ar", "44100", "-ac", "1", "-c:a", "libmp3lame", "-b:a", "64k"],
+}
+
+
+def legacy_load(audio_bytes: bytes, sr: int = SAMPLE_RATE) -> np.ndarray:
+    import librosa
+
+    audio, _ = librosa.load(io.BytesIO(audio_bytes), sr=sr)
+    return audio[: sr * MAX_SECONDS]
+
+
+def _generate_clips(workdir: Path, seconds: float) -> list[Path]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("❌ ffmpeg not found; pass clips with --inputs instead")
+        sys.exit(1)
+
+    # Speech-like test signal: a gliding tone with pauses
+    source = f"aevalsrc='0.5*sin(2*PI*(200+100*sin(2*PI*0.5*t))*t)*gt(sin(2*PI*0.7*t),-0.3)':s=48000:d={seconds}"
+    paths = []
+    for name, out_args in _FORMATS.items():
+        path = workdir / name
+        cmd = [ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-f", "lavfi", "-i", source, *out_args, str(path)]
+        if subprocess.run(cmd).returncode == 0:
+            paths.append(path)
+        else:
+            print(f"⚠️  Could not encode {name} (missing codec?)")
+    return paths
+
+
+def _time(fn, audio_bytes: bytes, repeats: int):
+    timings = []
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn(audio_bytes)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inputs", nargs="*", help="Audio files to benchmark instead of generated clips")
+    parser.add_argument("--seconds", type=float, default=40.0, help="Length of generated clips (above the 30 s cap by default)")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(p) for p in args.inputs] if args.inputs else _generate_clips(Path(tmp), args.seconds)
+
+        print(f"{'clip':<22} {'new ms':>8} {'librosa ms':>10} {'speedup':>8} {'new len':>9} {'old len':>9} {'max |Δ|':>8}")
+        print("-" * 80)
+        for path in paths:
+            audio_bytes = path.read_bytes()
+            new_ms, new_audio = _time(load_audio_from_bytes, audio_bytes, args.repeats)
+            assert new_audio.dtype == np.float32
+
+            try:
+                old_ms, old_audio = _time(legacy_load, audio_bytes, args.repeats)
+            except Exception as exc:
+                print(f"{path.name:<22} {new_ms:>8.1f} {'failed':>10} {'-':>8} {len(new_audio):>9} {'-':>9} {'-':>8}  ({type(exc).__name__})")
+                continue
+
+            n = min(len(new_audio), len(old_audio))
+            max_diff = float(np.max(np.abs(new_audio[:n] - old_audio[:n]))) if n else 0.0
+            print(
+                f"{path.name:<22} {new_ms:>8.1f} {old_ms:>10.1f} {old_ms / new_ms:>7.1f}x "
+                f"{len(new_audio):>9} {len(old_audio):>9} {max_diff:>8.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Benchmark and parity check for the pronunciation scorer inference backends.
+
+Each backend (torch, torch_int8, onnx) runs in its own process so RSS is not
+polluted by the others. For every backend the script reports latency per
+second of audio (real-time factor) and RSS, and compares transcripts and
+0-10 scores against the fp32 torch path.
+
+Fixtures: a directory with audio files and a manifest.json like
+    [{"file": "hello.wav", "reference": "hello"}, ...]
+
+Usage:
+    python scripts/benchmark_pronunciation_backends.py --fixtures path/to/fixtures
+    python scripts/benchmark_pronunciation_backends.py --fixtures dir --backends torch torch_int8
+"""
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+SAMPLE_RATE = 16000
+
+
+def _rss_mb() -> float:
+    """Current resident set size (Linux), falls back to peak RSS elsewhere."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _load_fixtures(fixtures_dir: Path) -> list[dict]:
+    from services.audio_utils import load_audio_from_bytes
+
+    manifest = json.loads((fixtures_dir / "manifest.json").read_text(encoding="utf-8"))
+    fixtures = []
+    for item in manifest:
+        audio_bytes = (fixtures_dir / item["file"]).read_bytes()
+        fixtures.append(
+            {
+                "file": item["file"],
+                "reference": item["reference"],
+                "audio": load_audio_from_bytes(audio_bytes, sr=SAMPLE_RATE),
+            }
+        )
+    return fixtures
+
+
+def _run_backend(backend: str, fixtures_dir: str, repeats: int, onnx_dir, out_q) -> None:
+    """Child process: load one backend, score every fixture, report back."""
+    try:
+        from ml_models.wav2vec_scorer import Wav2VecScorer
+        from services.score_mapper import map_raw_score_to_10
+
+        fixtures = _load_fixtures(Path(fixtures_dir))
+        rss_start = _rss_mb()
+
+        started = time.perf_counter()
+        scorer = Wav2VecScorer(backend=backend, onnx_dir=onnx_dir)
+        load_seconds = time.perf_counter() - started
+        rss_loaded = _rss_mb()
+
+        # Warm-up (first call pays for allocator / graph optimizations)
+        scorer.score_pronunciation(fixtures[0]["audio"], fixtures[0]["reference"])
+
+        results = []
+        total_audio_seconds = 0.0
+        total_seconds = 0.0
+        for fx in fixtures:
+            timings = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                raw = scorer.score_pronunciation(fx["audio"], fx["reference"])
+                timings.append(time.perf_counter() - t0)
+
+            seconds = statistics.median(timings)
+            audio_seconds = len(fx["audio"]) / SAMPLE_RATE
+            total_seconds += seconds
+            total_audio_seconds += audio_seconds
+            results.append(
+                {
+                    "file": fx["file"],
+                    "predicted_text": raw["predicted_text"],
+                    "score": map_raw_score_to_10(raw["overall_score"]),
+                    "seconds": seconds,
+                    "audio_seconds": audio_seconds,
+                }
+            )
+
+        out_q.put(
+            {
+                "backend": backend,
+                "load_seconds": load_seconds,
+                "rss_model_mb": rss_loaded - rss_start,
+                "rss_peak_mb": _peak_rss_mb(),
+                "latency_per_audio_second_ms": (
+                    total_seconds / total_audio_seconds * 1000 if total_audio_seconds else 0.0
+                ),
+                "results": results,
+            }
+        )
+    except Exception as exc:
+        out_q.put({"backend": backend, "error": repr(exc)})
+
+
+def _parity(reference: dict, candidate: dict, score_tolerance: float) -> dict:
+    ref_by_file = {r["file"]: r for r in reference["results"]}
+    text_matches = 0
+    max_score_diff = 0.0
+    mismatches = []
+    for r in candidate["results"]:
+        ref = ref_by_file[r["file"]]
+        same_text = r["predicted_text"] == ref["predicted_text"]
+        score_diff = abs(r["score"] - ref["score"])
+        text_matches += int(same_text)
+        max_score_diff = max(max_score_diff, score_diff)
+        if not same_text or score_diff > score_tolerance:
+            mismatches.append(
+                {
+                    "file": r["file"],
+                    "fp32": ref["predicted_text"],
+                    "candidate": r["predicted_text"],
+                    "score_diff": round(score_diff, 2),
+                }
+            )
+
+    total = len(candidate["results"]) or 1
+    return {
+        "transcript_match_rate": text_matches / total,
+        "max_score_diff": max_score_diff,
+        # Any transcript difference fails parity, not only score drift
+        "ok": not mismatches,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="Directory containing manifest.json and audio files")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch_int8", "onnx"])
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per fixture (median is reported)")
+    parser.add_argument("--onnx-dir", default=None, help="Where the exported ONNX graph is cached")
+    parser.add_argument("--score-tolerance", type=float, default=0.5, help="Max allowed |score - fp32 score| (0-10 scale)")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON")
+    args = parser.parse_args()
+
+    backends = list(dict.fromkeys(["torch"] + args.backends))  # fp32 is always the reference
+    ctx = mp.get_context("spawn")
+
+    reports = {}
+    for backend in backends:
+        print(f"🔄 Running backend: {backend}")
+        out_q = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(backend, args.fixtures, args.repeats, args.onnx_dir, out_q))
+        proc.start()
+        reports[backend] = out_q.get()
+        proc.join()
+
+    reference = reports["torch"]
+    if "error" in reference:
+        print(f"❌ fp32 reference failed: {reference['error']}")
+        return 1
+
+    all_ok = True
+    print()
+    print(f"{'backend':<12} {'ms/audio-s':>10} {'model MB':>9} {'peak MB':>8} {'text match':>10} {'max Δscore':>10}")
+    print("-" * 64)
+    for backend, report in reports.items():
+        if "error" in report:
+            all_ok = False
+            print(f"{backend:<12} ❌ {report['error']}")
+            continue
+
+        parity = _parity(reference, report, args.score_tolerance)
+        report["parity"] = parity
+        all_ok = all_ok and parity["ok"]
+        print(
+            f"{backend:<12} {report['latency_per_audio_second_ms']:>10.1f} {report['rss_model_mb']:>9.0f} "
+            f"{report['rss_peak_mb']:>8.0f} {parity['transcript_match_rate']:>10.0%} {parity['max_score_diff']:>10.2f}"
+        )
+        for m in parity["mismatches"]:
+            print(f"    ⚠️  {m['file']}: '{m['fp32']}' vs '{m['candidate']}' (Δscore {m['score_diff']})")
+
+    if args.json:
+        print(json.dumps(reports, indent=2, default=str))
+
+    print()
+    print("✅ All backends match fp32 transcripts within score tolerance" if all_ok else "❌ Parity check failed")
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import core.auth_cache as auth_cache
+from core.auth_cache import TokenCache
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def _cache(monkeypatch, now=1_000_000.0, **kwargs):
+    clock = _Clock(now)
+    monkeypatch.setattr(auth_cache, "time", SimpleNamespace(time=clock.time, monotonic=clock.time))
+    return TokenCache(**kwargs), clock
+
+
+def test_entry_expires_at_token_exp(monkeypatch):
+    cache, clock = _cache(monkeypatch, max_ttl=3600)
+    cache.put("token", {"uid": "u1", "exp": clock.now + 60})
+    assert cache.get("token") == {"uid": "u1", "exp": clock.now + 60}
+
+    clock.now += 61
+    assert cache.get("token") is None
+
+
+def test_entry_never_outlives_max_ttl(monkeypatch):
+    cache, clock = _cache(monkeypatch, max_ttl=300)
+    cache.put("token", {"uid": "u1", "exp": clock.now + 3600})
+
+    clock.now += 299
+    assert cache.get("token") is not None
+    clock.now += 2
+    assert cache.get("token") is None
+
+
+def test_expired_token_is_not_cached(monkeypatch):
+    cache, clock = _cache(monkeypatch)
+    cache.put("token", {"uid": "u1", "exp": clock.now - 1})
+    assert cache.get("token") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    cache, clock = _cache(monkeypatch, max_entries=2)
+    for token in ("a", "b"):
+        cache.put(token, {"uid": token, "exp": clock.now + 60})
+    cache.get("a")
+    cache.put("c", {"uid": "c", "exp": clock.now + 60})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_raw_token_is_not_kept(monkeypatch):
+    cache, clock = _cache(monkeypatch)
+    cache.put("secret-token", {"uid": "u1", "exp": clock.now + 60})
+    assert "secret-token" not in cache._entries
@@ -0,0 +1,109 @@
+import asyncio
+
+from models.leaderboard_snapshot import LeaderboardType
+from services.leaderboard_engine import BoardEntry, LeaderboardEngine, _SortedBoard
+
+
+def _entries():
+    return [
+        BoardEntry(user_id=1, username="a", xp=100, streak=3),
+        BoardEntry(user_id=2, username="b", xp=300, streak=1),
+        BoardEntry(user_id=3, username="c", xp=100, streak=7),
+        BoardEntry(user_id=4, username="d", xp=50, streak=0),
+    ]
+
+
+def _loaded_engine(entries=None):
+    engine = LeaderboardEngine(resync_seconds=300)
+
+    async def loader():
+        return entries if entries is not None else _entries()
+
+    asyncio.run(engine.ensure_loaded(loader))
+    return engine
+
+
+def _ranking(engine, lb_type=LeaderboardType.xp):
+    return [(rank, entry.user_id) for rank, entry in engine.page(lb_type, 0, 100)]
+
+
+def test_sorted_board_add_remove_position():
+    board = _SortedBoard()
+    board.load([(-10, 2), (-30, 1)])
+    board.add((-20, 3))
+    assert board.keys == [(-30, 1), (-20, 3), (-10, 2)]
+    assert board.position((-20, 3)) == 1
+    assert board.position_after((-20, 3)) == 2
+
+    board.remove((-20, 3))
+    board.remove((-99, 9))  # not on the board: no-op
+    assert board.keys == [(-30, 1), (-10, 2)]
+
+
+def test_ranks_order_by_score_then_user_id():
+    engine = _loaded_engine()
+    assert _ranking(engine) == [(1, 2), (2, 1), (3, 3), (4, 4)]
+    assert _ranking(engine, LeaderboardType.streak) == [(1, 3), (2, 1), (3, 2), (4, 4)]
+    rank, entry = engine.rank_of(3, LeaderboardType.xp)
+    assert (rank, entry.username) == (3, "c")
+    assert engine.rank_of(99, LeaderboardType.xp) is None
+
+
+def test_set_moves_entry_on_changed_board_only():
+    engine = _loaded_engine()
+    engine.apply("set", 4, {"xp": 500})
+    assert _ranking(engine) == [(1, 4), (2, 2), (3, 1), (4, 3)]
+    assert engine.rank_of(4, LeaderboardType.streak)[0] == 4
+
+    engine.apply("set", 1, {"username": "renamed"})
+    assert engine.rank_of(1, LeaderboardType.xp)[1].username == "renamed"
+
+
+def test_add_and_remove():
+    engine = _loaded_engine()
+    engine.apply("add", 5, {"username": "e", "xp": 200, "streak": 2})
+    assert engine.rank_of(5, LeaderboardType.xp)[0] == 2
+
+    engine.apply("remove", 2, {})
+    assert engine.rank_of(2, LeaderboardType.xp) is None
+    assert _ranking(engine) == [(1, 5), (2, 1), (3, 3), (4, 4)]
+
+    # Updates for users not on the boards are ignored
+    engine.apply("set", 2, {"xp": 1000})
+    assert engine.rank_of(2, LeaderboardType.xp) is None
+
+
+def test_invalidate_forces_reload():
+    engine = _loaded_engine()
+    assert engine.fresh
+    engine.apply("invalidate", 1, {})
+    assert not engine.fresh
+
+
+def test_changes_committed_during_reload_are_replayed():
+    engine = LeaderboardEngine(resync_seconds=300)
+
+    async def loader():
+        # Committed while the (older) rows below were being read
+        engine.apply("set", 4, {"xp": 1000})
+        engine.apply("add", 5, {"username": "e", "xp": 10, "streak": 0})
+        return _entries()
+
+    asyncio.run(engine.ensure_loaded(loader))
+    assert engine.rank_of(4, LeaderboardType.xp)[0] == 1
+    assert engine.rank_of(5, LeaderboardType.xp)[0] == 5
+    assert engine.stats()["learners"] == 5
+
+
+def test_page_after_resumes_after_moved_entry():
+    engine = _loaded_engine()
+    first_page = engine.page(LeaderboardType.xp, 0, 2)
+    assert [e.user_id for _, e in first_page] == [2, 1]
+    _, last = first_page[-1]
+    cursor = (last.xp, last.user_id)
+
+    # The cursor's entry moves to the top before the next page is read
+    engine.apply("set", 1, {"xp": 900})
+
+    next_page = engine.page_after(LeaderboardType.xp, *cursor, limit=2)
+    assert [(rank, e.user_id) for rank, e in next_page] == [(3, 3), (4, 4)]
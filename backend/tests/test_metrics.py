@@ -0,0 +1,29 @@
+import json
+
+from core.metrics import LatencyHistogram
+
+
+def test_percentiles_are_bucket_upper_bounds():
+    histogram = LatencyHistogram([1, 10, 100])
+    for ms in (0.5, 5, 5, 50):
+        histogram.observe(ms)
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.99) == 100
+
+
+def test_overflow_bucket_reports_largest_sample():
+    histogram = LatencyHistogram([1, 10])
+    for ms in (5, 30_000, 12_000):
+        histogram.observe(ms)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["p95_ms"] == 30_000
+    assert snapshot["max_ms"] == 30_000
+    # Served as JSON by the admin endpoints (no NaN / Infinity allowed)
+    json.dumps(snapshot, allow_nan=False)
+
+
+def test_empty_histogram():
+    snapshot = LatencyHistogram([1]).snapshot()
+    assert snapshot["count"] == 0
+    assert snapshot["p50_ms"] is None
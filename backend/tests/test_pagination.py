@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from core.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_round_trip():
+    created_at = datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor, (datetime, int)) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 !",
+        _raw_cursor({"a": 1}),
+        _raw_cursor([1]),  # wrong arity
+        _raw_cursor(["x", 1]),
+        _raw_cursor([1e999, 1]),  # inf: OverflowError
+        _raw_cursor([2 ** 31, 1]),  # outside INTEGER
+        _raw_cursor([-(2 ** 63), 1]),
+    ],
+)
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (int, int))
+    assert exc_info.value.status_code == 400
+
+
+def test_invalid_datetime_is_400():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(_raw_cursor(["yesterday", 1]), (datetime, int))
+    assert exc_info.value.status_code == 400